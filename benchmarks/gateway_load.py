@@ -0,0 +1,590 @@
+"""End-to-end listener load test: ModBot with every cog against a fake gateway.
+
+Starts the real ``ModBot`` from main.py with all of EXTENSIONS loaded, but
+with ``discord.http.HTTPClient`` replaced by a stub that answers every REST
+call from canned payloads (optionally after --rest-latency) and without a
+gateway connection: each scenario builds gateway payloads and feeds them
+straight into the connection state's parsers, so the events take the same
+path through discord.py, the metrics/shard hooks and the cog listeners as
+live traffic.
+
+The synthetic guild has logging configured for every category, a welcome
+and leave message, a human autorole and one reaction-role message, so the
+listeners do their full work. Scenarios:
+
+    flood     MESSAGE_CREATE from random members across the text channels,
+              with a sprinkling of prefix commands
+    raid      GUILD_MEMBER_ADD of new accounts (welcome, autorole, logging)
+    delete    MESSAGE_DELETE of cached messages, then MESSAGE_DELETE_BULK
+    reactions MESSAGE_REACTION_ADD/REMOVE on the reaction-role message
+    sweep     GUILD_MEMBER_UPDATE adding one role to every member, as $roleall does
+
+For each scenario it reports throughput (events fed per second until every
+listener task finished), p50/p99 listener latency, the slowest listeners,
+REST calls per event and the process RSS. Listener exceptions are counted
+per listener; --errors prints the first traceback of each.
+
+The store, the metrics endpoint and the log file are redirected to a temp
+directory, but some cogs still read or write files under /data, so run it
+in a dev container rather than next to a live bot. Cogs that fail to load
+(missing optional dependencies) are listed and the rest still run.
+
+Usage:
+    python benchmarks/gateway_load.py --members 5000 --events 2000
+    python benchmarks/gateway_load.py --scenarios flood,raid --rest-latency 0.05 --json results.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import traceback
+from collections import Counter, defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TMP = tempfile.mkdtemp(prefix="gateway-load-")
+os.environ["STORE_PATH"] = os.path.join(TMP, "store.db")
+os.environ["METRICS_PORT"] = "0"
+os.environ["LOG_FILE"] = os.path.join(TMP, "bot.log")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+for name in ("SHARD_COUNT", "SHARD_IDS", "CLUSTER_ID"):
+    os.environ.pop(name, None)  # one in-process connection
+
+import discord  # noqa: E402
+from discord.http import HTTPClient  # noqa: E402
+from PIL import Image  # noqa: E402
+
+GUILD_ID = 1 << 40
+BOT_ID = (1 << 40) + 7
+OWNER_ID = 1 << 41
+LOG_CHANNEL_ID = GUILD_ID + 1
+WELCOME_CHANNEL_ID = GUILD_ID + 2
+TEXT_CHANNEL_IDS = [GUILD_ID + 10 + i for i in range(10)]
+ADMIN_ROLE_ID = GUILD_ID + 100
+AUTO_ROLE_ID = GUILD_ID + 101
+REACTION_ROLE_ID = GUILD_ID + 102
+SWEEP_ROLE_ID = GUILD_ID + 103
+ROLE_IDS = [GUILD_ID + 200 + i for i in range(20)]
+REACTION_MESSAGE_ID = 1 << 49
+REACTION_EMOJI = "✅"
+TIMESTAMP = "2024-01-01T00:00:00+00:00"
+COMMANDS = ["$ping", "$userinfo", "$avatar", "$serverinfo", "$snipe"]
+CHUNK_SIZE = 1000  # members per GUILD_MEMBERS_CHUNK, as Discord sends them
+
+
+def _png() -> bytes:
+    """A small image, served for every avatar/asset download."""
+    buffer = io.BytesIO()
+    Image.new("RGBA", (64, 64), (255, 0, 0, 255)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+# ----------------------------
+# Payloads
+# ----------------------------
+def _user(uid: int, bot: bool = False) -> dict:
+    return {
+        "id": str(uid),
+        "username": f"user{uid % 1_000_000}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+        "bot": bot,
+    }
+
+
+def _member(uid: int, roles=(), bot: bool = False) -> dict:
+    return {
+        "user": _user(uid, bot),
+        "roles": [str(r) for r in roles],
+        "joined_at": TIMESTAMP,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        "nick": None,
+    }
+
+
+def _role(rid: int, name: str, position: int, permissions: int = 0) -> dict:
+    return {
+        "id": str(rid), "name": name, "permissions": str(permissions), "position": position, "color": 0,
+        "hoist": False, "managed": False, "mentionable": False, "flags": 0,
+    }
+
+
+def _channel(cid: int, name: str, position: int) -> dict:
+    return {"id": str(cid), "type": 0, "name": name, "position": position, "permission_overwrites": []}
+
+
+def _guild(members: int) -> dict:
+    roles = [
+        _role(GUILD_ID, "@everyone", 0, permissions=0x400 | 0x800 | 0x10000),  # view, send, read history
+        _role(ADMIN_ROLE_ID, "bot", 50, permissions=0x8),
+        _role(AUTO_ROLE_ID, "member", 3),
+        _role(REACTION_ROLE_ID, "notify", 2),
+        _role(SWEEP_ROLE_ID, "sweep", 1),
+    ] + [_role(r, f"role{n}", 10 + n) for n, r in enumerate(ROLE_IDS)]
+    channels = [_channel(LOG_CHANNEL_ID, "logs", 0), _channel(WELCOME_CHANNEL_ID, "welcome", 1)]
+    channels += [_channel(c, f"chat-{n}", 2 + n) for n, c in enumerate(TEXT_CHANNEL_IDS)]
+    return {
+        "id": str(GUILD_ID),
+        "name": "Load test",
+        "owner_id": str(OWNER_ID),
+        "member_count": members + 1,
+        "large": True,
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "roles": roles,
+        "channels": channels,
+        "members": [_member(BOT_ID, [ADMIN_ROLE_ID], bot=True)],  # large guilds: the rest arrive in chunks
+        "presences": [],
+        "voice_states": [],
+        "threads": [],
+        "stage_instances": [],
+        "guild_scheduled_events": [],
+        "soundboard_sounds": [],
+    }
+
+
+def _message(mid: int, channel_id: int, author: dict, content: str, member: dict | None = None) -> dict:
+    data = {
+        "id": str(mid),
+        "channel_id": str(channel_id),
+        "author": author,
+        "content": content,
+        "timestamp": TIMESTAMP,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+    if member is not None:
+        data["guild_id"] = str(GUILD_ID)
+        data["member"] = member
+    return data
+
+
+# ----------------------------
+# Fake REST layer
+# ----------------------------
+class FakeHTTP(HTTPClient):
+    """
+    HTTPClient whose requests never leave the process: every call is counted
+    per route and answered with a minimal valid payload for that route.
+    """
+
+    def __init__(self, loop, latency: float = 0.0):
+        super().__init__(loop)
+        self.latency = latency
+        self.calls: Counter[str] = Counter()
+        self.png = _png()
+        self._ids = iter(range((1 << 51), (1 << 52)))
+
+    async def request(self, route, *, files=None, form=None, **kwargs):
+        key = f"{route.method} {route.path}"
+        self.calls[key] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(route, key, kwargs.get("json") or {})
+
+    def _respond(self, route, key: str, payload: dict):
+        if key == "POST /channels/{channel_id}/messages":
+            return _message(next(self._ids), route.channel_id, _user(BOT_ID, bot=True), payload.get("content") or "")
+        if key == "POST /users/@me/channels":
+            return {"id": str(next(self._ids)), "type": 1, "recipients": [_user(int(payload["recipient_id"]))]}
+        if key == "GET /guilds/{guild_id}/members/{user_id}":
+            return _member(int(route.url.rsplit("/", 1)[1]))
+        if key == "GET /guilds/{guild_id}/audit-logs":
+            return {
+                "audit_log_entries": [], "users": [], "webhooks": [], "threads": [], "integrations": [],
+                "application_commands": [], "auto_moderation_rules": [], "guild_scheduled_events": [],
+            }
+        if key == "GET /users/{user_id}":
+            return _user(int(route.url.rsplit("/", 1)[1]))
+        if route.method == "GET" or key.endswith("/commands"):
+            return []  # lists: invites, bans, webhooks, synced commands
+        return None  # 204s: role edits, deletes, reactions, typing
+
+    async def get_from_cdn(self, url: str) -> bytes:
+        self.calls["GET cdn"] += 1
+        return self.png
+
+    async def close(self):
+        pass
+
+
+class FakeGateway:
+    """
+    Stands in for the bot's DiscordWebSocket: counts what the bot sends and
+    answers member requests (``guild.chunk()``) with GUILD_MEMBERS_CHUNK
+    events for the harness' members.
+    """
+
+    latency = 0.042
+    shard_id = None
+    open = False  # nothing for Client.close() to disconnect
+
+    def __init__(self, harness):
+        self.harness = harness
+        self.sent: Counter[str] = Counter()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def change_presence(self, **kwargs):
+        self.sent["PRESENCE_UPDATE"] += 1
+
+    async def voice_state(self, guild_id, channel_id, self_mute=False, self_deaf=False):
+        self.sent["VOICE_STATE_UPDATE"] += 1
+
+    async def request_chunks(self, guild_id, query=None, *, limit, user_ids=None, presences=False, nonce=None):
+        self.sent["REQUEST_GUILD_MEMBERS"] += 1
+        task = asyncio.create_task(self._chunks(guild_id, nonce))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _chunks(self, guild_id, nonce):
+        parse = self.harness.bot._connection.parsers["GUILD_MEMBERS_CHUNK"]
+        members = [BOT_ID] + self.harness.members
+        count = -(-len(members) // CHUNK_SIZE)
+        for index in range(count):
+            await asyncio.sleep(0)
+            parse({
+                "guild_id": str(guild_id),
+                "members": [self.harness.member_payload(uid) for uid in members[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]],
+                "chunk_index": index,
+                "chunk_count": count,
+                "nonce": nonce,
+            })
+
+
+# ----------------------------
+# Harness
+# ----------------------------
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Harness:
+    def __init__(self, args):
+        self.args = args
+        self.durations: dict[str, list[float]] = defaultdict(list)  # listener -> seconds
+        self.errors: Counter[str] = Counter()
+        self.tracebacks: dict[str, str] = {}
+        self.pending = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.next_id = 1 << 50
+        self.messages: list[tuple[int, int]] = []  # (message id, channel id) of the flood, for deletes
+        self.members: list[int] = []
+
+    async def start(self):
+        import main  # after the environment above is set
+        from utils.http import http as web
+
+        self.main = main
+        main.setup_logging(log_file=True)
+        bot = self.bot = main.ModBot()
+        await bot._async_setup_hook()
+        self.http = FakeHTTP(bot.loop, self.args.rest_latency)
+        bot.http = bot._connection.http = self.http
+        self.gateway = bot.ws = FakeGateway(self)
+
+        async def get_bytes(url, **kwargs):
+            self.http.calls["GET cdn"] += 1
+            return self.http.png
+
+        web.get_bytes = get_bytes
+
+        async def on_error(event_name, *args, **kwargs):
+            pass  # counted by the _run_event wrapper below
+
+        bot.on_error = on_error
+
+        started = time.perf_counter()
+        try:
+            await bot.setup_hook()
+        except Exception:
+            pass  # load_extensions raises after loading the rest; the missing ones are listed below
+        self.setup_seconds = time.perf_counter() - started
+        self.cog_count = len(bot.cogs)
+        self.failed_cogs = [name for name in main.EXTENSIONS if name not in bot.extensions]
+        self._wrap_run_event()
+
+        # Ready, with the synthetic guild
+        random.seed(0)
+        state = bot._connection
+        state.user = discord.ClientUser(state=state, data=_user(BOT_ID, bot=True))
+        state._users[BOT_ID] = state.user
+        state.application_id = BOT_ID
+        self.members = [OWNER_ID + i for i in range(self.args.members)]
+        self.roles = {uid: random.sample(ROLE_IDS, random.randint(0, 3)) for uid in self.members}
+        self.roles[BOT_ID] = [ADMIN_ROLE_ID]
+        self.guild = state._add_guild_from_data(_guild(self.args.members))
+        if state._chunk_guilds:
+            await self.guild.chunk()  # as the startup chunking of the cache profile does
+
+        # Configure every stateful cog for the guild
+        for cog in bot.cogs.values():
+            if type(cog).__module__ == "cogs.logging":
+                cog.config[str(GUILD_ID)] = {category: LOG_CHANNEL_ID for category in cog.valid_categories}
+            elif type(cog).__module__ == "cogs.autorole":
+                cog.autoroles[str(GUILD_ID)] = {"human": AUTO_ROLE_ID}
+        # load_extension re-executes the cog modules, so look them up now
+        reactionrole, welcome = sys.modules["cogs.reactionrole"], sys.modules["cogs.welcome"]
+        reactionrole.reaction_roles[str(GUILD_ID)] = {str(REACTION_MESSAGE_ID): {REACTION_EMOJI: REACTION_ROLE_ID}}
+        welcome.CONFIG_FILE = os.path.join(TMP, "welcome_config.json")
+        with open(welcome.CONFIG_FILE, "w") as f:
+            json.dump({str(GUILD_ID): {
+                "join": {"mode": "embed", "channel_id": WELCOME_CHANNEL_ID, "title": "Welcome {user}",
+                         "description": "{mention} is member #{count} of {server}"},
+                "leave": {"mode": "text", "channel_id": WELCOME_CHANNEL_ID, "text": "{user} left"},
+            }}, f)
+
+        bot._handle_ready()
+        bot.dispatch("ready")
+        await self.drain()
+        self.reset()
+
+    def _wrap_run_event(self):
+        bot = self.bot
+        run_event = bot._run_event  # metrics' timed wrapper, which calls bot.on_error
+
+        async def measured(coro, event_name, *args, **kwargs):
+            listener = getattr(coro, "__qualname__", event_name)
+            self.pending += 1
+            self.idle.clear()
+            started = time.perf_counter()
+            try:
+                try:
+                    await coro(*args, **kwargs)
+                except asyncio.CancelledError:
+                    pass
+                except Exception:
+                    self.errors[listener] += 1
+                    self.tracebacks.setdefault(listener, traceback.format_exc())
+            finally:
+                self.durations[listener].append(time.perf_counter() - started)
+                self.pending -= 1
+                if not self.pending:
+                    self.idle.set()
+
+        # Timed inside metrics' wrapper, under the listener's own name
+        async def run(coro, event_name, *args, **kwargs):
+            async def call(*a, **kw):
+                await measured(coro, event_name, *a, **kw)
+
+            call.__qualname__ = getattr(coro, "__qualname__", event_name)
+            await run_event(call, event_name, *args, **kwargs)
+
+        bot._run_event = run
+
+    async def drain(self):
+        # Listeners may schedule more events (e.g. on_command after on_message)
+        while True:
+            await asyncio.sleep(0)
+            await self.idle.wait()
+            await asyncio.sleep(0.01)
+            if self.idle.is_set():
+                return
+
+    def reset(self):
+        self.durations.clear()
+        self.errors.clear()
+        self.http.calls.clear()
+        self.gateway.sent.clear()
+
+    def member_payload(self, uid: int) -> dict:
+        return _member(uid, self.roles.get(uid, []), bot=uid == BOT_ID or uid % 50 == 49)
+
+    async def feed(self, events: list[tuple[str, dict]]) -> float:
+        parsers = self.bot._connection.parsers
+        interval = 1 / self.args.rate if self.args.rate else 0
+        started = time.perf_counter()
+        for n, (event, data) in enumerate(events):
+            parsers[event](data)
+            if interval:
+                await asyncio.sleep(max(0.0, started + (n + 1) * interval - time.perf_counter()))
+            else:
+                await asyncio.sleep(0)  # one event per gateway read
+        await self.drain()
+        return time.perf_counter() - started
+
+    # ----------------------------
+    # Scenarios
+    # ----------------------------
+    def _new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    def flood(self, count: int) -> list[tuple[str, dict]]:
+        events = []
+        for n in range(count):
+            uid = random.choice(self.members)
+            channel_id = random.choice(TEXT_CHANNEL_IDS)
+            content = COMMANDS[n // 50 % len(COMMANDS)] if n % 50 == 0 else f"message {n} " + "lorem ipsum " * random.randint(1, 12)
+            mid = self._new_id()
+            self.messages.append((mid, channel_id))
+            payload = self.member_payload(uid)
+            events.append(("MESSAGE_CREATE", _message(mid, channel_id, payload.pop("user"), content, payload)))
+        return events
+
+    def raid(self, count: int) -> list[tuple[str, dict]]:
+        events = []
+        for _ in range(count):
+            uid = self._new_id()
+            self.members.append(uid)
+            events.append(("GUILD_MEMBER_ADD", {**_member(uid), "guild_id": str(GUILD_ID)}))
+        return events
+
+    def delete(self, count: int) -> list[tuple[str, dict]]:
+        targets, self.messages = self.messages[:count], self.messages[count:]
+        single, bulk = targets[: len(targets) // 2], targets[len(targets) // 2:]
+        events = [
+            ("MESSAGE_DELETE", {"id": str(mid), "channel_id": str(cid), "guild_id": str(GUILD_ID)})
+            for mid, cid in single
+        ]
+        by_channel = defaultdict(list)
+        for mid, cid in bulk:
+            by_channel[cid].append(str(mid))
+        for cid, ids in by_channel.items():
+            for i in range(0, len(ids), 100):
+                events.append(("MESSAGE_DELETE_BULK", {"ids": ids[i:i + 100], "channel_id": str(cid), "guild_id": str(GUILD_ID)}))
+        return events
+
+    def reactions(self, count: int) -> list[tuple[str, dict]]:
+        events = []
+        for uid in random.choices(self.members, k=count // 2):
+            base = {
+                "user_id": str(uid),
+                "channel_id": str(TEXT_CHANNEL_IDS[0]),
+                "message_id": str(REACTION_MESSAGE_ID),
+                "guild_id": str(GUILD_ID),
+                "emoji": {"id": None, "name": REACTION_EMOJI},
+                "burst": False,
+                "type": 0,
+            }
+            events.append(("MESSAGE_REACTION_ADD", {**base, "member": _member(uid)}))
+            events.append(("MESSAGE_REACTION_REMOVE", base))
+        return events
+
+    def sweep(self, count: int) -> list[tuple[str, dict]]:
+        events = []
+        for uid in self.members[:count]:
+            self.roles[uid] = self.roles.get(uid, []) + [SWEEP_ROLE_ID]
+            payload = self.member_payload(uid)
+            events.append(("GUILD_MEMBER_UPDATE", {**payload, "guild_id": str(GUILD_ID)}))
+        return events
+
+    async def run(self, name: str) -> dict:
+        events = getattr(self, name)(self.args.events)
+        self.reset()
+        rss_before = _rss_mb()
+        seconds = await self.feed(events)
+        durations = [d for values in self.durations.values() for d in values]
+        slowest = sorted(self.durations.items(), key=lambda kv: -_percentile(kv[1], 99))[:3]
+        return {
+            "scenario": name,
+            "events": len(events),
+            "seconds": seconds,
+            "events_per_second": len(events) / seconds if seconds else 0.0,
+            "listener_runs": len(durations),
+            "p50_ms": _percentile(durations, 50) * 1000,
+            "p99_ms": _percentile(durations, 99) * 1000,
+            "slowest": [(listener, _percentile(values, 99) * 1000, len(values)) for listener, values in slowest],
+            "rest_per_event": sum(self.http.calls.values()) / len(events) if events else 0.0,
+            "rest": dict(self.http.calls.most_common()),
+            "gateway": dict(self.gateway.sent),
+            "errors": dict(self.errors),
+            "rss_mb": _rss_mb(),
+            "rss_delta_mb": _rss_mb() - rss_before,
+        }
+
+    async def close(self):
+        await self.bot.close()
+
+
+def _print(results: list[dict], harness: Harness, show_errors: bool):
+    print(f"\nSetup {harness.setup_seconds:.2f}s, {harness.cog_count} cogs, "
+          f"{harness.guild.member_count} members, REST latency {harness.args.rest_latency * 1000:.0f}ms")
+    if harness.failed_cogs:
+        print(f"Not loaded: {', '.join(harness.failed_cogs)}")
+    header = f"{'scenario':<10} {'events':>7} {'events/s':>9} {'runs':>7} {'p50 ms':>8} {'p99 ms':>8} {'REST/ev':>8} {'errors':>7} {'RSS MiB':>8}"
+    print("\n" + header + "\n" + "-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<10} {r['events']:>7} {r['events_per_second']:>9.0f} {r['listener_runs']:>7} "
+            f"{r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f} {r['rest_per_event']:>8.2f} "
+            f"{sum(r['errors'].values()):>7} {r['rss_mb']:>8.1f}"
+        )
+    for r in results:
+        print(f"\n{r['scenario']}:")
+        for listener, p99, runs in r["slowest"]:
+            print(f"  p99 {p99:8.3f}ms  {runs:>6}×  {listener}")
+        for route, calls in list(r["rest"].items())[:5]:
+            print(f"  {calls:>15}×  {route}")
+        for op, sent in r["gateway"].items():
+            print(f"  {sent:>15}×  gateway {op}")
+        for listener, count in r["errors"].items():
+            print(f"  {count:>14}✗  {listener}")
+    if show_errors and harness.tracebacks:
+        print()
+        for listener, tb in harness.tracebacks.items():
+            print(f"--- {listener}\n{tb}")
+
+
+async def run(args) -> list[dict]:
+    harness = Harness(args)
+    await harness.start()
+    try:
+        results = [await harness.run(name) for name in args.scenarios.split(",")]
+    finally:
+        await harness.close()
+    _print(results, harness, args.errors)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=5000, help="members in the synthetic guild")
+    parser.add_argument("--events", type=int, default=2000, help="events per scenario")
+    parser.add_argument("--scenarios", default="flood,raid,delete,reactions,sweep")
+    parser.add_argument("--rest-latency", type=float, default=0.0, help="seconds each fake REST call takes")
+    parser.add_argument("--rate", type=float, default=0, help="events per second to feed (0 = as fast as possible)")
+    parser.add_argument("--profile", help="CACHE_PROFILE to run the bot with (default: the configured one)")
+    parser.add_argument("--errors", action="store_true", help="print the first traceback of each failing listener")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if args.profile:
+        os.environ["CACHE_PROFILE"] = args.profile
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Encode time and payload size of generated images per output profile.
+
+Encodes the images the bot generates -- a real captcha from
+``draw_captcha`` and synthetic battle (1500x500 RGBA), VS and ship canvases,
+or the battle background from ``--background`` -- with the stock
+``save(format="PNG")`` and with candidate profiles for ``encode_image``.
+
+Usage:
+    python benchmarks/image_encoding.py --runs 20 --background bg.jpg
+"""
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from utils import render  # noqa: E402
+from cogs.verification import draw_captcha  # noqa: E402
+
+CANDIDATES = {
+    "png (stock)": None,
+    "png level 1": {"format": "PNG", "compress_level": 1},
+    "png optimize": {"format": "PNG", "compress_level": 9, "optimize": 1},
+    "png 32 colors": {"format": "PNG", "colors": 32, "compress_level": 6},
+    "png 128 colors": {"format": "PNG", "colors": 128, "compress_level": 6},
+    "webp q80": {"format": "WEBP", "quality": 80, "method": 4},
+    "webp q80 m0": {"format": "WEBP", "quality": 80, "method": 0},
+    "webp lossless": {"format": "WEBP", "lossless": 1, "method": 0},
+    "webp q80 x0.75": {"format": "WEBP", "quality": 80, "method": 4, "scale": 0.75},
+}
+
+
+def _canvas(size, background=None) -> Image.Image:
+    """A photo-like backdrop (or ``background``) with two avatar-sized discs and text."""
+    if background:
+        img = Image.open(background).convert("RGBA").resize(size)
+    else:
+        w, h = size
+        img = Image.linear_gradient("L").resize(size).convert("RGBA")
+        noise = Image.effect_noise(size, 40).convert("RGBA")
+        img = Image.blend(img, noise, 0.4)
+        img = Image.merge("RGBA", (img.getchannel("R"), noise.getchannel("R"), img.getchannel("B"), img.getchannel("A")))
+    draw = ImageDraw.Draw(img)
+    d = min(size) * 2 // 3
+    for x in (size[0] // 20, size[0] - size[0] // 20 - d):
+        draw.ellipse((x, size[1] // 6, x + d, size[1] // 6 + d), fill=(random.randint(0, 255), 120, 200, 255))
+    draw.text((size[0] // 2, size[1] // 2), "VS 87%", fill="white")
+    return img
+
+
+def _images(background):
+    _, captcha = draw_captcha()
+    return {
+        "captcha": captcha,
+        "battle": _canvas((1500, 500), background),
+        "vs": _canvas((900, 350)),
+        "ship": _canvas((1000, 600)),
+    }
+
+
+def _encode(img, profile) -> bytes:
+    if profile is None:
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+        return buffer.getvalue()
+    render.IMAGE_PROFILES["bench"] = profile
+    return render.encode_image(img, "bench")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--background", help="image used as the battle background (default: synthetic)")
+    args = parser.parse_args()
+
+    for name, img in _images(args.background).items():
+        print(f"\n{name} {img.width}x{img.height} {img.mode}  (current profile: {render.image_profile(name)})")
+        print(f"  {'profile':<16} {'encode ms':>10} {'KiB':>8}")
+        for label, profile in CANDIDATES.items():
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                data = _encode(img, profile)
+                times.append(time.perf_counter() - start)
+            print(f"  {label:<16} {statistics.median(times) * 1e3:>10.1f} {len(data) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
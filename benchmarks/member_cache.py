@@ -0,0 +1,209 @@
+"""Memory retained by the gateway cache per cache profile (utils/cache.py).
+
+Feeds a discord.py ConnectionState, configured as ``client_options`` would
+configure the bot for each profile, a synthetic guild: GUILD_CREATE, the
+startup member chunks (profiles that chunk at startup), presence updates
+for the online members (profiles with presences), member joins and message
+traffic. It then runs one on-demand chunk, as RoleAll/serverinfo do, and
+reports the Python heap (tracemalloc) and cached members after each phase.
+
+Usage:
+    python benchmarks/member_cache.py --members 100000 --online 0.3
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+from discord.state import ChunkRequest, ConnectionState  # noqa: E402
+
+from utils.cache import CACHE_PROFILES, client_options  # noqa: E402
+
+GUILD_ID = 1 << 40
+CHANNEL_ID = GUILD_ID + 1
+ROLE_IDS = [GUILD_ID + 100 + i for i in range(30)]
+TIMESTAMP = "2024-01-01T00:00:00+00:00"
+CHUNK_SIZE = 1000  # members per GUILD_MEMBERS_CHUNK, as Discord sends them
+
+
+def _user(i: int) -> dict:
+    return {
+        "id": str((1 << 41) + i),
+        "username": f"user{i}",
+        "discriminator": "0",
+        "global_name": f"User {i}",
+        "avatar": f"{random.getrandbits(128):032x}" if i % 3 else None,
+        "bot": i % 50 == 0,
+    }
+
+
+def _member(i: int) -> dict:
+    return {
+        "user": _user(i),
+        "roles": [str(r) for r in random.sample(ROLE_IDS, random.randint(0, 4))],
+        "joined_at": TIMESTAMP,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        "nick": f"nick{i}" if i % 4 == 0 else None,
+    }
+
+
+def _presence(i: int) -> dict:
+    return {
+        "user": {"id": str((1 << 41) + i)},
+        "guild_id": str(GUILD_ID),
+        "status": random.choice(["online", "idle", "dnd"]),
+        "client_status": {"desktop": "online"},
+        "activities": [{"name": f"Game {i % 200}", "type": 0, "created_at": 0}] if i % 2 else [],
+    }
+
+
+def _guild(members: int) -> dict:
+    return {
+        "id": str(GUILD_ID),
+        "name": "Synthetic",
+        "owner_id": str((1 << 41) + 1),
+        "member_count": members,
+        "large": True,
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "roles": [
+            {"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+             "hoist": False, "managed": False, "mentionable": False, "flags": 0}
+        ] + [
+            {"id": str(r), "name": f"role{n}", "permissions": "0", "position": n + 1, "color": 0,
+             "hoist": False, "managed": False, "mentionable": False, "flags": 0}
+            for n, r in enumerate(ROLE_IDS)
+        ],
+        "channels": [{"id": str(CHANNEL_ID), "type": 0, "name": "general", "position": 0, "permission_overwrites": []}],
+        "members": [],
+        "presences": [],
+        "voice_states": [],
+        "threads": [],
+        "stage_instances": [],
+        "guild_scheduled_events": [],
+        "soundboard_sounds": [],
+    }
+
+
+def _message(n: int, i: int) -> dict:
+    member = _member(i)
+    return {
+        "id": str((1 << 50) + n),
+        "channel_id": str(CHANNEL_ID),
+        "guild_id": str(GUILD_ID),
+        "author": member.pop("user"),
+        "member": member,
+        "content": f"message {n} " + "lorem ipsum " * 8,
+        "timestamp": TIMESTAMP,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+def _chunk(state: ConnectionState, members: int, cache: bool, presences: bool):
+    """Deliver every member in GUILD_MEMBERS_CHUNK events for a request like ``guild.chunk(cache=...)``."""
+    request = ChunkRequest(GUILD_ID, 0, asyncio.get_running_loop(), state._get_guild, cache=cache)
+    state._chunk_requests[request.nonce] = request
+    count = -(-members // CHUNK_SIZE)
+    for index in range(count):
+        ids = range(index * CHUNK_SIZE, min(members, (index + 1) * CHUNK_SIZE))
+        state.parse_guild_members_chunk({
+            "guild_id": str(GUILD_ID),
+            "members": [_member(i) for i in ids],
+            "presences": [_presence(i) for i in ids if presences and i % 10 < 3],
+            "chunk_index": index,
+            "chunk_count": count,
+            "nonce": request.nonce,
+        })
+    return request.buffer
+
+
+def _heap_mb() -> float:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 1024 / 1024
+
+
+async def run_profile(name: str, members: int, online: float, messages: int, joins: int) -> list[tuple]:
+    random.seed(0)
+    profile = CACHE_PROFILES[name]
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.message_content = True
+    options = client_options(profile, intents)
+    state = ConnectionState(dispatch=lambda *a, **k: None, handlers={}, hooks={}, http=None, **options)
+    state.loop = asyncio.get_running_loop()
+
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    rows = []
+
+    def record(phase, started):
+        gc.collect()
+        heap = (tracemalloc.get_traced_memory()[0] - base) / 1024 / 1024
+        rows.append((name, phase, heap, len(guild._members), time.perf_counter() - started))
+
+    started = time.perf_counter()
+    guild = state._add_guild_from_data(_guild(members))
+    if profile["chunk_at_startup"]:
+        _chunk(state, members, cache=True, presences=profile["presences"])
+    record("startup", started)
+
+    started = time.perf_counter()
+    if profile["presences"]:
+        for i in random.sample(range(members), int(members * online)):
+            state.parse_presence_update(_presence(i))
+    for n in range(joins):
+        state.parse_guild_member_add({**_member(members + n), "guild_id": str(GUILD_ID)})
+    for n in range(messages):
+        state.parse_message_create(_message(n, random.randrange(members)))
+    record("traffic", started)
+
+    # RoleAll / serverinfo on an unchunked guild: guild.chunk(cache=False), which
+    # discord.py caches anyway when the cache flags keep joined members
+    started = time.perf_counter()
+    if not guild.chunked:
+        fetched = _chunk(state, members, cache=state.member_cache_flags.joined, presences=False)
+        rows.append((name, "on-demand peak", _heap_mb() - base / 1024 / 1024, len(fetched), 0.0))
+        del fetched
+    record("after on-demand", started)
+
+    tracemalloc.stop()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--online", type=float, default=0.3, help="fraction of members sending presence updates")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--joins", type=int, default=1000)
+    parser.add_argument("--profiles", default=",".join(CACHE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':<9} {'phase':<16} {'heap MiB':>9} {'members':>8} {'seconds':>8}")
+    for name in args.profiles.split(","):
+        rows = asyncio.run(run_profile(name, args.members, args.online, args.messages, args.joins))
+        for profile, phase, heap, cached, seconds in rows:
+            print(f"{profile:<9} {phase:<16} {heap:>9.1f} {cached:>8} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
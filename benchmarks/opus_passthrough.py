@@ -0,0 +1,89 @@
+"""CPU cost per concurrent voice session for each Music codec path.
+
+Plays a local file through N simulated sessions that pull frames at real
+time (one 20ms frame per tick, like discord.py's AudioPlayer) and reports
+process + ffmpeg CPU per session for:
+
+  pcm      FFmpegPCMAudio, Opus-encoded in Python per frame (legacy path)
+  libopus  FFmpegOpusAudio, ffmpeg encodes to Opus
+  copy     FFmpegOpusAudio stream copy (input must already be Opus/WebM)
+
+Usage:
+    python benchmarks/opus_passthrough.py song.webm --sessions 8 --seconds 20
+"""
+import argparse
+import resource
+import threading
+import time
+
+import discord
+
+FRAME = discord.opus.Encoder.FRAME_LENGTH / 1000  # seconds
+
+
+def _source(path: str, mode: str) -> discord.AudioSource:
+    if mode == "pcm":
+        return discord.FFmpegPCMAudio(path, options="-vn")
+    if mode == "copy":
+        return discord.FFmpegOpusAudio(path, codec="opus", options="-vn")
+    return discord.FFmpegOpusAudio(path, options="-vn")
+
+
+def _session(source: discord.AudioSource, seconds: float):
+    # Mirrors AudioPlayer._do_run: PCM frames are encoded in this thread.
+    encoder = None if source.is_opus() else discord.opus.Encoder()
+    next_at = time.perf_counter()
+    for _ in range(int(seconds / FRAME)):
+        data = source.read()
+        if not data:
+            break
+        if encoder:
+            encoder.encode(data, encoder.SAMPLES_PER_FRAME)
+        next_at += FRAME
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    source.cleanup()
+
+
+def _cpu() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)  # reaped ffmpeg processes
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def run(path: str, mode: str, sessions: int, seconds: float) -> float:
+    """Return CPU% of one core per session."""
+    cpu0, wall0 = _cpu(), time.perf_counter()
+    threads = [
+        threading.Thread(target=_session, args=(_source(path, mode), seconds))
+        for _ in range(sessions)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    cpu, wall = _cpu() - cpu0, time.perf_counter() - wall0
+    return 100 * cpu / wall / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="local audio file (use an Opus/WebM file to include 'copy')")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--modes", default="pcm,libopus,copy")
+    args = parser.parse_args()
+
+    if not discord.opus.is_loaded():
+        discord.opus._load_default()
+
+    print(f"{'mode':<8} {'sessions':>8} {'cpu/session':>12} {'sessions/core':>14}")
+    for mode in args.modes.split(","):
+        per_session = run(args.path, mode, args.sessions, args.seconds)
+        per_core = 100 / per_session if per_session else float("inf")
+        print(f"{mode:<8} {args.sessions:>8} {per_session:>11.2f}% {per_core:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Offline scalability benchmark for the Music cog.
+
+Spins up N simulated guilds, each with a stub voice client that pulls
+frames from the real audio source at real time (like discord.py's
+AudioPlayer thread). Tracks are queued through ``Music._handle_play`` and
+advanced by ``_start_if_idle`` / ``_after_track``, so the queue, playback
+and persistence paths all run as they do in production -- only Discord
+and yt-dlp are replaced (stream URLs resolve to a local file).
+
+Reports per-session CPU, bot and ffmpeg RSS, frame timing jitter and
+gaps between tracks.
+
+Usage:
+    python benchmarks/voice_sessions.py song.webm --sessions 16 --tracks 3 --clip 8
+"""
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["STORE_PATH"] = os.path.join(tempfile.mkdtemp(), "store.db")  # saved sessions
+
+import discord  # noqa: E402
+
+from cogs import music  # noqa: E402
+
+FRAME = discord.opus.Encoder.FRAME_LENGTH / 1000  # seconds
+
+
+class SessionStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.jitter: list[float] = []
+        self.gaps: list[float] = []
+        self.last_frame = None
+        self.new_track = False
+
+    def track_started(self):
+        with self.lock:
+            self.new_track = True
+
+    def frame(self, now: float):
+        with self.lock:
+            if self.last_frame is not None:
+                interval = now - self.last_frame
+                if self.new_track:
+                    self.gaps.append(interval)
+                else:
+                    self.jitter.append(abs(interval - FRAME))
+            self.new_track = False
+            self.last_frame = now
+
+
+class StubVoiceClient:
+    """Consumes an AudioSource at real time; mirrors AudioPlayer's state flags."""
+
+    def __init__(self, channel_id: int, stats: SessionStats):
+        self.channel = SimpleNamespace(id=channel_id, members=[])
+        self.stats = stats
+        self.source = None
+        self._end = threading.Event()
+        self._end.set()
+        self._paused = False
+
+    def is_playing(self):
+        return not self._end.is_set() and not self._paused
+
+    def is_paused(self):
+        return not self._end.is_set() and self._paused
+
+    def play(self, source, *, after=None):
+        self.source = source
+        self._end = threading.Event()
+        self.stats.track_started()
+        threading.Thread(target=self._run, args=(source, after, self._end), daemon=True).start()
+
+    def stop(self):
+        self._end.set()
+
+    async def disconnect(self, *, force=False):
+        self.stop()
+
+    def _run(self, source, after, end):
+        encoder = None if source.is_opus() else discord.opus.Encoder()
+        next_at = time.perf_counter()
+        while not end.is_set():
+            data = source.read()
+            if not data:
+                break
+            if encoder:
+                encoder.encode(data, encoder.SAMPLES_PER_FRAME)
+            self.stats.frame(time.perf_counter())
+            next_at += FRAME
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        end.set()
+        source.cleanup()
+        if after:
+            after(None)
+
+
+class StubChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+
+    async def send(self, *args, **kwargs):
+        return None
+
+
+def _patch_music(path: str, acodec: str, clip: float):
+    """Route extraction and streaming to the local file."""
+    async def _extract(query, *, flat=False):
+        return {
+            "title": "bench",
+            "entries": [{"title": f"{query} #{i}", "webpage_url": path, "duration": int(clip)} for i in range(_extract.tracks)],
+        }
+
+    async def _fresh_stream(webpage_url, *, max_tries=2):
+        return webpage_url, acodec
+
+    music._extract = _extract
+    music._fresh_stream = _fresh_stream
+    # Local files: drop the HTTP reconnect flags, cap each track to --clip seconds.
+    music.FFMPEG_OPTS = {"before_options": "", "options": f"-vn -t {clip}"}
+    music.SESSIONS_FILE = os.path.join(tempfile.mkdtemp(), "music_sessions.json")  # no legacy import
+    return _extract
+
+
+def _cpu() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _rss_kb(pid="self") -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+async def run(args):
+    extract = _patch_music(args.path, args.acodec, args.clip)
+    extract.tracks = args.tracks
+    loop = asyncio.get_running_loop()
+    bot = SimpleNamespace(loop=loop, guilds=[], user=None)
+    cog = music.Music(bot)
+    bot.get_cog = lambda name: cog  # player callbacks resolve the live cog (hot reload)
+
+    guilds, stats = [], []
+    for i in range(args.sessions):
+        s = SessionStats()
+        guild = SimpleNamespace(id=i + 1, voice_client=StubVoiceClient(10_000 + i, s))
+        guilds.append(guild)
+        stats.append(s)
+    bot.guilds = guilds
+
+    rss0, cpu0, wall0 = _rss_kb(), _cpu(), time.perf_counter()
+    await asyncio.gather(*(
+        cog._handle_play(g, StubChannel(20_000 + g.id), "bench", f"https://example.invalid/{g.id}")
+        for g in guilds
+    ))
+
+    bot_rss, ffmpeg_rss = rss0, 0
+    sampled = False
+    while any(g.voice_client.is_playing() or cog.queues.get(g.id) for g in guilds):
+        await asyncio.sleep(0.5)
+        if not sampled and time.perf_counter() - wall0 > args.clip / 2:
+            sampled = True
+            bot_rss = _rss_kb()
+            for g in guilds:
+                proc = getattr(g.voice_client.source, "_process", None)
+                if proc:
+                    ffmpeg_rss += _rss_kb(proc.pid)
+    cpu, wall = _cpu() - cpu0, time.perf_counter() - wall0
+
+    if cog._save_task:
+        cog._save_task.cancel()
+
+    jitter = [j for s in stats for j in s.jitter]
+    gaps = [g for s in stats for g in s.gaps]
+    n = args.sessions
+    print(f"sessions            {n}  ({args.tracks} tracks x {args.clip:.0f}s, codec path: {cog.codec_paths.get(1)})")
+    print(f"cpu / session       {100 * cpu / wall / n:.2f}% of one core")
+    print(f"bot rss / session   {(bot_rss - rss0) / n:.0f} KiB  (total {bot_rss / 1024:.1f} MiB)")
+    print(f"ffmpeg rss / sess.  {ffmpeg_rss / n:.0f} KiB")
+    print(f"frame jitter        p50 {_pct(jitter, .5) * 1e3:.2f}ms  p99 {_pct(jitter, .99) * 1e3:.2f}ms  max {max(jitter, default=0) * 1e3:.2f}ms")
+    print(f"transition gap      p50 {_pct(gaps, .5) * 1e3:.0f}ms  p99 {_pct(gaps, .99) * 1e3:.0f}ms  mean {statistics.fmean(gaps) * 1e3 if gaps else 0:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="local audio file used for every track")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--tracks", type=int, default=3, help="tracks queued per session")
+    parser.add_argument("--clip", type=float, default=8, help="seconds played per track")
+    parser.add_argument("--acodec", default="opus", help="codec reported to the cog (opus, aac, ...)")
+    args = parser.parse_args()
+
+    if not discord.opus.is_loaded():
+        discord.opus._load_default()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 import discord
 from discord.ext import commands
 import json, os, asyncio
+import logging
+
+from utils.store import store
+
+logger = logging.getLogger(__name__)
 
 AUTOROLE_FILE = "/data/autorole.json"
+TABLE = "autoroles"  # keyed by guild id
 
-def load_autoroles():
+def _load_legacy():
     if not os.path.exists(AUTOROLE_FILE):
         return {}
     try:
@@ -13,9 +19,11 @@ def load_autoroles():
     except json.JSONDecodeError:
         return {}
 
+def load_autoroles():
+    return store.load(TABLE, legacy=_load_legacy)
+
 def save_autoroles(data: dict):
-    with open(AUTOROLE_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    store.save(TABLE, data)
 
 class AutoRole(commands.Cog):
     def __init__(self, bot):
@@ -23,6 +31,14 @@ class AutoRole(commands.Cog):
         self.autoroles = load_autoroles()  # {guild_id: {"human": role_id, "bot": role_id, "invites": {invite_code: role_id}}}
         self.invite_cache = {}  # {guild_id: {invite_code: uses}}
 
+    # Hot reload (utils/startup.py: reload_extension): on_ready doesn't run
+    # again, so keep the invite counts used to tell which invite a member used
+    def export_state(self) -> dict:
+        return {"invite_cache": self.invite_cache}
+
+    def import_state(self, state: dict):
+        self.invite_cache = state["invite_cache"]
+
     async def cache_invites(self, guild: discord.Guild):
         try:
             invites = await guild.invites()
@@ -119,9 +135,9 @@ class AutoRole(commands.Cog):
                 try:
                     await member.add_roles(role, reason="AutoRole assignment")
                 except discord.Forbidden:
-                    print(f"[AutoRole] Missing permissions to assign {role.name} in {guild.name}")
+                    logger.warning(f"Missing permissions to assign {role.name} in {guild.name}")
                 except Exception as e:
-                    print(f"[AutoRole] Failed to assign role {role_id} in {guild.name}: {e}")
+                    logger.error(f"Failed to assign role {role_id} in {guild.name}: {e}")
 
 async def setup(bot):
     await bot.add_cog(AutoRole(bot))
@@ -0,0 +1,87 @@
+import time
+
+import discord
+from discord.ext import commands
+
+
+class Cluster(commands.Cog):
+    """Owner-only view of the bot's clusters (one process per shard range)."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.started = time.monotonic()
+
+    async def cog_load(self):
+        if self.bot.cluster:
+            self.bot.cluster.handler("stats")(self.stats)
+
+    async def stats(self) -> dict:
+        """This process's numbers, as returned to ``$clusters`` on any cluster."""
+        return {
+            "cluster": self.bot.cluster.cluster_id if self.bot.cluster else 0,
+            "shards": list(getattr(self.bot, "shard_ids", None) or [0]),
+            "guilds": len(self.bot.guilds),
+            "users": len(self.bot.users),
+            "latency": self.bot.latency * 1000,
+            "uptime": time.monotonic() - self.started,
+        }
+
+    async def _owner_only(self, ctx) -> bool:
+        if await self.bot.is_owner(ctx.author):
+            return True
+        await ctx.send("❌ Only the bot owner can use this command.")
+        return False
+
+    @commands.command(name="clusters")
+    async def clusters(self, ctx):
+        """Guilds, latency and uptime of every cluster: $clusters"""
+        if not await self._owner_only(ctx):
+            return
+
+        if self.bot.cluster:
+            try:
+                results = await self.bot.cluster.broadcast("stats")
+                status = {s["cluster"]: s for s in await self.bot.cluster.request("status")}
+            except Exception as e:
+                return await ctx.send(f"❌ Couldn't reach the cluster coordinator: {e}")
+        else:
+            results, status = [await self.stats()], {}
+
+        embed = discord.Embed(title="🧩 Clusters", color=discord.Color.blurple())
+        for result in results:
+            cid = result.get("cluster")
+            if "error" in result:
+                embed.add_field(name=f"Cluster {cid}", value=f"⚠️ {result['error']}", inline=False)
+                continue
+            shards = result["shards"]
+            restarts = status.get(cid, {}).get("restarts", 0)
+            embed.add_field(
+                name=f"Cluster {cid} (shards {shards[0]}-{shards[-1]})",
+                value=(
+                    f"{result['guilds']} guilds, {result['users']} users\n"
+                    f"{result['latency']:.0f}ms, up {result['uptime'] / 3600:.1f}h, {restarts} restarts"
+                ),
+                inline=False,
+            )
+        down = [cid for cid, s in status.items() if not s["connected"]]
+        if down:
+            embed.add_field(name="⚠️ Not connected", value=", ".join(map(str, down)), inline=False)
+        embed.set_footer(text=f"{sum(r.get('guilds', 0) for r in results)} guilds total")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="clusterrestart")
+    async def clusterrestart(self, ctx, cluster_id: int):
+        """Restart one cluster process: $clusterrestart <id>"""
+        if not await self._owner_only(ctx):
+            return
+        if not self.bot.cluster:
+            return await ctx.send("❌ The bot isn't running in cluster mode.")
+        try:
+            await self.bot.cluster.request("restart", cluster=cluster_id)
+        except Exception as e:
+            return await ctx.send(f"❌ Couldn't restart cluster {cluster_id}: {e}")
+        await ctx.send(f"🔄 Restarting cluster {cluster_id}...")
+
+
+async def setup(bot):
+    await bot.add_cog(Cluster(bot))
@@ -1,12 +1,13 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from PIL import Image
 import io
-import aiohttp
 import random
 import asyncio
 
+from utils.assets import assets, avatars
+from utils.render import render, RenderBusy, encode_image, image_filename
+
 # Hardcoded emojis (kept EXACTLY as provided)
 BATTLE_EMOJI = "<:battle:1422344657790177300>"
 WINNER_EMOJI = "<:winner:1422344992760004638>"
@@ -88,48 +89,37 @@ def hp_bar(hp: int, max_hp: int) -> str:
     return bar + "⬛" * empty_bars + f"\n{HEALTH_EMOJI}  {hp}/{max_hp} Health"
 
 
+BACKGROUND_URL = "https://i.postimg.cc/G2nh3f9r/Picsart-25-08-25-02-44-59-583.jpg"
+BACKGROUND_SIZE = (1500, 500)
+
+
+def render_battle_image(background, avatar1, avatar2) -> bytes:
+    """Compose the battle banner; usually in a render worker, but never paste onto the shared background."""
+    image = background.copy()
+    image.paste(avatar1, (40, 90), avatar1)
+    image.paste(avatar2, (1104, 90), avatar2)
+    return encode_image(image, "battle")
+
+
 # ✅ IMAGE GENERATION FUNCTION
 async def create_battle_image(player1, player2):
-    # Load player avatars
-    async with aiohttp.ClientSession() as session:
-        async with session.get(player1.display_avatar.url) as resp:
-            avatar1_bytes = await resp.read()
-        async with session.get(player2.display_avatar.url) as resp:
-            avatar2_bytes = await resp.read()
-
-        # Download background image
-        background_url = "https://i.postimg.cc/G2nh3f9r/Picsart-25-08-25-02-44-59-583.jpg"
-        async with session.get(background_url) as resp:
-            if resp.status != 200:
-                raise Exception(f"Failed to download background image: {resp.status}")
-            background_bytes = await resp.read()
-
-    avatar1 = Image.open(io.BytesIO(avatar1_bytes)).convert("RGBA")
-    avatar2 = Image.open(io.BytesIO(avatar2_bytes)).convert("RGBA")
-
-    # Resize avatars
-    avatar1 = avatar1.resize((320, 320))
-    avatar2 = avatar2.resize((320, 320))
-
-    # Open background
-    background = Image.open(io.BytesIO(background_bytes)).convert("RGBA")
-    background = background.resize((1500, 500))  # adjust size if needed
-
-    # Paste avatars
-    background.paste(avatar1, (40, 90), avatar1)
-    background.paste(avatar2, (1104, 90), avatar2)
-
-    # Save to buffer
-    buffer = io.BytesIO()
-    background.save(buffer, format="PNG")
-    buffer.seek(0)
-    return buffer
+    # Load player avatars (cached per avatar hash, fetched concurrently at CDN size)
+    avatar1, avatar2 = await avatars.pair(player1, player2, 320)
+
+    # Background is fetched and resized once, then shared
+    background = await assets.image(BACKGROUND_URL, size=BACKGROUND_SIZE)
+
+    return io.BytesIO(await render.run(render_battle_image, background, avatar1, avatar2))
 
 
 class DeathBattle(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        # Warm the background in the background; startup shouldn't wait on postimg
+        self._preload = asyncio.create_task(assets.preload((BACKGROUND_URL, {"size": BACKGROUND_SIZE})))
+
     # Slash command
     @app_commands.command(name="deathbattle", description="Start a deathbattle between two players!")
     async def deathbattle_slash(self, interaction: discord.Interaction, player1: discord.Member, player2: discord.Member, hp: int = 100):
@@ -247,13 +237,15 @@ class DeathBattle(commands.Cog):
         embed.add_field(name=player1.name, value=hp_bar(hp1, hp), inline=True)
         embed.add_field(name=player2.name, value=hp_bar(hp2, hp), inline=True)
 
-        buffer = await create_battle_image(player1, player2)  # your BytesIO image
-        file = discord.File(fp=buffer, filename="battle.png")
-
-
-
-        
-        msg = await send(embed=embed, file=file)
+        try:
+            buffer = await create_battle_image(player1, player2)  # your BytesIO image
+        except (RenderBusy, asyncio.TimeoutError):
+            buffer = None  # renderer is swamped; fight without the banner
+
+        if buffer:
+            msg = await send(embed=embed, file=discord.File(fp=buffer, filename=image_filename("battle")))
+        else:
+            msg = await send(embed=embed)
         if is_interaction:
             msg = await ctx_or_interaction.original_response()
 
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import discord
+from discord.ext import commands
+
+from utils.startup import reload_extension
+from utils.watchdog import watchdog
+
+
+class Diagnostics(commands.Cog):
+    """Owner-only runtime diagnostics and maintenance."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        if self.bot.cluster:
+            self.bot.cluster.handler("reload")(self.reload_here)
+
+    async def reload_here(self, name: str) -> dict:
+        """Reload extension ``name`` in this process (called on every cluster by ``$reload``)."""
+        cluster = self.bot.cluster.cluster_id if self.bot.cluster else 0
+        restored = await reload_extension(self.bot, name)
+        return {"cluster": cluster, "restored": restored}
+
+    def _extension_name(self, name: str) -> str | None:
+        for candidate in (name, f"cogs.{name}"):
+            if candidate in self.bot.extensions:
+                return candidate
+        return None
+
+    @commands.command(name="stalls")
+    async def stalls(self, ctx, action: str = None):
+        """Where the event loop was blocked: $stalls, or $stalls clear"""
+        if not await self.bot.is_owner(ctx.author):
+            return await ctx.send("❌ Only the bot owner can use this command.")
+
+        if action and action.lower() == "clear":
+            watchdog.clear()
+            return await ctx.send("🧹 Cleared recorded stalls.")
+
+        top = watchdog.top()
+        if not top:
+            return await ctx.send(f"✅ No event-loop stalls over {watchdog.threshold * 1000:.0f}ms recorded.")
+
+        embed = discord.Embed(
+            title="🐢 Event-loop stalls",
+            description=f"Blocked for more than {watchdog.threshold * 1000:.0f}ms, by total time blocked",
+            color=discord.Color.orange()
+        )
+        for location, stats in top:
+            embed.add_field(
+                name=location[:256],
+                value=(
+                    f"{stats['count']}× · total {stats['total'] * 1000:.0f}ms · max {stats['max'] * 1000:.0f}ms\n"
+                    f"last <t:{int(stats['last'])}:R>"
+                ),
+                inline=False
+            )
+
+        last = next((s for s in reversed(watchdog.recent_stalls()) if s.get("stack")), None)
+        if last:
+            stack = "".join(last["stack"][-6:])
+            embed.add_field(
+                name=f"Latest: {last['duration'] * 1000:.0f}ms via {last.get('entry') or last.get('task')}"[:256],
+                value=f"```py\n{stack[-1000:]}\n```",
+                inline=False
+            )
+        if self.bot.cluster:
+            embed.set_footer(text=f"Cluster {self.bot.cluster.cluster_id}")
+        embed.timestamp = datetime.utcnow()
+        await ctx.send(embed=embed)
+
+
+    @commands.command(name="reload")
+    async def reload(self, ctx, extension: str):
+        """Reload one extension without restarting, keeping its cogs' state: $reload music"""
+        if not await self.bot.is_owner(ctx.author):
+            return await ctx.send("❌ Only the bot owner can use this command.")
+
+        name = self._extension_name(extension)
+        if name is None:
+            return await ctx.send(f"❌ No loaded extension `{extension}`.")
+
+        try:
+            if self.bot.cluster:
+                results = await self.bot.cluster.broadcast("reload", name=name)
+            else:
+                results = [await self.reload_here(name)]
+        except Exception as e:
+            return await ctx.send(f"❌ Reloading `{name}` failed: {e}")
+
+        lines = []
+        for result in results:
+            prefix = f"Cluster {result['cluster']}: " if self.bot.cluster else ""
+            if "error" in result:
+                lines.append(f"{prefix}❌ {result['error']}")
+            else:
+                kept = ", ".join(result["restored"]) or "no state"
+                lines.append(f"{prefix}✅ kept {kept}")
+        await ctx.send(f"🔄 Reloaded `{name}`\n" + "\n".join(lines))
+
+
+async def setup(bot):
+    await bot.add_cog(Diagnostics(bot))
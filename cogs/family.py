@@ -5,6 +5,8 @@ import asyncio
 import json
 import os
 
+from utils.store import store
+
 Embed_Colors = {
     "red": discord.Color(0xFF0000),
     "orange": discord.Color(0xFF6A00),
@@ -19,16 +21,19 @@ Embed_Colors = {
 }
 
 DATA_FILE = "/data/family.json"
+TABLE = "family"  # keyed by user id, so any cluster may write any row
 
-def load_data():
+def _load_legacy():
     if os.path.exists(DATA_FILE):
         with open(DATA_FILE, "r") as f:
             return json.load(f)
     return {}
 
+def load_data():
+    return store.load(TABLE, legacy=_load_legacy)
+
 def save_data(data):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    store.save(TABLE, data)
 
 class AcceptDeclineView(ui.View):
     def __init__(self, proposer_id, target_id, action):
@@ -107,6 +112,17 @@ class Family(commands.Cog):
     def save(self):
         save_data(self.data)
 
+    def refresh(self):
+        """Pick up marriages and adoptions made through other clusters."""
+        store.pull(TABLE, self.data)
+
+    async def cog_before_invoke(self, ctx):
+        self.refresh()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        self.refresh()
+        return True
+
     def get_user(self, user_id):
         if str(user_id) not in self.data:
             self.data[str(user_id)] = {"married_to": None, "kids": [], "parent": None}
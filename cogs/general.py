@@ -1,26 +1,190 @@
 import discord
 from discord.ext import commands, tasks
+# Pillow stays eager: main.py already loads it through utils.render/utils.assets
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 from discord import app_commands
 from discord import ui
 from discord import Interaction
 import logging
-import pilmoji
 import asyncio
 import os
 import random
-import aiohttp
 import io
 import textwrap
 from datetime import datetime
 from config import Config
-from googletrans import Translator, LANGUAGES
 from difflib import get_close_matches
+from utils.assets import avatars, load_font, REG_FONTS, BOLD_FONTS
+from utils.render import render, RenderBusy, encode_image, image_filename
+from utils.startup import lazy_import
 
-translator = Translator()
+# Only the ship card and $translate need these; import them on first use
+pilmoji = lazy_import("pilmoji")
+googletrans = lazy_import("googletrans")
+_translator = None
+
+def get_translator():
+    global _translator
+    if _translator is None:
+        _translator = googletrans.Translator()
+    return _translator
 
 logger = logging.getLogger(__name__)
 
+
+# --- Ship image (drawn in a render worker, see utils.render) ---
+SHIP_W, SHIP_H = 1000, 600
+AV_SIZE = 280
+LEFT_X = 140
+TOP_Y = 150
+RIGHT_X = SHIP_W - LEFT_X - AV_SIZE
+CENTER_X = SHIP_W // 2
+
+
+def make_circular(img):
+    size = img.size
+    mask = Image.new('L', size, 0)
+    mask_draw = ImageDraw.Draw(mask)
+    mask_draw.ellipse((0, 0) + size, fill=255)
+
+    circular_img = Image.new('RGBA', size, (0, 0, 0, 0))
+    circular_img.paste(img, (0, 0))
+    circular_img.putalpha(mask)
+    return circular_img
+
+
+# ---------- FONT LOADING + BIG-TEXT FALLBACK ----------
+# Fonts are resolved once per process and cached (see utils.assets.load_font);
+# render workers resolve the ship fonts when they start
+for _size in (20, 40):
+    render.warmup(load_font, REG_FONTS, _size)
+    render.warmup(load_font, BOLD_FONTS, _size)
+
+def draw_text_big(img, xy, text, size, *, bold=False,
+                  fill=(255, 255, 255, 255), stroke_width=0,
+                  stroke_fill=(0, 0, 0, 255), anchor="mm"):
+    """Renders big text. Uses real TTF if found; otherwise draws bitmap text scaled up."""
+    font = load_font(BOLD_FONTS if bold else REG_FONTS, size)
+    d = ImageDraw.Draw(img)
+    if font:
+        d.text(xy, text, font=font, fill=fill,
+               stroke_width=stroke_width, stroke_fill=stroke_fill, anchor=anchor)
+        return
+
+    # Fallback: scale up bitmap font (ImageFont.load_default())
+    base_font = ImageFont.load_default()
+    # estimate scale factor (default font ~11-12 px). Use integer scale
+    scale = max(2, int(size / 8))
+    # Render small then scale nearest-neighbor to preserve sharpness
+    # first get bbox for the small font
+    temp = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
+    td = ImageDraw.Draw(temp)
+    bbox = td.textbbox((0, 0), text, font=base_font)
+    w, h = bbox[2] - bbox[0] + 6, bbox[3] - bbox[1] + 6
+    temp = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    td = ImageDraw.Draw(temp)
+    # draw stroke by drawing multiple offsets (cheap)
+    if stroke_width > 0:
+        for ox in range(-stroke_width, stroke_width + 1):
+            for oy in range(-stroke_width, stroke_width + 1):
+                if ox == 0 and oy == 0:
+                    continue
+                td.text((3 + ox, 3 + oy), text, font=base_font, fill=stroke_fill)
+    td.text((3, 3), text, font=base_font, fill=fill)
+    # scale up
+    scaled = temp.resize((temp.width * scale, temp.height * scale), Image.NEAREST)
+    # compute top-left placement for anchor="mm"
+    x, y = xy
+    if anchor == "mm":
+        x = int(x - scaled.width / 2)
+        y = int(y - scaled.height / 2)
+    img.alpha_composite(scaled, (int(x), int(y)))
+
+
+# ---------- VECTOR HEART (always renders, no emoji needed) ----------
+def draw_vector_heart(canvas: Image.Image, center_xy, size_px,
+                      fill=(255, 0, 0, 255), outline=(0, 0, 0, 255), outline_thickness=10):
+    """Draw a heart composed of two circles + triangle; apply an outline via gaussian blur"""
+    cx, cy = center_xy
+    s = max(40, int(size_px))
+    # Create heart mask (L mode)
+    heart_mask = Image.new("L", (s, s), 0)
+    hd = ImageDraw.Draw(heart_mask)
+
+    # geometry values (simple proportions)
+    r = s // 4
+    top_y = s // 4
+    left_x = s // 2 - 2 * r
+    right_x = s // 2
+    # two circles
+    hd.ellipse([left_x, top_y - r, left_x + 2 * r, top_y + r], fill=255)
+    hd.ellipse([right_x, top_y - r, right_x + 2 * r, top_y + r], fill=255)
+    # triangle tip
+    tip_y = s - max(4, s // 10)
+    hd.polygon([(left_x, top_y + r // 2),
+                (right_x + 2 * r, top_y + r // 2),
+                (s // 2, tip_y)], fill=255)
+
+    # Outline mask created by blurring the mask then thresholding
+    # Normalize outline_thickness to reasonable blur radius
+    radius = max(2, int(outline_thickness / 2))
+    outline_mask = heart_mask.filter(ImageFilter.GaussianBlur(radius))
+    # Create RGBA layers and paste
+    ox = int(cx - s / 2)
+    oy = int(cy - s / 2)
+
+    # Paste outline (use outline_mask as alpha)
+    outline_layer = Image.new("RGBA", (s, s), outline)
+    canvas.paste(outline_layer, (ox, oy), outline_mask)
+    # Paste fill
+    fill_layer = Image.new("RGBA", (s, s), fill)
+    canvas.paste(fill_layer, (ox, oy), heart_mask)
+
+
+def render_ship(avatar1, avatar2, percentage, bg_color, name1, name2) -> bytes:
+    """Draw the ship card (runs in a render worker); returns the encoded image."""
+    W, H = SHIP_W, SHIP_H
+    base = Image.new("RGBA", (W, H), bg_color)
+
+    # Paste avatars
+    avatar1 = make_circular(avatar1)
+    avatar2 = make_circular(avatar2)
+    base.paste(avatar1, (LEFT_X, TOP_Y), avatar1)
+    base.paste(avatar2, (RIGHT_X, TOP_Y), avatar2)
+
+    # ---------- Draw everything (BIG sizes) ----------
+    # Title with heart emojis (bigger and centered at top)
+    with pilmoji.Pilmoji(base) as pilmoji_renderer:
+        pilmoji_renderer.text((CENTER_X - 250, 30), "♥️Love Match♥️", font_size=120, emoji_size_factor=1.0)
+
+    # Choose heart emoji based on percentage
+    if percentage > 70:
+        heart_emoji = "♥️"
+    elif percentage >= 20:
+        heart_emoji = "💛"
+    else:
+        heart_emoji = "💔"
+
+    # Use pilmoji to render the heart emoji (much bigger and perfectly centered)
+    with pilmoji.Pilmoji(base) as pilmoji_renderer:
+        # Calculate position for perfectly centered emoji in the middle of the image
+        emoji_x = CENTER_X - 120  # Adjust for much bigger emoji width
+        emoji_y = H // 2 - 60  # Center vertically in the middle of the image
+        pilmoji_renderer.text((emoji_x, emoji_y), heart_emoji, font_size=240, emoji_size_factor=1.0)
+
+    # Percentage below heart (BIGGER)
+    draw_text_big(base, (CENTER_X, H // 2 + 100), f"{percentage}%", 40, bold=True,
+                  fill=(255, 255, 255, 255), stroke_width=8, stroke_fill=(0, 0, 0, 220), anchor="mm")
+
+    # Usernames under pfps (closer to avatars)
+    draw_text_big(base, (LEFT_X + AV_SIZE//2, TOP_Y + AV_SIZE + 20), name1, 20, bold=True,
+                  fill=(255, 255, 255, 255), stroke_width=3, stroke_fill=(0, 0, 0, 200), anchor="mm")
+    draw_text_big(base, (RIGHT_X + AV_SIZE//2, TOP_Y + AV_SIZE + 20), name2, 20, bold=True,
+                  fill=(255, 255, 255, 255), stroke_width=3, stroke_fill=(0, 0, 0, 200), anchor="mm")
+
+    return encode_image(base, "ship")
+
+
 class General(commands.Cog):
     """General commands for the bot"""
 
@@ -29,6 +193,14 @@ class General(commands.Cog):
         self.deleted_messages = {}  # channel_id -> [discord.Message]
         self.edited_messages = {}   # channel_id -> [{"before": before, "after": after}]
 
+    # Hot reload (utils/startup.py: reload_extension) keeps the snipe buffers
+    def export_state(self) -> dict:
+        return {"deleted": self.deleted_messages, "edited": self.edited_messages}
+
+    def import_state(self, state: dict):
+        self.deleted_messages = state["deleted"]
+        self.edited_messages = state["edited"]
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         # Ignore messages from bots
@@ -375,17 +547,17 @@ class General(commands.Cog):
                 lang_code = "en"
             else:
                 lang = lang.lower()
-                if lang in LANGUAGES:
+                if lang in googletrans.LANGUAGES:
                     lang_code = lang  # exact code
                 else:
                     # Fuzzy match against language names
                     from difflib import get_close_matches
-                    names = list(LANGUAGES.values())
+                    names = list(googletrans.LANGUAGES.values())
                     closest = get_close_matches(lang, names, n=1, cutoff=0.4)
                     if closest:
                         # Find the code for the closest match
                         lang_code = next(
-                            (code for code, name in LANGUAGES.items() if name == closest[0]), "en"
+                            (code for code, name in googletrans.LANGUAGES.items() if name == closest[0]), "en"
                         )
                     else:
                         lang_code = "en"  # default to English if nothing close
@@ -399,7 +571,7 @@ class General(commands.Cog):
                 return
 
             # Translate the text
-            translated = translator.translate(original_text, dest=lang_code)
+            translated = get_translator().translate(original_text, dest=lang_code)
 
             # Build embed
             embed = discord.Embed(
@@ -433,6 +605,8 @@ class General(commands.Cog):
             discord.Status.offline: "⚫ Offline"
         }
         status_display = status_map.get(getattr(member, "status", discord.Status.offline), "❓ Unknown")
+        if not self.bot.intents.presences:
+            status_display = "❓ Unknown"  # presences are off in the lean/minimal cache profiles
 
         # Activity display
         activity_display = "❌ None"
@@ -548,6 +722,21 @@ class General(commands.Cog):
             timestamp=datetime.utcnow()
         )
 
+        stats = getattr(self.bot, "shard_stats", None)
+        if stats:
+            shards = stats.shards()
+            guild = getattr(ctx_or_interaction, "guild", None)
+            if guild and len(shards) > 1:
+                embed.description += f"\nThis server is on shard **{guild.shard_id}** of {len(shards)}"
+            embed.add_field(
+                name="Shards",
+                value="\n".join(
+                    f"`#{s['id']}` {s['latency']:.0f}ms · {s['guilds']} guilds · {s['rate']:.1f} ev/s"
+                    for s in shards[:20]
+                ) + (f"\n… {len(shards) - 20} more" if len(shards) > 20 else ""),
+                inline=False
+            )
+
         await self._send_response(ctx_or_interaction, embed=embed)
 
     # Prefix command
@@ -629,184 +818,21 @@ class General(commands.Cog):
         ship_name = name1[:len(name1)//2] + name2[len(name2)//2:]
 
         # --- Build the image ---
-        W, H = 1000, 600
-        AV_SIZE = 280
-        LEFT_X = 140
-        TOP_Y = 150
-        RIGHT_X = W - LEFT_X - AV_SIZE
-        CENTER_X = W // 2
-
         # Random pastel background
         def pastel_component(): return random.randint(180, 255)
         bg_color = (pastel_component(), pastel_component(), pastel_component(), 255)
-        base = Image.new("RGBA", (W, H), bg_color)
-        draw = ImageDraw.Draw(base)
-
-        # Function to make image circular
-        def make_circular(img):
-            size = img.size
-            mask = Image.new('L', size, 0)
-            mask_draw = ImageDraw.Draw(mask)
-            mask_draw.ellipse((0, 0) + size, fill=255)
-
-            circular_img = Image.new('RGBA', size, (0, 0, 0, 0))
-            circular_img.paste(img, (0, 0))
-            circular_img.putalpha(mask)
-            return circular_img
-
-        # Fetch avatars and make them circular
-        async with aiohttp.ClientSession() as session:
-            async with session.get(member1.display_avatar.url) as resp:
-                avatar1 = Image.open(io.BytesIO(await resp.read())).convert("RGBA").resize((AV_SIZE, AV_SIZE))
-                avatar1 = make_circular(avatar1)
-            async with session.get(member2.display_avatar.url) as resp:
-                avatar2 = Image.open(io.BytesIO(await resp.read())).convert("RGBA").resize((AV_SIZE, AV_SIZE))
-                avatar2 = make_circular(avatar2)
-
-        # Paste avatars
-        base.paste(avatar1, (LEFT_X, TOP_Y), avatar1)
-        base.paste(avatar2, (RIGHT_X, TOP_Y), avatar2)
-
-        # ---------- FONT LOADING + BIG-TEXT FALLBACK ----------
-        # Candidate font names/paths (we try them in order)
-        REG_CANDIDATES  = [
-            "DejaVuSans.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
-            "arial.ttf",
-            "NotoSans-Regular.ttf"
-        ]
-        BOLD_CANDIDATES = [
-            "DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
-            "arialbd.ttf",
-            "NotoSans-Bold.ttf"
-        ]
-
-        def try_truetype(paths, size):
-            # Try each candidate path/name. Some environments let truetype accept just the filename.
-            for p in paths:
-                try:
-                    return ImageFont.truetype(p, size)
-                except Exception:
-                    continue
-            return None
-
-        def draw_text_big(img, xy, text, size, *, bold=False,
-                          fill=(255, 255, 255, 255), stroke_width=0,
-                          stroke_fill=(0, 0, 0, 255), anchor="mm"):
-            """Renders big text. Uses real TTF if found; otherwise draws bitmap text scaled up."""
-            font = try_truetype(BOLD_CANDIDATES if bold else REG_CANDIDATES, size)
-            d = ImageDraw.Draw(img)
-            if font:
-                d.text(xy, text, font=font, fill=fill,
-                       stroke_width=stroke_width, stroke_fill=stroke_fill, anchor=anchor)
-                return
 
-            # Fallback: scale up bitmap font (ImageFont.load_default())
-            base_font = ImageFont.load_default()
-            # estimate scale factor (default font ~11-12 px). Use integer scale
-            scale = max(2, int(size / 8))
-            # Render small then scale nearest-neighbor to preserve sharpness
-            # first get bbox for the small font
-            temp = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
-            td = ImageDraw.Draw(temp)
-            bbox = td.textbbox((0, 0), text, font=base_font)
-            w, h = bbox[2] - bbox[0] + 6, bbox[3] - bbox[1] + 6
-            temp = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-            td = ImageDraw.Draw(temp)
-            # draw stroke by drawing multiple offsets (cheap)
-            if stroke_width > 0:
-                for ox in range(-stroke_width, stroke_width + 1):
-                    for oy in range(-stroke_width, stroke_width + 1):
-                        if ox == 0 and oy == 0:
-                            continue
-                        td.text((3 + ox, 3 + oy), text, font=base_font, fill=stroke_fill)
-            td.text((3, 3), text, font=base_font, fill=fill)
-            # scale up
-            scaled = temp.resize((temp.width * scale, temp.height * scale), Image.NEAREST)
-            # compute top-left placement for anchor="mm"
-            x, y = xy
-            if anchor == "mm":
-                x = int(x - scaled.width / 2)
-                y = int(y - scaled.height / 2)
-            base.alpha_composite(scaled, (int(x), int(y)))
-
-        # ---------- VECTOR HEART (always renders, no emoji needed) ----------
-        def draw_vector_heart(canvas: Image.Image, center_xy, size_px,
-                              fill=(255, 0, 0, 255), outline=(0, 0, 0, 255), outline_thickness=10):
-            """Draw a heart composed of two circles + triangle; apply an outline via gaussian blur"""
-            cx, cy = center_xy
-            s = max(40, int(size_px))
-            # Create heart mask (L mode)
-            heart_mask = Image.new("L", (s, s), 0)
-            hd = ImageDraw.Draw(heart_mask)
-
-            # geometry values (simple proportions)
-            r = s // 4
-            top_y = s // 4
-            left_x = s // 2 - 2 * r
-            right_x = s // 2
-            # two circles
-            hd.ellipse([left_x, top_y - r, left_x + 2 * r, top_y + r], fill=255)
-            hd.ellipse([right_x, top_y - r, right_x + 2 * r, top_y + r], fill=255)
-            # triangle tip
-            tip_y = s - max(4, s // 10)
-            hd.polygon([(left_x, top_y + r // 2),
-                        (right_x + 2 * r, top_y + r // 2),
-                        (s // 2, tip_y)], fill=255)
-
-            # Outline mask created by blurring the mask then thresholding
-            # Normalize outline_thickness to reasonable blur radius
-            radius = max(2, int(outline_thickness / 2))
-            outline_mask = heart_mask.filter(ImageFilter.GaussianBlur(radius))
-            # Create RGBA layers and paste
-            ox = int(cx - s / 2)
-            oy = int(cy - s / 2)
-
-            # Paste outline (use outline_mask as alpha)
-            outline_layer = Image.new("RGBA", (s, s), outline)
-            canvas.paste(outline_layer, (ox, oy), outline_mask)
-            # Paste fill
-            fill_layer = Image.new("RGBA", (s, s), fill)
-            canvas.paste(fill_layer, (ox, oy), heart_mask)
-
-        # ---------- Draw everything (BIG sizes) ----------
-        # Title with heart emojis (bigger and centered at top)
-        with pilmoji.Pilmoji(base) as pilmoji_renderer:
-            pilmoji_renderer.text((CENTER_X - 250, 30), "♥️Love Match♥️", font_size=120, emoji_size_factor=1.0)
-
-        # Choose heart emoji based on percentage
-        if percentage > 70:
-            heart_emoji = "♥️"
-        elif percentage >= 20:
-            heart_emoji = "💛"
-        else:
-            heart_emoji = "💔"
-
-        # Use pilmoji to render the heart emoji (much bigger and perfectly centered)
-        with pilmoji.Pilmoji(base) as pilmoji_renderer:
-            # Calculate position for perfectly centered emoji in the middle of the image
-            emoji_x = CENTER_X - 120  # Adjust for much bigger emoji width
-            emoji_y = H // 2 - 60  # Center vertically in the middle of the image
-            pilmoji_renderer.text((emoji_x, emoji_y), heart_emoji, font_size=240, emoji_size_factor=1.0)
-
-        # Percentage below heart (BIGGER)
-        draw_text_big(base, (CENTER_X, H // 2 + 100), f"{percentage}%", 40, bold=True,
-                      fill=(255, 255, 255, 255), stroke_width=8, stroke_fill=(0, 0, 0, 220), anchor="mm")
-
-        # Usernames under pfps (closer to avatars)
-        draw_text_big(base, (LEFT_X + AV_SIZE//2, TOP_Y + AV_SIZE + 20), member1.display_name, 20, bold=True,
-                      fill=(255, 255, 255, 255), stroke_width=3, stroke_fill=(0, 0, 0, 200), anchor="mm")
-        draw_text_big(base, (RIGHT_X + AV_SIZE//2, TOP_Y + AV_SIZE + 20), member2.display_name, 20, bold=True,
-                      fill=(255, 255, 255, 255), stroke_width=3, stroke_fill=(0, 0, 0, 200), anchor="mm")
-
-        # Save to buffer
-        img_bytes = io.BytesIO()
-        base.save(img_bytes, format="PNG")
-        img_bytes.seek(0)
-        file = discord.File(img_bytes, filename="ship.png")
+        # Fetch avatars (cached, concurrent); drawing happens in a render worker
+        avatar1, avatar2 = await avatars.pair(member1, member2, AV_SIZE)
+        try:
+            data = await render.run(render_ship, avatar1, avatar2, percentage, bg_color,
+                                   member1.display_name, member2.display_name)
+        except (RenderBusy, asyncio.TimeoutError):
+            busy = "❌ Too many images are being made right now, try again in a moment."
+            if slash:
+                return await ctx_or_inter.response.send_message(busy, ephemeral=True)
+            return await ctx_or_inter.send(busy)
+        file = discord.File(io.BytesIO(data), filename=image_filename("ship"))
 
         # Embed (no image inside; image is attached above)
         embed = discord.Embed(
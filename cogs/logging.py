@@ -4,6 +4,11 @@ from discord.ext import commands
 from discord import app_commands, ui
 import os, json, difflib
 from datetime import datetime, timedelta, timezone  # fixed typo
+import logging
+
+from utils.store import store
+
+logger = logging.getLogger(__name__)
 
 Embed_Colors = {
     "red": discord.Color(0xFF0000),
@@ -20,30 +25,32 @@ Embed_Colors = {
 
 
 DATA_FILE = "/data/logs.json"
+TABLE = "log_config"  # keyed by guild id
 
 
 # ======================
 # Persistence
 # ======================
-def load_config():
+def _load_legacy():
     if os.path.exists(DATA_FILE):
         try:
             with open(DATA_FILE, "r") as f:
                 return json.load(f)
         except json.JSONDecodeError:
-            print("⚠️ log_config.json corrupted, resetting file...")
-            return {}
+            logger.warning("⚠️ log_config.json corrupted, starting empty...")
     return {}
 
 
+def load_config():
+    return store.load(TABLE, legacy=_load_legacy)
+
+
 def save_config(config):
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
     try:
-        with open(DATA_FILE, "w") as f:
-            json.dump(config, f, indent=2)
-        print(f"💾 Saved logging config ({len(config)} guilds).")
+        store.save(TABLE, config)
+        logger.debug("💾 Saving logging config (%d guilds).", len(config))
     except Exception as e:
-        print(f"❌ Failed to save logging config: {e}")
+        logger.error(f"❌ Failed to save logging config: {e}")
 
 
 # ======================
@@ -105,7 +112,7 @@ class LoggingCog(commands.Cog):
             if gid in self.config and category in self.config[gid]:
                 del self.config[gid][category]
                 save_config(self.config)
-                print(f"⚠️ Removed invalid log channel for {category} in guild {guild.id}")
+                logger.warning(f"⚠️ Removed invalid log channel for {category} in guild {guild.id}")
         except discord.HTTPException:
             # Something went wrong sending the message → ignore
             pass
@@ -279,7 +286,7 @@ class LoggingCog(commands.Cog):
 
         for guild in self.bot.guilds:
             self.tracked_members[guild.id] = {member.id for member in guild.members}
-        print("✅ Member tracking initialized.")
+        logger.info("✅ Member tracking initialized.")
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
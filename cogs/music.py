@@ -1,12 +1,25 @@
 import asyncio
+import heapq
+import json
+import os
 import re
 import random
-from typing import Optional, List, Dict, Literal
+import threading
+import time
+from typing import Optional, List, Dict, Literal, Tuple
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-import yt_dlp
+import logging
+
+from utils.shards import owns_guild
+from utils.startup import lazy_import
+from utils.store import store
+
+logger = logging.getLogger(__name__)
+
+yt_dlp = lazy_import("yt_dlp")
 
 DUA_EMOJI = "<:duration:1422345203821445251>"
 CHAN_EMOJI = "<:channel:1422345332481589268>"
@@ -31,10 +44,16 @@ YTDL_BASE = {
     # remove extractor_args entirely
 }
 
-# Main YDL (full extraction)
-_ytdl = yt_dlp.YoutubeDL(YTDL_BASE)
-# Flat extractor for fast playlist enumeration
-_flat_ytdl = yt_dlp.YoutubeDL({**YTDL_BASE, "extract_flat": "in_playlist"})
+# Main YDL (full extraction) and a flat extractor for fast playlist enumeration,
+# built on first use so importing the cog doesn't load yt-dlp
+_ytdls = {}
+
+def _get_ytdl(flat: bool = False):
+    ydl = _ytdls.get(flat)
+    if ydl is None:
+        opts = {**YTDL_BASE, "extract_flat": "in_playlist"} if flat else YTDL_BASE
+        ydl = _ytdls[flat] = yt_dlp.YoutubeDL(opts)
+    return ydl
 
 # FFMPEG flags (keep long songs stable)
 FFMPEG_OPTS = {
@@ -42,6 +61,55 @@ FFMPEG_OPTS = {
     "options": "-vn",
 }
 
+# "auto": Opus sources are stream-copied, everything else is encoded to Opus
+# inside ffmpeg. "pcm": legacy path (ffmpeg -> PCM -> Python-side Opus encode).
+PLAYBACK_MODE = os.getenv("MUSIC_PLAYBACK_MODE", "auto").lower()
+
+CODEC_PATHS = {
+    "copy": "Opus passthrough (stream copy)",
+    "libopus": "ffmpeg → Opus",
+    "probe": "ffmpeg → Opus (probed)",
+    "pcm": "ffmpeg → PCM → Opus",
+}
+
+def _ffmpeg_opts(offset: int = 0) -> dict:
+    """FFMPEG_OPTS with an input seek, used when resuming mid-track."""
+    if offset <= 0:
+        return FFMPEG_OPTS
+    return {**FFMPEG_OPTS, "before_options": f"-ss {offset} " + FFMPEG_OPTS["before_options"]}
+
+# ======================
+# Session persistence
+# ======================
+SESSIONS_FILE = "/data/music_sessions.json"
+TABLE = "music_sessions"  # keyed by guild id; each cluster writes only its own guilds
+SAVE_DEBOUNCE = 5  # seconds to coalesce state changes into one write
+SESSION_TTL = 6 * 3600  # drop snapshots older than this on startup
+
+# Gapless mode keeps one voice player running and swaps in a pre-spawned
+# ffmpeg source for the next track GAPLESS_PRELOAD seconds before the end.
+GAPLESS = os.getenv("MUSIC_GAPLESS", "0") == "1"
+GAPLESS_PRELOAD = 5
+
+IDLE_TIMEOUT = 120  # seconds with an empty queue before disconnecting
+ALONE_TIMEOUT = 30  # seconds with no non-bot listeners before disconnecting
+
+def _load_legacy():
+    if os.path.exists(SESSIONS_FILE):
+        try:
+            with open(SESSIONS_FILE, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("⚠️ music_sessions.json corrupted, starting empty...")
+    return {}
+
+def load_sessions() -> dict:
+    return store.load(TABLE, legacy=_load_legacy)
+
+def save_sessions(sessions: dict, owned=None):
+    """Queue a write of ``sessions``; with ``owned``, other clusters' guilds are left alone (see Store.sync)."""
+    store.save(TABLE, sessions, owned=owned)
+
 # =========
 # Track DTO
 # =========
@@ -72,16 +140,37 @@ class Track:
         h, m = divmod(m, 60)
         return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
 
+    def to_dict(self) -> dict:
+        # Compact snapshot: stream URLs expire, so only the page URL is kept.
+        return {
+            "u": self.webpage_url,
+            "t": self.title,
+            "d": self.duration,
+            "r": getattr(self.requester, "mention", str(self.requester)),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Track":
+        return cls(
+            title=data.get("t") or "Unknown Title",
+            webpage_url=data["u"],
+            duration=data.get("d"),
+            thumbnail=None,
+            requester=data.get("r") or "Unknown",
+        )
+
 # ======================
 # yt-dlp helper routines
 # ======================
 async def _extract(query: str, *, flat: bool = False):
     # Offload to thread for snappier event loop
-    ydl = _flat_ytdl if flat else _ytdl
-    return await asyncio.to_thread(lambda: ydl.extract_info(query, download=False))
+    return await asyncio.to_thread(lambda: _get_ytdl(flat).extract_info(query, download=False))
+
+async def _fresh_stream(webpage_url: str, *, max_tries: int = 2) -> Optional[tuple[str, Optional[str]]]:
+    """Re-extract the stream URL right before playback to avoid expiry/cutoffs.
 
-async def _fresh_stream_url(webpage_url: str, *, max_tries: int = 2) -> Optional[str]:
-    """Re-extract the stream URL right before playback to avoid expiry/cutoffs."""
+    Returns ``(url, acodec)``; ``acodec`` is None when yt-dlp didn't report it.
+    """
     last_error = None
     for _ in range(max_tries):
         try:
@@ -92,16 +181,96 @@ async def _fresh_stream_url(webpage_url: str, *, max_tries: int = 2) -> Optional
                 info = info["entries"][0]
             url = info.get("url")
             if url:
-                return url
+                return url, info.get("acodec")
             # Fallback: pick first audio-capable format
             for fmt in (info.get("formats") or []):
                 if fmt.get("acodec") not in (None, "none") and fmt.get("url"):
-                    return fmt["url"]
+                    return fmt["url"], fmt.get("acodec")
         except Exception as e:
             last_error = e
             await asyncio.sleep(0.3)
     return None
 
+async def _make_source(stream_url: str, acodec: Optional[str], offset: int = 0) -> tuple[discord.AudioSource, str]:
+    """Build the cheapest audio source for a stream; returns (source, codec path key).
+
+    FFmpegOpusAudio hands Opus packets straight to the voice client, skipping
+    the per-frame Python-side encode that FFmpegPCMAudio needs.
+    """
+    opts = _ffmpeg_opts(offset)
+    if PLAYBACK_MODE != "pcm":
+        try:
+            if acodec and acodec.startswith("opus"):
+                return discord.FFmpegOpusAudio(stream_url, codec="opus", **opts), "copy"
+            if acodec and acodec != "none":
+                return discord.FFmpegOpusAudio(stream_url, **opts), "libopus"
+            source = await discord.FFmpegOpusAudio.from_probe(stream_url, method="fallback", **opts)
+            return source, "probe"
+        except Exception as e:
+            logger.warning(f"⚠️ Opus source failed, falling back to PCM: {e}")
+    return discord.FFmpegPCMAudio(stream_url, **opts), "pcm"
+
+# ================
+# Gapless playback
+# ================
+class GaplessSource(discord.AudioSource):
+    """Wraps the playing source and switches to a pre-spawned one at EOF.
+
+    The voice player keeps running across the switch, so there is no ffmpeg
+    startup or reconnect between tracks. ``read`` runs in the player thread.
+    """
+
+    def __init__(self, source: discord.AudioSource, track: Track, codec_path: str, on_switch):
+        self.source = source
+        self.track = track
+        self.codec_path = codec_path
+        self.on_switch = on_switch
+        self.finished = False
+        self._pending: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def queue_next(self, source: discord.AudioSource, track: Track, codec_path: str, *, requeue: bool):
+        with self._lock:
+            self._pending = (source, track, codec_path, requeue)
+
+    @property
+    def pending_track(self) -> Optional[Track]:
+        """The pre-spawned track if it was taken off the queue, else None."""
+        pending = self._pending
+        return pending[1] if pending and pending[3] else None
+
+    def discard_pending(self) -> Optional[Track]:
+        """Drop the pre-spawned source; returns its track if it was taken off the queue."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if not pending:
+            return None
+        pending[0].cleanup()
+        return pending[1] if pending[3] else None
+
+    def read(self) -> bytes:
+        data = self.source.read()
+        if data:
+            return data
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if not pending:
+            return b""
+        previous, played = self.source, self.track
+        self.source, self.track, self.codec_path, _ = pending
+        previous.cleanup()
+        self.on_switch(self, played)
+        return self.source.read()
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self):
+        # The pending source is left to _after_track so its track can be requeued.
+        self.finished = True
+        self.source.cleanup()
+
+
 # ==============
 # URL detection
 # ==============
@@ -225,15 +394,178 @@ class Music(commands.Cog):
         self.shuffle_enabled: Dict[int, bool] = {}
         self.loop_mode: Dict[int, LoopMode] = {}
         self.locks: Dict[int, asyncio.Lock] = {}
-        self.idle_tasks: Dict[int, asyncio.Task] = {}
+        # (guild_id, reason) -> (deadline, text channel); "idle" and "alone"
+        # run independently. The heap may hold stale entries, which the
+        # supervisor skips when they no longer match.
+        self.idle_deadlines: Dict[Tuple[int, str], tuple] = {}
+        self._idle_heap: List[tuple] = []
+        self._idle_wakeup = asyncio.Event()
+        self._supervisor: Optional[asyncio.Task] = None
+        # Playback clock, used to resume at the right offset after a restart
+        self.started_at: Dict[int, float] = {}
+        self.paused_at: Dict[int, float] = {}
+        self.text_channels: Dict[int, int] = {}
+        self.codec_paths: Dict[int, str] = {}
+        self.players: Dict[int, GaplessSource] = {}
+        self.prefetch_tasks: Dict[int, asyncio.Task] = {}
+        # guild_id -> snapshot still waiting for listeners in its voice channel
+        self.pending_resume: Dict[int, dict] = {}
+        self._save_task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._handed_off = False
 
     # ------------- lifecycle -------------
     async def cog_load(self):
+        now = time.time()
+        for gid, data in load_sessions().items():
+            # Expired sessions and those we never resume drop out of the next save
+            if self._owns(gid) and now - data.get("saved_at", 0) <= SESSION_TTL:
+                self.pending_resume[int(gid)] = data
+        self.checkpoint.start()
+        self._supervisor = self.bot.loop.create_task(self._idle_supervisor())
         try:
             await self.bot.tree.sync()
         except Exception:
             pass
 
+    async def cog_unload(self):
+        # Runs before voice clients are torn down on bot.close(), so the
+        # snapshot still reflects live sessions.
+        self.checkpoint.cancel()
+        if self._supervisor:
+            self._supervisor.cancel()
+        if self._save_task:
+            self._save_task.cancel()
+        if not self._handed_off:
+            save_sessions(self._snapshot(), self._owns)
+        self._closing = True
+
+    async def flush_state(self):
+        # Graceful shutdown (utils/lifecycle.py): write the debounced save now
+        if self._save_task:
+            self._save_task.cancel()
+        save_sessions(self._snapshot(), self._owns)
+        await store.flush()
+
+    # ------------- hot reload -------------
+    # utils/startup.py: reload_extension. Live sessions keep playing: the new
+    # instance takes over the same queues, players and timers, and tracks
+    # started by the old one report back to whichever instance is loaded.
+    HANDOFF = (
+        "queues", "currents", "shuffle_enabled", "loop_mode", "locks", "idle_deadlines", "_idle_heap",
+        "started_at", "paused_at", "text_channels", "codec_paths", "players", "prefetch_tasks",
+        "pending_resume",
+    )
+
+    def export_state(self) -> dict:
+        self._handed_off = True
+        return {name: getattr(self, name) for name in self.HANDOFF}
+
+    def import_state(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._idle_wakeup.set()  # the new supervisor picks up the deadlines
+        self._mark_dirty()
+
+    def _live(self) -> "Music":
+        return self.bot.get_cog(self.qualified_name) or self
+
+    # ------------- persistence -------------
+    def _elapsed(self, guild_id: int) -> int:
+        started = self.started_at.get(guild_id)
+        if started is None:
+            return 0
+        return int(self.paused_at.get(guild_id, time.monotonic()) - started)
+
+    def _mark_started(self, guild_id: int, offset: int = 0):
+        self.started_at[guild_id] = time.monotonic() - offset
+        self.paused_at.pop(guild_id, None)
+
+    def _mark_paused(self, guild_id: int):
+        self.paused_at.setdefault(guild_id, time.monotonic())
+        self._mark_dirty()
+
+    def _mark_resumed(self, guild_id: int):
+        paused = self.paused_at.pop(guild_id, None)
+        if paused is not None and guild_id in self.started_at:
+            self.started_at[guild_id] += time.monotonic() - paused
+        self._mark_dirty()
+
+    def _owns(self, guild_id) -> bool:
+        return owns_guild(self.bot, int(guild_id))
+
+    def _snapshot(self) -> dict:
+        now = time.time()
+        sessions = {str(gid): data for gid, data in self.pending_resume.items()}
+        for gid, vc in ((g.id, g.voice_client) for g in self.bot.guilds):
+            current = self.currents.get(gid)
+            queue = self.queues.get(gid) or []
+            player = self.players.get(gid)
+            if player and player.pending_track:
+                queue = [player.pending_track, *queue]
+            if not vc or not vc.channel or not (current or queue) or gid not in self.text_channels:
+                continue
+            sessions[str(gid)] = {
+                "voice": vc.channel.id,
+                "text": self.text_channels[gid],
+                "loop": self._get_loop(gid),
+                "shuffle": self._is_shuffle(gid),
+                "current": current.to_dict() if current else None,
+                "position": self._elapsed(gid) if current else 0,
+                "queue": [t.to_dict() for t in queue],
+                "saved_at": now,
+            }
+        return sessions
+
+    def _mark_dirty(self):
+        """Schedule a debounced write of all sessions."""
+        if self._closing or (self._save_task and not self._save_task.done()):
+            return
+
+        async def _flush():
+            await asyncio.sleep(SAVE_DEBOUNCE)
+            save_sessions(self._snapshot(), self._owns)
+
+        self._save_task = self.bot.loop.create_task(_flush())
+
+    @tasks.loop(seconds=30)
+    async def checkpoint(self):
+        # Keep recorded offsets fresh for guilds that are actively playing.
+        if any(self.currents.values()):
+            self._mark_dirty()
+
+    @staticmethod
+    def _has_listeners(channel) -> bool:
+        return any(not m.bot for m in channel.members)
+
+    async def _try_resume(self, guild_id: int):
+        data = self.pending_resume.get(guild_id)
+        guild = self.bot.get_guild(guild_id)
+        if not data or not guild:
+            return
+        voice = guild.get_channel(data.get("voice"))
+        text = guild.get_channel(data.get("text"))
+        if not isinstance(voice, (discord.VoiceChannel, discord.StageChannel)) or text is None:
+            self.pending_resume.pop(guild_id, None)
+            self._mark_dirty()
+            return
+        if not self._has_listeners(voice) or guild.voice_client:
+            return  # stay pending until someone is listening
+        self.pending_resume.pop(guild_id, None)
+
+        self.queues[guild_id] = [Track.from_dict(t) for t in data.get("queue") or []]
+        self.loop_mode[guild_id] = data.get("loop", "off")
+        self.shuffle_enabled[guild_id] = bool(data.get("shuffle"))
+        self.text_channels[guild_id] = text.id
+        current = Track.from_dict(data["current"]) if data.get("current") else None
+        try:
+            await self._ensure_voice(guild, voice)
+        except Exception as e:
+            logger.error(f"❌ Failed to resume music in guild {guild_id}: {e}")
+            self._reset_state(guild_id)
+            return
+        await self._start_if_idle(guild, text, track=current, offset=int(data.get("position") or 0))
+
     # ------------- state helpers -------------
     def _queue(self, guild_id: int) -> List[Track]:
         return self.queues.setdefault(guild_id, [])
@@ -246,6 +578,7 @@ class Music(commands.Cog):
 
     def _set_loop(self, guild_id: int, mode: LoopMode):
         self.loop_mode[guild_id] = mode
+        self._mark_dirty()
 
     def _is_shuffle(self, guild_id: int) -> bool:
         return self.shuffle_enabled.get(guild_id, False)
@@ -255,9 +588,18 @@ class Music(commands.Cog):
         self.currents[guild_id] = None
         self.shuffle_enabled[guild_id] = False
         self.loop_mode[guild_id] = "off"
-        task = self.idle_tasks.pop(guild_id, None)
+        self.started_at.pop(guild_id, None)
+        self.paused_at.pop(guild_id, None)
+        self.text_channels.pop(guild_id, None)
+        self.codec_paths.pop(guild_id, None)
+        task = self.prefetch_tasks.pop(guild_id, None)
         if task:
             task.cancel()
+        player = self.players.pop(guild_id, None)
+        if player:
+            player.discard_pending()
+        self._cancel_idle_disconnect(guild_id)
+        self._mark_dirty()
         # Lock objects will be recreated lazily.
 
     def _dequeue_next(self, guild_id: int) -> Optional[Track]:
@@ -277,25 +619,76 @@ class Music(commands.Cog):
             await voice_channel.connect()
 
     # ------------- idle cleanup -------------
-    def _schedule_idle_disconnect(self, guild: discord.Guild, channel: discord.abc.Messageable, seconds: int = 120):
-        async def _idle_task():
+    def _schedule_idle_disconnect(
+        self,
+        guild: discord.Guild,
+        channel: Optional[discord.abc.Messageable],
+        seconds: int = IDLE_TIMEOUT,
+        reason: Literal["idle", "alone"] = "idle",
+    ):
+        deadline = time.monotonic() + seconds
+        self.idle_deadlines[(guild.id, reason)] = (deadline, channel)
+        heapq.heappush(self._idle_heap, (deadline, guild.id, reason))
+        self._idle_wakeup.set()
+
+    def _cancel_idle_disconnect(self, guild_id: int, reason: Optional[str] = None):
+        for r in (reason,) if reason else ("idle", "alone"):
+            self.idle_deadlines.pop((guild_id, r), None)
+
+    async def _idle_supervisor(self):
+        """Single task that disconnects guilds whose idle deadline has passed."""
+        while True:
+            now = time.monotonic()
+            expired = []
+            while self._idle_heap and self._idle_heap[0][0] <= now:
+                deadline, guild_id, reason = heapq.heappop(self._idle_heap)
+                entry = self.idle_deadlines.get((guild_id, reason))
+                if entry and entry[0] == deadline:
+                    del self.idle_deadlines[(guild_id, reason)]
+                    expired.append(self._idle_expired(guild_id, entry[1], reason))
+            if expired:
+                await asyncio.gather(*expired, return_exceptions=True)
+
+            self._idle_wakeup.clear()
+            timeout = self._idle_heap[0][0] - time.monotonic() if self._idle_heap else None
             try:
-                await asyncio.sleep(seconds)
-                vc = guild.voice_client
-                if vc and not vc.is_playing() and not vc.is_paused() and not self._queue(guild.id):
-                    await channel.send("👋 Idle for a while — disconnecting and resetting.")
-                    await vc.disconnect()
-                    self._reset_state(guild.id)
-            except asyncio.CancelledError:
+                await asyncio.wait_for(self._idle_wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
                 pass
 
-        old = self.idle_tasks.get(guild.id)
-        if old:
-            old.cancel()
-        self.idle_tasks[guild.id] = self.bot.loop.create_task(_idle_task())
+    async def _idle_expired(self, guild_id: int, channel: Optional[discord.abc.Messageable], reason: str):
+        guild = self.bot.get_guild(guild_id)
+        vc = guild.voice_client if guild else None
+        if not vc:
+            return
+        if reason == "alone":
+            if vc.channel and self._has_listeners(vc.channel):
+                return
+            notice = "👋 Everyone left the voice channel — disconnecting and resetting."
+        else:
+            if vc.is_playing() or vc.is_paused() or self._queue(guild_id):
+                return
+            notice = "👋 Idle for a while — disconnecting and resetting."
+        if channel is not None:
+            try:
+                await channel.send(notice)
+            except discord.HTTPException:
+                pass
+        await vc.disconnect()
+        self._reset_state(guild_id)
+
+    def _check_listeners(self, guild: discord.Guild):
+        vc = guild.voice_client
+        if not vc or not vc.channel:
+            return
+        if self._has_listeners(vc.channel):
+            self._cancel_idle_disconnect(guild.id, "alone")
+        elif (guild.id, "alone") not in self.idle_deadlines:
+            channel = guild.get_channel(self.text_channels.get(guild.id, 0))
+            self._schedule_idle_disconnect(guild, channel, ALONE_TIMEOUT, reason="alone")
 
     # ------------- embeds -------------
-    async def _announce_now(self, channel: discord.abc.Messageable, track: Track):
+    async def _announce_now(self, channel: discord.abc.Messageable, track: Track, codec_path: Optional[str] = None):
         dur = track.pretty_duration()
         bar = _progress_bar(0, track.duration)
         embed = discord.Embed(
@@ -312,6 +705,8 @@ class Music(commands.Cog):
             value=getattr(track.requester, "mention", str(track.requester)),
             inline=True,
         )
+        if codec_path:
+            embed.add_field(name="Codec path", value=CODEC_PATHS.get(codec_path, codec_path), inline=True)
         await channel.send(embed=embed)
 
     async def _announce_added(self, channel: discord.abc.Messageable, track: Track, pos: int):
@@ -328,36 +723,65 @@ class Music(commands.Cog):
         await channel.send(embed=embed)
 
     # ------------- playback core -------------
-    async def _start_if_idle(self, guild: discord.Guild, channel: discord.abc.Messageable):
+    async def _start_if_idle(
+        self,
+        guild: discord.Guild,
+        channel: discord.abc.Messageable,
+        *,
+        track: Optional[Track] = None,
+        offset: int = 0,
+    ):
         async with self._lock(guild.id):
             vc = guild.voice_client
             if not vc or vc.is_playing() or vc.is_paused():
                 return
 
-            next_track = self._dequeue_next(guild.id)
-            if not next_track:
-                self.currents[guild.id] = None
-                self._schedule_idle_disconnect(guild, channel)
-                return
+            while True:
+                next_track = track or self._dequeue_next(guild.id)
+                if not next_track:
+                    self.currents[guild.id] = None
+                    self._schedule_idle_disconnect(guild, channel)
+                    return
 
-            self.currents[guild.id] = next_track
+                self.currents[guild.id] = next_track
+                self.text_channels[guild.id] = channel.id
 
-            stream_url = await _fresh_stream_url(next_track.webpage_url)
-            if not stream_url:
+                stream = await _fresh_stream(next_track.webpage_url)
+                if stream:
+                    break
                 await channel.send(f"⚠️ Could not fetch stream for **{next_track.title}** — skipping.")
                 self.currents[guild.id] = None
-                return await self._start_if_idle(guild, channel)
+                track, offset = None, 0
+
+            source, codec_path = await _make_source(*stream, offset)
+            if GAPLESS:
+                source = GaplessSource(source, next_track, codec_path, self._gapless_switch_callback(guild, channel))
 
             def _after(err: Optional[Exception]):
-                fut = self.bot.loop.create_task(self._after_track(guild, channel, next_track, err))
+                # Called from the voice player thread, not the event loop.
+                played = source.track if isinstance(source, GaplessSource) else next_track
+                fut = asyncio.run_coroutine_threadsafe(self._live()._after_track(guild, channel, played, err), self.bot.loop)
                 fut.add_done_callback(lambda f: f.exception())
 
-            vc.play(discord.FFmpegPCMAudio(stream_url, **FFMPEG_OPTS), after=_after)
+            self.codec_paths[guild.id] = codec_path
+            vc.play(source, after=_after)
+            self._mark_started(guild.id, offset)
+            self._mark_dirty()
+            if isinstance(source, GaplessSource):
+                self._schedule_prefetch(guild, source)
             await self._announce_now(channel, next_track)
 
     async def _after_track(self, guild: discord.Guild, channel: discord.abc.Messageable, played: Optional[Track], err):
         if err:
             await channel.send(f"⚠️ Playback error: {err}")
+        task = self.prefetch_tasks.pop(guild.id, None)
+        if task:
+            task.cancel()
+        # Stopped (e.g. skipped) with the next track already pre-spawned: put it back.
+        player = self.players.pop(guild.id, None)
+        pending = player.discard_pending() if player else None
+        if pending:
+            self._queue(guild.id).insert(0, pending)
         mode = self._get_loop(guild.id)
         if played:
             if mode == "one":
@@ -365,8 +789,76 @@ class Music(commands.Cog):
             elif mode == "all":
                 self._queue(guild.id).append(played)
         self.currents[guild.id] = None
+        self.started_at.pop(guild.id, None)
+        self._mark_dirty()
         await self._start_if_idle(guild, channel)
 
+    # ------------- gapless -------------
+    def _schedule_prefetch(self, guild: discord.Guild, player: "GaplessSource"):
+        old = self.prefetch_tasks.pop(guild.id, None)
+        if old:
+            old.cancel()
+        self.players[guild.id] = player
+        if player.track.duration:
+            self.prefetch_tasks[guild.id] = self.bot.loop.create_task(self._prefetch_when_due(guild, player, player.track))
+
+    async def _prefetch_when_due(self, guild: discord.Guild, player: "GaplessSource", track: Track):
+        # _elapsed() freezes while paused, so a paused track keeps pushing this back.
+        while (remaining := track.duration - self._elapsed(guild.id) - GAPLESS_PRELOAD) > 0:
+            await asyncio.sleep(remaining)
+        if player.track is not track:
+            return
+        async with self._lock(guild.id):
+            if self.players.get(guild.id) is not player or player.finished:
+                return
+            # A stop replaces the queue list, so requeueing into this one is a no-op then
+            queue = self._queue(guild.id)
+            if self._get_loop(guild.id) == "one":
+                nxt, requeue = track, False
+            else:
+                nxt, requeue = self._dequeue_next(guild.id), True
+            if not nxt:
+                return
+            source = codec_path = None
+            try:
+                stream = await _fresh_stream(nxt.webpage_url)
+                if stream and not player.finished:
+                    source, codec_path = await _make_source(*stream)
+            except asyncio.CancelledError:
+                # Skipped/stopped while resolving: the track goes back, the process goes away
+                if source is not None:
+                    source.cleanup()
+                if requeue:
+                    queue.insert(0, nxt)
+                raise
+            # The voice player encodes (or not) per is_opus(), fixed at play();
+            # a source of the other kind goes through the normal after path.
+            if source is None or player.finished or source.is_opus() != player.is_opus():
+                if source is not None:
+                    source.cleanup()
+                if requeue:
+                    queue.insert(0, nxt)
+                return
+            player.queue_next(source, nxt, codec_path, requeue=requeue)
+            self._mark_dirty()
+
+    def _gapless_switch_callback(self, guild: discord.Guild, channel: discord.abc.Messageable):
+        def _on_switch(player: "GaplessSource", played: Track):
+            # Called from the voice player thread at the exact frame boundary.
+            fut = asyncio.run_coroutine_threadsafe(self._live()._on_gapless_switch(guild, channel, player, played), self.bot.loop)
+            fut.add_done_callback(lambda f: f.exception())
+        return _on_switch
+
+    async def _on_gapless_switch(self, guild: discord.Guild, channel: discord.abc.Messageable, player: "GaplessSource", played: Track):
+        if self._get_loop(guild.id) == "all":
+            self._queue(guild.id).append(played)
+        self.currents[guild.id] = player.track
+        self.codec_paths[guild.id] = player.codec_path
+        self._mark_started(guild.id)
+        self._mark_dirty()
+        self._schedule_prefetch(guild, player)
+        await self._announce_now(channel, player.track)
+
     # ------------- play/queue logic -------------
     async def _handle_play(self, guild: discord.Guild, text_channel: discord.abc.Messageable, requester, query: str):
         try_single_search = not _looks_like_url(query)
@@ -410,6 +902,7 @@ class Music(commands.Cog):
         q = self._queue(guild.id)
         start_len = len(q)
         q.extend(tracks_to_add)
+        self._mark_dirty()
 
         if len(tracks_to_add) == 1:
             await self._announce_added(text_channel, tracks_to_add[0], start_len + 1)
@@ -448,6 +941,7 @@ class Music(commands.Cog):
         vc = ctx.guild.voice_client
         if vc and vc.is_playing():
             vc.pause()
+            self._mark_paused(ctx.guild.id)
             await ctx.send("⏸️ Paused.")
         else:
             await ctx.send("❌ Nothing is playing.")
@@ -457,6 +951,7 @@ class Music(commands.Cog):
         vc = ctx.guild.voice_client
         if vc and vc.is_paused():
             vc.resume()
+            self._mark_resumed(ctx.guild.id)
             await ctx.send("▶️ Resumed.")
         else:
             await ctx.send("❌ Nothing is paused.")
@@ -466,7 +961,7 @@ class Music(commands.Cog):
         track = self.currents.get(ctx.guild.id)
         vc = ctx.guild.voice_client
         if vc and track and (vc.is_playing() or vc.is_paused()):
-            await self._announce_now(ctx.channel, track)
+            await self._announce_now(ctx.channel, track, self.codec_paths.get(ctx.guild.id))
         else:
             await ctx.send("❌ Nothing is playing.")
 
@@ -486,6 +981,7 @@ class Music(commands.Cog):
     async def shuffle_prefix(self, ctx: commands.Context):
         state = not self._is_shuffle(ctx.guild.id)
         self.shuffle_enabled[ctx.guild.id] = state
+        self._mark_dirty()
         await ctx.send("🔀 Shuffle enabled." if state else "➡️ Shuffle disabled.")
 
     @commands.command(name="loop", help="Set loop mode: off | one | all")
@@ -534,6 +1030,7 @@ class Music(commands.Cog):
         vc = interaction.guild.voice_client
         if vc and vc.is_playing():
             vc.pause()
+            self._mark_paused(interaction.guild.id)
             await interaction.response.send_message("⏸️ Paused.")
         else:
             await interaction.response.send_message("❌ Nothing is playing.", ephemeral=True)
@@ -543,6 +1040,7 @@ class Music(commands.Cog):
         vc = interaction.guild.voice_client
         if vc and vc.is_paused():
             vc.resume()
+            self._mark_resumed(interaction.guild.id)
             await interaction.response.send_message("▶️ Resumed.")
         else:
             await interaction.response.send_message("❌ Nothing is paused.", ephemeral=True)
@@ -552,7 +1050,7 @@ class Music(commands.Cog):
         track = self.currents.get(interaction.guild.id)
         vc = interaction.guild.voice_client
         if vc and track and (vc.is_playing() or vc.is_paused()):
-            await self._announce_now(interaction.channel, track)
+            await self._announce_now(interaction.channel, track, self.codec_paths.get(interaction.guild.id))
             await interaction.response.send_message("📻 Posted now playing.", ephemeral=True)
         else:
             await interaction.response.send_message("❌ Nothing is playing.", ephemeral=True)
@@ -583,13 +1081,46 @@ class Music(commands.Cog):
     async def shuffle_slash(self, interaction: discord.Interaction):
         state = not self._is_shuffle(interaction.guild.id)
         self.shuffle_enabled[interaction.guild.id] = state
+        self._mark_dirty()
         await interaction.response.send_message("🔀 Shuffle enabled." if state else "➡️ Shuffle disabled.")
 
     
 
     # ------------- listeners -------------
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Resume only where someone is still listening; the rest stay pending
+        # until a listener joins (see on_voice_state_update).
+        for guild_id in list(self.pending_resume):
+            await self._try_resume(guild_id)
+
+    @commands.Cog.listener()
+    async def on_shard_ready(self, shard_id: int):
+        # With AutoShardedBot, resume a shard's guilds as soon as that shard is up
+        # instead of waiting for every shard (on_ready).
+        for guild_id in list(self.pending_resume):
+            guild = self.bot.get_guild(guild_id)
+            if guild and guild.shard_id == shard_id:
+                await self._try_resume(guild_id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        # Drop every per-guild entry, including the lock, so nothing outlives the guild
+        self._reset_state(guild.id)
+        for state in (self.queues, self.currents, self.shuffle_enabled, self.loop_mode, self.locks, self.pending_resume):
+            state.pop(guild.id, None)
+        self._mark_dirty()
+
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+        if not member.bot:
+            if before.channel == after.channel:
+                return  # mute/deafen changes
+            pending = self.pending_resume.get(member.guild.id)
+            if pending and after.channel and pending.get("voice") == after.channel.id:
+                await self._try_resume(member.guild.id)
+            self._check_listeners(member.guild)
+            return
         # If the bot itself left a channel, reset
         if member.id != getattr(self.bot.user, "id", None):
             return
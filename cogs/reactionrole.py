@@ -2,19 +2,18 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import json
-import os
+import logging
 
-# ---------------- File Path (persistent on Railway) ----------------
-REACTION_ROLE_FILE = "/data/reaction_roles.json"
+from utils.cache import get_member
+from utils.store import store
 
-# ---------------- JSON Helpers ----------------
-def load_reaction_roles():
-    """Load reaction roles from JSON, or create the file if missing/broken."""
-    if not os.path.exists(REACTION_ROLE_FILE):
-        with open(REACTION_ROLE_FILE, "w") as f:
-            json.dump({}, f, indent=4)
-        return {}
+logger = logging.getLogger(__name__)
+
+# ---------------- Persistence (shared store, keyed by guild id) ----------------
+REACTION_ROLE_FILE = "/data/reaction_roles.json"
+TABLE = "reaction_roles"
 
+def _load_legacy():
     try:
         with open(REACTION_ROLE_FILE, "r") as f:
             return json.load(f)
@@ -22,10 +21,14 @@ def load_reaction_roles():
         return {}
 
 
+def load_reaction_roles():
+    """Load reaction roles, importing the old JSON file on first run."""
+    return store.load(TABLE, legacy=_load_legacy)
+
+
 def save_reaction_roles(data: dict):
-    """Save reaction roles safely to JSON."""
-    with open(REACTION_ROLE_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    """Write back the guilds whose reaction roles changed."""
+    store.save(TABLE, data)
 
 
 
@@ -196,12 +199,12 @@ class ReactionRole(commands.Cog):
             return
 
         role = guild.get_role(role_id)
-        member = guild.get_member(payload.user_id)
+        member = payload.member or await get_member(guild, payload.user_id)
         if role and member and not member.bot:
             try:
                 await member.add_roles(role, reason="Reaction role")
             except discord.Forbidden:
-                print(f"[WARN] Missing permissions to give {role} in {guild.name}")
+                logger.warning(f"Missing permissions to give {role} in {guild.name}")
 
     # ---------------- Event: Remove Role ----------------
     @commands.Cog.listener()
@@ -221,12 +224,12 @@ class ReactionRole(commands.Cog):
             return
 
         role = guild.get_role(role_id)
-        member = guild.get_member(payload.user_id)
+        member = payload.member or await get_member(guild, payload.user_id)
         if role and member and not member.bot:
             try:
                 await member.remove_roles(role, reason="Reaction role removed")
             except discord.Forbidden:
-                print(f"[WARN] Missing permissions to remove {role} in {guild.name}")
+                logger.warning(f"Missing permissions to remove {role} in {guild.name}")
 
 
 # ---------------- Cog Setup ----------------
@@ -9,29 +9,54 @@ import re
 from datetime import datetime
 import uuid
 from typing import Optional
+import logging
+
+from utils.shards import handles_dms
+from utils.store import store
+
+logger = logging.getLogger(__name__)
 
 DATA_FILE = "/data/reminders.json"
+TABLE = "reminders"  # keyed by reminder id
 
 
-def load_reminders():
+def _load_legacy():
     if os.path.exists(DATA_FILE):
         try:
             with open(DATA_FILE, "r") as f:
-                return json.load(f)
+                return {r["id"]: r for r in json.load(f)}
         except json.JSONDecodeError:
-            print("⚠️ reminders.json corrupted, resetting file...")
-            return []
-    return []
+            logger.warning("⚠️ reminders.json corrupted, starting empty...")
+    return {}
+
+
+def load_reminders():
+    return list(store.load(TABLE, legacy=_load_legacy).values())
 
 
 def save_reminders(reminders):
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
     try:
-        with open(DATA_FILE, "w") as f:
-            json.dump(reminders, f, indent=2)
-        print(f"💾 Saved {len(reminders)} reminders to {DATA_FILE}")
+        store.save(TABLE, {r["id"]: r for r in reminders})
+        logger.debug("💾 Saving %d reminders", len(reminders))
     except Exception as e:
-        print(f"❌ Failed to save reminders: {e}")
+        logger.error(f"❌ Failed to save reminders: {e}")
+
+
+def pull_reminders(reminders):
+    """
+    Merge reminders other clusters created, changed or deleted into the
+    list in place. Changed reminders are updated in place, since running
+    loops and open views hold them. Returns the ids of changed or removed
+    reminders.
+    """
+    by_id = {r["id"]: r for r in reminders}
+    fresh = dict(by_id)
+    changed, removed = store.pull(TABLE, fresh)
+    for rid in changed & by_id.keys():
+        by_id[rid].clear()
+        by_id[rid].update(fresh[rid])
+    reminders[:] = [by_id.get(rid, r) for rid, r in fresh.items()]
+    return changed | removed
 
 
 # ======================
@@ -73,11 +98,30 @@ class ReminderCog(commands.Cog):
         self.reminders = load_reminders()  # list of reminder dicts
         # active_loops: user_id -> { reminder_id: asyncio.Task }
         self.active_loops: dict[int, dict[str, asyncio.Task]] = {}
+        self._handed_off = False
         self.check_reminders.start()
-        print("🟢 ReminderCog started")
+        logger.info("🟢 ReminderCog started")
+
+    # Hot reload (utils/startup.py: reload_extension): the running loops, and
+    # the reminder dicts they hold, carry over instead of re-sending DMs
+    def export_state(self) -> dict:
+        self._handed_off = True
+        return {"reminders": self.reminders, "active_loops": self.active_loops}
+
+    def import_state(self, state: dict):
+        self.reminders = state["reminders"]
+        self.active_loops = state["active_loops"]
+
+    async def flush_state(self):
+        # Graceful shutdown (utils/lifecycle.py): persist active flags changed by the loops
+        save_reminders(self.reminders)
+        await store.flush()
 
     def cog_unload(self):
         self.check_reminders.cancel()
+        if self._handed_off:
+            logger.info("🔴 ReminderCog unloaded (reminder loops handed over)")
+            return
         # cancel any running tasks
         for user_tasks in list(self.active_loops.values()):
             for t in list(user_tasks.values()):
@@ -86,10 +130,13 @@ class ReminderCog(commands.Cog):
                 except Exception:
                     pass
         self.active_loops.clear()
-        print("🔴 ReminderCog unloaded")
+        logger.info("🔴 ReminderCog unloaded")
 
     @commands.Cog.listener()
     async def on_ready(self):
+        # Reminder DMs (and "Remind" replies) belong to the cluster running shard 0
+        if not handles_dms(self.bot):
+            return
         # Restart active reminders after bot restarts (only those due)
         now = datetime.utcnow().timestamp()
         for reminder in self.reminders:
@@ -105,11 +152,26 @@ class ReminderCog(commands.Cog):
     # ======================
     @tasks.loop(seconds=10)
     async def check_reminders(self):
+        updated = pull_reminders(self.reminders)
+        if not handles_dms(self.bot):
+            return
+        # Stop loops for reminders cancelled or deleted from another cluster
+        for rid in updated:
+            reminder = next((r for r in self.reminders if r["id"] == rid), None)
+            if reminder is None or not reminder.get("active", True):
+                self._cancel_loop(rid)
+
         now = datetime.utcnow().timestamp()
         to_run = [r for r in self.reminders if r["time"] <= now and r.get("active", True)]
         started_any = False
         for reminder in to_run:
             user = self.bot.get_user(reminder["user"])
+            if user is None:
+                # Set from a guild on another cluster: the user may not be cached here
+                try:
+                    user = await self.bot.fetch_user(reminder["user"])
+                except discord.HTTPException:
+                    continue
             if user:
                 # if that particular reminder doesn't already have a running task, start it
                 user_tasks = self.active_loops.get(user.id, {})
@@ -120,6 +182,13 @@ class ReminderCog(commands.Cog):
         if started_any:
             save_reminders(self.reminders)
 
+    def _cancel_loop(self, reminder_id: str):
+        for user_tasks in self.active_loops.values():
+            task = user_tasks.get(reminder_id)
+            if task:
+                task.cancel()
+                return
+
     async def start_reminder_loop(self, user: discord.User, reminder: dict):
         # ensure it's active
         if not reminder.get("active", True):
@@ -146,7 +215,7 @@ class ReminderCog(commands.Cog):
                         await user.send(msg)
                     except discord.Forbidden:
                         # can't DM the user anymore — mark inactive and stop
-                        print(f"🚫 Cannot DM user {user.id}, disabling reminder {rem['id']}")
+                        logger.warning(f"🚫 Cannot DM user {user.id}, disabling reminder {rem['id']}")
                         rem["active"] = False
                         save_reminders(self.reminders)
                         break
@@ -163,7 +232,7 @@ class ReminderCog(commands.Cog):
                     if not user_tasks:
                         # remove user's dict entirely if empty
                         del self.active_loops[user.id]
-                print(f"🗑️ Reminder loop ended for {rem['id']} (user {user.id})")
+                logger.debug("🗑️ Reminder loop ended for %s (user %s)", rem["id"], user.id)
 
         # create task and store it
         task = asyncio.create_task(loop_func())
@@ -171,7 +240,7 @@ class ReminderCog(commands.Cog):
         # ensure persistence reflects active state
         reminder["active"] = True
         save_reminders(self.reminders)
-        print(f"▶️ Started reminder loop {reminder['id']} for user {user.id}")
+        logger.debug("▶️ Started reminder loop %s for user %s", reminder["id"], user.id)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -238,7 +307,8 @@ class ReminderCog(commands.Cog):
         save_reminders(self.reminders)
 
         # If the reminder is already due (seconds == 0 or negative), start its loop immediately.
-        if end_time <= datetime.utcnow().timestamp():
+        # Other clusters leave it to the shard 0 cluster's checker.
+        if end_time <= datetime.utcnow().timestamp() and handles_dms(self.bot):
             await self.start_reminder_loop(user, reminder)
 
         abs_time = datetime.utcfromtimestamp(end_time).strftime("%d %B %Y, %H:%M UTC")
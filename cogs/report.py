@@ -1,26 +1,45 @@
 import discord
 from discord.ext import commands
 from discord.ui import View, Button
-import json, os, asyncio, datetime
+import json, os, datetime
+import logging
 
-REPORTS_FILE = "/data/reports.json"
-SETTINGS_FILE = "report_settings.json"
+from utils.cache import get_member
+from utils.store import store
 
-os.makedirs(os.path.dirname(REPORTS_FILE), exist_ok=True) if "/" in REPORTS_FILE else None
-os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True) if "/" in SETTINGS_FILE else None
+logger = logging.getLogger(__name__)
 
-save_lock = asyncio.Lock()
+REPORTS_FILE = "/data/reports.json"
+SETTINGS_FILE = "report_settings.json"
+REPORTS_TABLE = "reports"  # keyed by report id; any cluster may add one
+SETTINGS_TABLE = "report_settings"  # keyed by guild id
 
-# -------------------- JSON Helpers --------------------
+# -------------------- Persistence --------------------
 def load_json(path):
     if os.path.exists(path):
         with open(path, "r") as f:
             return json.load(f)
     return {}
 
-def save_json(path, data):
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4)
+def load_reports():
+    return store.load(REPORTS_TABLE, legacy=lambda: load_json(REPORTS_FILE))
+
+def save_reports(data):
+    store.save(REPORTS_TABLE, data)
+
+def pull_reports(data):
+    """Merge reports filed through other clusters into ``data``."""
+    store.pull(REPORTS_TABLE, data)
+
+def load_settings():
+    return store.load(SETTINGS_TABLE, legacy=lambda: load_json(SETTINGS_FILE))
+
+def save_settings(data):
+    store.save(SETTINGS_TABLE, data)
+
+# One copy shared by the cog and its persistent buttons
+reports = load_reports()
+settings = load_settings()
 
 # -------------------- Duration Parsing --------------------
 def parse_duration(duration: str):
@@ -48,11 +67,11 @@ class BaseReportButton(Button):
         self.report_id = str(report_id)
 
     def get_report(self):
-        data = load_json(REPORTS_FILE)
-        return data, data.get(self.report_id)
+        pull_reports(reports)
+        return reports, reports.get(self.report_id)
 
     def update_report(self, data):
-        save_json(REPORTS_FILE, data)
+        save_reports(data)
 
     async def send_ephemeral(self, interaction, msg):
         await interaction.response.send_message(msg, ephemeral=True)
@@ -81,7 +100,7 @@ class ReportSolveButton(BaseReportButton):
         data, report = self.get_report()
         if not report: return await self.send_ephemeral(interaction, "❌ Report not found.")
 
-        reporter = interaction.guild.get_member(report["reporter_id"])
+        reporter = await get_member(interaction.guild, report["reporter_id"])
         if reporter:
             embed = discord.Embed(
                 title="✅ Report Solved",
@@ -106,7 +125,7 @@ class ReportAskDMButton(BaseReportButton):
             return await self.send_ephemeral(interaction, "❌ You don’t have permission.")
         data, report = self.get_report()
         if not report: return await self.send_ephemeral(interaction, "❌ Report not found.")
-        reporter = interaction.guild.get_member(report["reporter_id"])
+        reporter = await get_member(interaction.guild, report["reporter_id"])
         if reporter:
             embed = discord.Embed(
                 title="💬 Staff Requested DM",
@@ -127,7 +146,7 @@ class ReportDismissButton(BaseReportButton):
             return await self.send_ephemeral(interaction, "❌ You don’t have permission.")
         data, report = self.get_report()
         if not report: return await self.send_ephemeral(interaction, "❌ Report not found.")
-        reporter = interaction.guild.get_member(report["reporter_id"])
+        reporter = await get_member(interaction.guild, report["reporter_id"])
         if reporter:
             embed = discord.Embed(
                 title="❌ Report Dismissed",
@@ -151,7 +170,7 @@ class ReportDeleteButton(BaseReportButton):
             return await self.send_ephemeral(interaction, "❌ You don’t have permission.")
         data, report = self.get_report()
         if not report: return await self.send_ephemeral(interaction, "❌ Report not found.")
-        reporter = interaction.guild.get_member(report["reporter_id"])
+        reporter = await get_member(interaction.guild, report["reporter_id"])
         if reporter:
             embed = discord.Embed(
                 title="🗑️ Report Deleted",
@@ -162,7 +181,7 @@ class ReportDeleteButton(BaseReportButton):
             try: await reporter.send(embed=embed)
             except: pass
         data.pop(self.report_id, None)
-        save_json(REPORTS_FILE, data)
+        self.update_report(data)
         await self.send_ephemeral(interaction, "✅ Report deleted.")
 
 class ReportKickButton(BaseReportButton):
@@ -173,7 +192,7 @@ class ReportKickButton(BaseReportButton):
         if not interaction.user.guild_permissions.kick_members:
             return await self.send_ephemeral(interaction, "❌ No permission to kick.")
         data, report = self.get_report()
-        member = interaction.guild.get_member(report["reported_id"])
+        member = await get_member(interaction.guild, report["reported_id"])
         if member:
             try:
                 embed = discord.Embed(
@@ -199,7 +218,7 @@ class ReportBanButton(BaseReportButton):
         if not interaction.user.guild_permissions.ban_members:
             return await self.send_ephemeral(interaction, "❌ No permission to ban.")
         data, report = self.get_report()
-        member = interaction.guild.get_member(report["reported_id"])
+        member = await get_member(interaction.guild, report["reported_id"])
         if member:
             try:
                 embed = discord.Embed(
@@ -225,8 +244,7 @@ class ReportMuteButton(BaseReportButton):
         if not interaction.user.guild_permissions.moderate_members:
             return await self.send_ephemeral(interaction, "❌ No permission to mute.")
         data, report = self.get_report()
-        member = interaction.guild.get_member(report["reported_id"])
-        settings = load_json(SETTINGS_FILE)
+        member = await get_member(interaction.guild, report["reported_id"])
         guild_settings = settings.get(str(interaction.guild.id), {})
         duration = guild_settings.get("mute_duration", "10m")
         td = parse_duration(duration) or datetime.timedelta(minutes=10)
@@ -251,8 +269,8 @@ class ReportMuteButton(BaseReportButton):
 class Reports(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.reports = load_json(REPORTS_FILE)
-        self.settings = load_json(SETTINGS_FILE)
+        self.reports = reports
+        self.settings = settings
 
     @commands.command()
     @commands.has_permissions(manage_guild=True)
@@ -260,7 +278,7 @@ class Reports(commands.Cog):
         """Set report channel"""
         self.settings[str(ctx.guild.id)] = self.settings.get(str(ctx.guild.id), {})
         self.settings[str(ctx.guild.id)]["report_channel"] = channel.id
-        save_json(SETTINGS_FILE, self.settings)
+        save_settings(self.settings)
         await ctx.send(f"✅ Report channel set to {channel.mention}")
 
     @commands.command()
@@ -272,7 +290,7 @@ class Reports(commands.Cog):
             return await ctx.send("❌ Invalid format! Use `10m`, `2h`, `1d`, etc.")
         self.settings[str(ctx.guild.id)] = self.settings.get(str(ctx.guild.id), {})
         self.settings[str(ctx.guild.id)]["mute_duration"] = duration
-        save_json(SETTINGS_FILE, self.settings)
+        save_settings(self.settings)
         await ctx.send(f"✅ Mute duration set to **{duration}**.")
 
     @commands.command()
@@ -281,6 +299,7 @@ class Reports(commands.Cog):
         guild_settings = self.settings.get(str(ctx.guild.id), {})
         if "report_channel" not in guild_settings:
             return await ctx.send("❌ Report channel not set.")
+        pull_reports(self.reports)  # number after the reports other clusters filed
         report_id = str(len(self.reports) + 1)
         report = {
             "id": report_id,
@@ -291,7 +310,7 @@ class Reports(commands.Cog):
             "time": str(datetime.datetime.utcnow())
         }
         self.reports[report_id] = report
-        save_json(REPORTS_FILE, self.reports)
+        save_reports(self.reports)
         channel = ctx.guild.get_channel(guild_settings["report_channel"])
         embed = discord.Embed(title="🚨 New Report", color=discord.Color.orange(), timestamp=datetime.datetime.utcnow())
         embed.add_field(name="Report ID", value=report_id)
@@ -304,6 +323,7 @@ class Reports(commands.Cog):
     @commands.command()
     async def myreports(self, ctx):
         """Show your reports"""
+        pull_reports(self.reports)
         my_reps = [r for r in self.reports.values() if r["reporter_id"] == ctx.author.id]
         if not my_reps:
             return await ctx.send("❌ You have no reports.")
@@ -315,6 +335,7 @@ class Reports(commands.Cog):
     @commands.command()
     async def reportinfo(self, ctx, report_id: str):
         """Detailed info about a report"""
+        pull_reports(self.reports)
         report = self.reports.get(report_id)
         if not report:
             return await ctx.send("❌ Report not found.")
@@ -337,7 +358,7 @@ class Reports(commands.Cog):
         # reattach persistent buttons
         for rid in self.reports.keys():
             self.bot.add_view(ReportView(self.bot, rid))
-        print("✅ Reports cog loaded with persistent buttons.")
+        logger.info("✅ Reports cog loaded with persistent buttons.")
 
 async def setup(bot):
     await bot.add_cog(Reports(bot))
\ No newline at end of file
@@ -2,11 +2,18 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+import logging
+
+from utils.cache import guild_members
+from utils.progress import ProgressReporter
+
+logger = logging.getLogger(__name__)
 
 
 class RoleAll(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.running: set[int] = set()  # guild ids with a roleall in progress
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
@@ -19,8 +26,7 @@ class RoleAll(commands.Cog):
         added_ids = after_ids - before_ids
         removed_ids = before_ids - after_ids
 
-        print(f"[DEBUG] Role change detected for {after} ({after.id})")
-        print(f"[DEBUG] Added: {added_ids}, Removed: {removed_ids}")
+        logger.debug("Role change for %s (%s): added %s, removed %s", after, after.id, added_ids, removed_ids)
 
         CONTENT_CREATOR_ROLE_ID = 1363562800819077476
 
@@ -41,9 +47,9 @@ class RoleAll(commands.Cog):
                 embed.set_thumbnail(url="https://i.ibb.co/QjdGBtNg")  # same image, or you can use a celebratory one
                 embed.set_footer(text="Noobs Vs Bacons • Content Creator Program")
                 await after.send(embed=embed)
-                print("[DEBUG] Sent DM for role ADD")
+                logger.debug("Sent DM for role ADD to %s", after.id)
             except Exception as e:
-                print(f"[DEBUG] Failed to DM on role add: {e}")
+                logger.debug("Failed to DM %s on role add: %s", after.id, e)
 
         # ❌ Role removed → removal embed
         if CONTENT_CREATOR_ROLE_ID in removed_ids:
@@ -67,31 +73,54 @@ class RoleAll(commands.Cog):
                 embed.set_thumbnail(url="https://i.ibb.co/QjdGBtNg")
                 embed.set_footer(text="Noobs Vs Bacons • Content Creator Program")
                 await after.send(embed=embed)
-                print("[DEBUG] Sent DM for role REMOVE")
+                logger.debug("Sent DM for role REMOVE to %s", after.id)
             except Exception as e:
-                print(f"[DEBUG] Failed to DM on role remove: {e}")
+                logger.debug("Failed to DM %s on role remove: %s", after.id, e)
 
     # ---------------- Shared Logic ----------------
     async def _roleall(self, ctx_or_interaction, action: str, role: discord.Role, is_slash: bool = False):
         guild = ctx_or_interaction.guild
         author = ctx_or_interaction.user if is_slash else ctx_or_interaction.author
 
-        # Determine members to process
-        if action.lower() == "give":
-            members = [m for m in guild.members if role not in m.roles]
-        elif action.lower() == "remove":
-            members = [m for m in guild.members if role in m.roles]
-        else:
-            msg = "❌ Invalid action. Use `give` or `remove`."
+        # One mass edit per guild at a time
+        if guild.id in self.running:
+            msg = "⚠️ A roleall is already running in this server. Please wait for it to finish."
             if is_slash:
                 return await ctx_or_interaction.response.send_message(msg, ephemeral=True)
             return await ctx_or_interaction.send(msg)
+        self.running.add(guild.id)
+        try:
+            await self._roleall_run(ctx_or_interaction, guild, author, action, role, is_slash)
+        finally:
+            self.running.discard(guild.id)
+
+    async def _roleall_run(self, ctx_or_interaction, guild, author, action: str, role: discord.Role, is_slash: bool):
+        async def reply(**kwargs):
+            if not is_slash:
+                return await ctx_or_interaction.send(**kwargs)
+            if ctx_or_interaction.response.is_done():
+                return await ctx_or_interaction.followup.send(wait=True, **kwargs)
+            await ctx_or_interaction.response.send_message(**kwargs)
+            return await ctx_or_interaction.original_response()
+
+        if action.lower() not in ("give", "remove"):
+            msg = "❌ Invalid action. Use `give` or `remove`."
+            return await (reply(content=msg, ephemeral=True) if is_slash else reply(content=msg))
+
+        # Member lists are only cached with the "full" cache profile; request them otherwise
+        if not guild.chunked and is_slash:
+            await ctx_or_interaction.response.defer()
+        all_members = await guild_members(guild)
+
+        # Determine members to process
+        if action.lower() == "give":
+            members = [m for m in all_members if role not in m.roles]
+        else:
+            members = [m for m in all_members if role in m.roles]
 
         if not members:
             msg = f"⚠️ No members to {action} the role {role.mention}."
-            if is_slash:
-                return await ctx_or_interaction.response.send_message(msg, ephemeral=True)
-            return await ctx_or_interaction.send(msg)
+            return await (reply(content=msg, ephemeral=True) if is_slash else reply(content=msg))
 
         total = len(members)
         changed = 0
@@ -104,36 +133,37 @@ class RoleAll(commands.Cog):
         )
         embed.set_footer(text=f"Requested by {author}", icon_url=author.display_avatar.url)
 
-        if is_slash:
-            await ctx_or_interaction.response.send_message(embed=embed)
-            progress_msg = await ctx_or_interaction.original_response()
-        else:
-            progress_msg = await ctx_or_interaction.send(embed=embed)
+        progress_msg = await reply(embed=embed)
 
         # ---------------- Processing in concurrent batches ----------------
         batch_size = 25
         pause_time = 1  # seconds
-
-        for i in range(0, len(members), batch_size):
-            batch = members[i:i+batch_size]
-
-            tasks = []
-            for member in batch:
-                if action.lower() == "give":
-                    tasks.append(member.add_roles(role, reason=f"Mass role give by {author}"))
-                else:
-                    tasks.append(member.remove_roles(role, reason=f"Mass role remove by {author}"))
-
-            # Run all role operations concurrently
-            await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Update progress
-            changed += len(batch)
-            embed.description = f"{action.capitalize()}ing {role.mention}...\n({changed}/{total})"
-            await progress_msg.edit(embed=embed)
-
-            # Pause after each batch
-            await asyncio.sleep(pause_time)
+        reporter = ProgressReporter(progress_msg)
+
+        try:
+            for i in range(0, len(members), batch_size):
+                batch = members[i:i+batch_size]
+
+                tasks = []
+                for member in batch:
+                    if action.lower() == "give":
+                        tasks.append(member.add_roles(role, reason=f"Mass role give by {author}"))
+                    else:
+                        tasks.append(member.remove_roles(role, reason=f"Mass role remove by {author}"))
+
+                # Run all role operations concurrently
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+                # Update progress
+                changed += len(batch)
+                embed.description = f"{action.capitalize()}ing {role.mention}...\n({changed}/{total})"
+                reporter.update({"embed": embed})
+
+                # Pause after each batch
+                await asyncio.sleep(pause_time)
+        finally:
+            # Cancelled or failed mid-run (reload, shutdown, HTTP errors): stop the edits
+            await reporter.close()
 
         # Final embed
         embed.title = f"✅ Finished {action.capitalize()}ing Role"
@@ -4,6 +4,8 @@ from discord import app_commands
 import random
 from typing import Optional
 
+from utils.cache import guild_members
+
 class ServerInfo(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -23,9 +25,12 @@ class ServerInfo(commands.Cog):
         # Owner
         owner = guild.owner.mention if guild.owner else "Unknown"
 
-        # Members
-        humans = sum(1 for m in guild.members if not m.bot)
-        bots = sum(1 for m in guild.members if m.bot)
+        # Members (chunked on demand when the cache profile doesn't keep member lists)
+        if not guild.chunked and is_interaction:
+            await ctx_or_interaction.response.defer()
+        members = await guild_members(guild)
+        humans = sum(1 for m in members if not m.bot)
+        bots = len(members) - humans
         total_members = humans + bots
 
         # Channels & Roles
@@ -87,7 +92,9 @@ class ServerInfo(commands.Cog):
         embed.add_field(name="🕒 Created At", value=guild.created_at.strftime("%d %b %Y %H:%M"), inline=True)
 
         # Send embed
-        if is_interaction:
+        if is_interaction and ctx_or_interaction.response.is_done():
+            await ctx_or_interaction.followup.send(embed=embed)
+        elif is_interaction:
             await ctx_or_interaction.response.send_message(embed=embed)
         else:
             await ctx_or_interaction.send(embed=embed)
@@ -4,10 +4,15 @@ from discord import app_commands, Interaction
 import random
 import asyncio
 from PIL import Image, ImageDraw, ImageFont
-import aiohttp
 import random
 import io
 import difflib
+import logging
+
+from utils.assets import assets, load_font
+from utils.render import render, RenderBusy, encode_image, image_filename
+
+logger = logging.getLogger(__name__)
 
 BATTLE_EMOJI = "<:battle:1422344657790177300>"
 TURN_EMOJI = "<:turn_emoji:1423418329334415411>"
@@ -452,25 +457,14 @@ def get_random_attacks(character):
 
 
 
-async def url_to_file(url: str) -> io.BytesIO:
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                raise Exception(f"Image download failed: {url}")
-            return io.BytesIO(await resp.read())
-
-async def make_vs_image(url1: str, url2: str) -> io.BytesIO:
-    """Combine 2 images side by side with a big VS"""
-    img1_bytes = await url_to_file(url1)
-    img2_bytes = await url_to_file(url2)
-
-    img1 = Image.open(img1_bytes).convert("RGBA")
-    img2 = Image.open(img2_bytes).convert("RGBA")
+VS_HEIGHT = 350
+VS_FONT = ("arialbd.ttf",)
+render.warmup(load_font, VS_FONT, 120)
 
-    height = 350
-    img1 = img1.resize((int(img1.width * (height / img1.height)), height))
-    img2 = img2.resize((int(img2.width * (height / img2.height)), height))
 
+def render_vs_image(img1, img2) -> bytes:
+    """Draw both characters side by side with a big VS; runs in a render worker."""
+    height = VS_HEIGHT
     spacing = 80
     total_width = img1.width + img2.width + spacing
     combined = Image.new("RGBA", (total_width, height), (0, 0, 0, 0))
@@ -478,19 +472,9 @@ async def make_vs_image(url1: str, url2: str) -> io.BytesIO:
     combined.paste(img1, (0, 0), img1)
     combined.paste(img2, (img1.width + spacing, 0), img2)
 
-    draw = ImageDraw.Draw(combined)
-    try:
-        font = ImageFont.truetype("arialbd.ttf", 120)
-    except:
-        font = ImageFont.load_default()
-
-    text = "VS"
 # Draw VS text
     draw = ImageDraw.Draw(combined)
-    try:
-        font = ImageFont.truetype("arialbd.ttf", 120)
-    except:
-        font = ImageFont.load_default()
+    font = load_font(VS_FONT, 120) or ImageFont.load_default()
 
     text = "VS"
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -503,13 +487,17 @@ async def make_vs_image(url1: str, url2: str) -> io.BytesIO:
     draw.text((text_x + 4, text_y + 4), text, font=font, fill="black")
     draw.text((text_x, text_y), text, font=font, fill="red")
 
-    draw.text((text_x + 4, text_y + 4), text, font=font, fill="black")
-    draw.text((text_x, text_y), text, font=font, fill="red")
+    return encode_image(combined, "vs")
+
 
-    output = io.BytesIO()
-    combined.save(output, format="PNG")
-    output.seek(0)
-    return output
+async def make_vs_image(url1: str, url2: str) -> io.BytesIO:
+    """Combine 2 images side by side with a big VS"""
+    # Character art is static: fetched, decoded and scaled once, then reused
+    img1, img2 = await asyncio.gather(
+        assets.image(url1, height=VS_HEIGHT),
+        assets.image(url2, height=VS_HEIGHT),
+    )
+    return io.BytesIO(await render.run(render_vs_image, img1, img2))
 
 # ================= Game Logic =================
 games = {}  # channel_id -> game state
@@ -622,7 +610,7 @@ class RetreatYesButton(discord.ui.Button):
             try:
                 await view.message.edit(embed=embed, view=view)
             except Exception as e:
-                print(f"[RetreatYesButton] Failed to update vote message: {e}")
+                logger.warning(f"[RetreatYesButton] Failed to update vote message: {e}")
 
         # Only end battle if EVERY player voted AND all said Yes
         if len(votes) == len(players) and all(votes.get(p.id) for p in players):
@@ -641,7 +629,7 @@ class RetreatYesButton(discord.ui.Button):
                 try:
                     await view.message.edit(embed=final_embed, view=None)
                 except Exception as e:
-                    print(f"[RetreatYesButton] Failed to edit final vote message: {e}")
+                    logger.warning(f"[RetreatYesButton] Failed to edit final vote message: {e}")
 
             # also update the main game message (if you store it)
             if self.game.get("message"):
@@ -708,7 +696,7 @@ class RetreatNoButton(discord.ui.Button):
             try:
                 await view.message.edit(embed=embed, view=view)
             except Exception as e:
-                print(f"[RetreatNoButton] Failed to update vote message: {e}")
+                logger.warning(f"[RetreatNoButton] Failed to update vote message: {e}")
 
         # cleanup
         self.game.pop("retreat_votes", None)
@@ -868,9 +856,12 @@ async def update_battle_embed(channel, game, last_attack=None, immune_msg=None):
 
     # Send new message if first time, else edit existing
     if "message" not in game:
-        vs_image = await make_vs_image(c1["image"], c2["image"])
-        file = discord.File(vs_image, filename="vs.png")
-        msg = await channel.send(file=file, embed=embed, view=view)
+        try:
+            vs_image = await make_vs_image(c1["image"], c2["image"])
+        except (RenderBusy, asyncio.TimeoutError):
+            msg = await channel.send(embed=embed, view=view)  # renderer is swamped; skip the banner
+        else:
+            msg = await channel.send(file=discord.File(vs_image, filename=image_filename("vs")), embed=embed, view=view)
         game["message"] = msg
     else:
         await game["message"].edit(embed=embed, view=view)
@@ -880,6 +871,15 @@ class Skibidi(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    # Hot reload (utils/startup.py: reload_extension): the battles in progress
+    # live in the old module's ``games``, which their views keep using
+    def export_state(self) -> dict:
+        return {"games": games}
+
+    def import_state(self, state: dict):
+        global games
+        games = state["games"]
+
 # ========== PREFIX ==========
     @commands.command(name="skibidilist")
     async def skibidi_list_prefix(self, ctx, *, search: str = None):
@@ -1,26 +1,60 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+from collections import deque
+
+SNIPE_LIMIT = 50  # messages kept per channel and kind
 
 
 class Snipe(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.deleted_messages = {}  # channel_id -> [discord.Message]
-        self.edited_messages = {}   # channel_id -> [{"before": before, "after": after}]
+        # Bounded per channel, and dropped with their channel/guild, so buffers
+        # don't grow with the number of guilds a shard serves.
+        self.deleted_messages = {}  # channel_id -> deque[discord.Message]
+        self.edited_messages = {}   # channel_id -> deque[{"before": before, "after": after}]
+        self.guild_channels = {}    # guild_id -> {channel_id}
+
+    # Hot reload (utils/startup.py: reload_extension) keeps the buffers
+    def export_state(self) -> dict:
+        return {"deleted": self.deleted_messages, "edited": self.edited_messages, "channels": self.guild_channels}
+
+    def import_state(self, state: dict):
+        self.deleted_messages = state["deleted"]
+        self.edited_messages = state["edited"]
+        self.guild_channels = state["channels"]
+
+    def _buffer(self, store: dict, message: discord.Message) -> deque:
+        if message.guild:
+            self.guild_channels.setdefault(message.guild.id, set()).add(message.channel.id)
+        return store.setdefault(message.channel.id, deque(maxlen=SNIPE_LIMIT))
+
+    def _forget_channel(self, channel_id: int):
+        self.deleted_messages.pop(channel_id, None)
+        self.edited_messages.pop(channel_id, None)
 
     # ---------- Listeners ----------
     @commands.Cog.listener()
     async def on_message_delete(self, message: discord.Message):
         if message.author.bot:
             return
-        self.deleted_messages.setdefault(message.channel.id, []).append(message)
+        self._buffer(self.deleted_messages, message).append(message)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message):
         if before.author.bot:
             return
-        self.edited_messages.setdefault(before.channel.id, []).append({"before": before, "after": after})
+        self._buffer(self.edited_messages, before).append({"before": before, "after": after})
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self._forget_channel(channel.id)
+        self.guild_channels.get(channel.guild.id, set()).discard(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        for channel_id in self.guild_channels.pop(guild.id, ()):
+            self._forget_channel(channel_id)
 
     # ---------- Helpers ----------
     def build_deleted_embed(self, message: discord.Message):
@@ -1,19 +1,48 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import yt_dlp
 import os
 import time
 import asyncio
+import contextlib
+import hashlib
+import json
 import math
 import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+import logging
+
+from utils.progress import ProgressReporter
+from utils.startup import lazy_import
+
+logger = logging.getLogger(__name__)
+
+yt_dlp = lazy_import("yt_dlp")
 
 Loading = "<a:loading:1408941121803124807>"
 
-MAX_DISCORD_FILESIZE = 10 * 1024 * 1024  # 10MB
 DOWNLOADS_DIR = "downloads"
 os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
+MAX_DISCORD_FILESIZE = 10 * 1024 * 1024  # 10MB
+SIZE_HEADROOM = 0.95  # leave room for container overhead and estimate error
+FALLBACK_FORMAT = "best[ext=mp4]/bestvideo[ext=mp4]+bestaudio[ext=m4a]/best"
+# Finished downloads are kept for repeat requests of the same video/format
+CACHE_DIR = os.path.join(DOWNLOADS_DIR, "cache")
+CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+CACHE_TTL = 24 * 3600
+
+# Codecs that can go into an .mp4 with a stream copy (-c copy)
+MP4_VIDEO_CODECS = ("avc1", "h264", "hev1", "hvc1", "av01")
+MP4_AUDIO_CODECS = ("mp4a", "aac", "mp3")
+
+MAX_CONCURRENT_DOWNLOADS = 3  # bot-wide
+MAX_JOBS_PER_USER = 2  # running + queued
+MIN_FREE_DISK = 512 * 1024 * 1024  # keep this much free in DOWNLOADS_DIR
+JOB_DISK_RESERVE = 3 * MAX_DISCORD_FILESIZE  # separate streams + merged output
+
 
 def clean_filename(name: str) -> str:
     name = re.sub(r'[^\w\s.-]', '', name)
@@ -29,53 +58,306 @@ def sizeof_fmt(num, suffix="B"):
     return f"{num:.1f}T{suffix}"
 
 
+def estimate_size(fmt: dict, duration) -> int | None:
+    """Best guess of a format's size: exact, approximate, or bitrate x duration."""
+    size = fmt.get("filesize") or fmt.get("filesize_approx")
+    if size:
+        return int(size)
+    tbr = fmt.get("tbr") or (fmt.get("vbr") or 0) + (fmt.get("abr") or 0)
+    if tbr and duration:
+        return int(tbr * 1000 / 8 * duration)
+    return None
+
+
+def mp4_compatible(vcodec: str | None, acodec: str | None) -> bool:
+    """True when both streams can be remuxed into mp4 without re-encoding."""
+    return (
+        (vcodec or "").lower().startswith(MP4_VIDEO_CODECS)
+        and (acodec or "").lower().startswith(MP4_AUDIO_CODECS)
+    )
+
+
+def choose_format(info: dict, limit: int):
+    """Pick the best format (or video+audio pair) expected to fit under ``limit``.
+
+    At equal height, mp4-compatible codecs win so the result can be remuxed
+    instead of transcoded.
+
+    Returns ``(pick, smallest)``: ``pick`` is a dict with ``format``, ``size``,
+    ``label`` and ``remux`` or None, ``smallest`` is the smallest size estimate
+    seen (None when the extractor gave nothing to estimate from).
+    """
+    duration = info.get("duration") or 0
+    formats = [f for f in info.get("formats") or [] if f.get("format_id")]
+
+    def has(f, kind):
+        return f.get(kind) not in (None, "none")
+
+    videos = [(f, estimate_size(f, duration)) for f in formats if has(f, "vcodec") and not has(f, "acodec")]
+    audios = [(f, estimate_size(f, duration)) for f in formats if has(f, "acodec") and not has(f, "vcodec")]
+
+    candidates = []  # (rank, size, format spec, video format, remux)
+    for f in formats:
+        if has(f, "vcodec") and has(f, "acodec"):
+            size = estimate_size(f, duration)
+            if size:
+                remux = mp4_compatible(f.get("vcodec"), f.get("acodec"))
+                candidates.append(((f.get("height") or 0, remux, f.get("tbr") or 0), size, f["format_id"], f, remux))
+    for v, v_size in videos:
+        for a, a_size in audios:
+            if v_size and a_size:
+                remux = mp4_compatible(v.get("vcodec"), a.get("acodec"))
+                rank = (v.get("height") or 0, remux, (v.get("tbr") or 0) + (a.get("tbr") or 0))
+                candidates.append((rank, v_size + a_size, f"{v['format_id']}+{a['format_id']}", v, remux))
+
+    if not candidates:
+        return None, None
+    smallest = min(c[1] for c in candidates)
+    fitting = [c for c in candidates if c[1] <= limit * SIZE_HEADROOM]
+    if not fitting:
+        return None, smallest
+    rank, size, spec, video, remux = max(fitting, key=lambda c: c[0])
+    label = f"{video['height']}p ({spec})" if video.get("height") else spec
+    return {"format": spec, "size": size, "label": label, "remux": remux}, smallest
+
+
+def render_queued(position: int) -> dict:
+    return {"embed": discord.Embed(
+        title="🕒 Queued",
+        description=f"Position **{position}** in the download queue. Your download will start automatically.",
+        color=discord.Color.blurple()
+    )}
+
+
+def render_progress(d: dict) -> dict:
+    if d['status'] == 'finished':
+        return {"content": "📦 Finalizing...", "embed": None}
+
+    percent = d.get("_percent_str", "").strip().replace("%", "")
+    total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
+    downloaded_bytes = d.get("downloaded_bytes", 0)
+    speed = d.get("speed", 0)
+    eta = d.get("eta", 0)
+    percent_float = float(percent)
+
+    bar_step = math.floor(percent_float / 10)
+    bar = "🟩" * bar_step + "⬛" * (10 - bar_step)
+    speed_str = sizeof_fmt(speed) + "/s" if speed else "N/A"
+    eta_str = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta else "N/A"
+    size_str = f"{sizeof_fmt(downloaded_bytes)}/{sizeof_fmt(total_bytes)}" if total_bytes else f"{sizeof_fmt(downloaded_bytes)}"
+
+    embed = discord.Embed(title="⬇️ Downloading...", color=discord.Color.blurple())
+    embed.add_field(name="Progress", value=f"`{bar}` {percent_float:.1f}%", inline=False)
+    embed.add_field(name="Size", value=size_str, inline=True)
+    embed.add_field(name="Speed", value=speed_str, inline=True)
+    embed.add_field(name="ETA", value=eta_str, inline=True)
+    return {"embed": embed}
+
+
 class ProgressHook:
-    def __init__(self, message: discord.Message, loop: asyncio.AbstractEventLoop):
-        self.message = message
-        self.loop = loop
-        self.last_update = 0
+    """yt-dlp progress hook; only records the latest tick; the reporter renders and edits."""
+
+    def __init__(self, reporter: ProgressReporter):
+        self.reporter = reporter
 
     def update(self, d):
         if d['status'] == 'downloading':
-            percent = d.get("_percent_str", "").strip().replace("%", "")
-            total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
-            downloaded_bytes = d.get("downloaded_bytes", 0)
-            speed = d.get("speed", 0)
-            eta = d.get("eta", 0)
+            try:
+                float(d.get("_percent_str", "").strip().replace("%", ""))
+            except ValueError:
+                return
+            self.reporter.update(d)
+        elif d['status'] == 'finished':
+            self.reporter.update(d)
+
 
+def attachment_url_valid(url: str | None) -> bool:
+    """Discord CDN links carry a hex ``ex`` expiry; re-link only while it has time left."""
+    if not url:
+        return False
+    ex = parse_qs(urlparse(url).query).get("ex")
+    try:
+        return bool(ex) and int(ex[0], 16) - time.time() > 300
+    except ValueError:
+        return False
+
+
+class DownloadCache:
+    """On-disk LRU of finished downloads keyed by extractor id + chosen format.
+
+    Bounded by total bytes and a TTL. Also remembers the page URL -> key
+    mapping (so repeats skip the probe) and the attachment URL of the last
+    upload (so repeats can skip the upload too).
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES, ttl: int = CACHE_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.index_file = os.path.join(directory, "index.json")
+        self.entries: dict[str, dict] = {}
+        self.urls: dict[str, str] = {}
+        self.pinned: dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, "r") as f:
+                    data = json.load(f)
+                self.entries, self.urls = data.get("entries", {}), data.get("urls", {})
+            except json.JSONDecodeError:
+                logger.warning("⚠️ download cache index corrupted, resetting...")
+        self._evict()
+
+    @staticmethod
+    def make_key(info: dict, fmt: str) -> str:
+        return f"{info.get('extractor_key') or info.get('extractor')}:{info.get('id')}:{fmt}"
+
+    def _save(self):
+        with open(self.index_file, "w") as f:
+            json.dump({"entries": self.entries, "urls": self.urls}, f)
+
+    def key_for_url(self, url: str) -> str | None:
+        return self.urls.get(url)
+
+    def get(self, key: str | None) -> dict | None:
+        entry = self.entries.get(key) if key else None
+        if not entry:
+            return None
+        if time.time() - entry["created"] > self.ttl or not os.path.exists(entry["path"]):
+            self._drop(key)
+            self._save()
+            return None
+        entry["last_used"] = time.time()
+        return entry
+
+    def put(self, key: str, url: str, src: str, meta: dict) -> dict:
+        """Move a finished download into the cache and return its entry."""
+        path = os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".mp4")
+        os.replace(src, path)
+        now = time.time()
+        entry = {**meta, "path": path, "size": os.path.getsize(path), "created": now, "last_used": now, "attachment_url": None}
+        self.entries[key] = entry
+        self.urls[url] = key
+        self._evict()
+        self._save()
+        return entry
+
+    def set_attachment(self, key: str, attachment_url: str):
+        if key in self.entries:
+            self.entries[key]["attachment_url"] = attachment_url
+            self._save()
+
+    @contextlib.contextmanager
+    def pin(self, key: str):
+        """Keep an entry from being evicted while it is being uploaded."""
+        self.pinned[key] = self.pinned.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            self.pinned[key] -= 1
+            if not self.pinned[key]:
+                del self.pinned[key]
+
+    def _drop(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry and os.path.exists(entry["path"]):
+            os.remove(entry["path"])
+        self.urls = {u: k for u, k in self.urls.items() if k != key}
+
+    def _evict(self):
+        now = time.time()
+        for key in [k for k, e in self.entries.items() if now - e["created"] > self.ttl and k not in self.pinned]:
+            self._drop(key)
+        total = sum(e["size"] for e in self.entries.values())
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key not in self.pinned:
+                total -= self.entries[key]["size"]
+                self._drop(key)
+
+
+class DownloadPool:
+    """Bounded FIFO of download jobs with per-user caps and disk admission.
+
+    yt-dlp probes and downloads run on a dedicated executor so they never
+    block the event loop or starve the default executor used by other cogs.
+    """
+
+    def __init__(self, workers: int = MAX_CONCURRENT_DOWNLOADS, per_user: int = MAX_JOBS_PER_USER):
+        self.workers = workers
+        self.per_user = per_user
+        self.active = 0
+        self.waiting: list[tuple[asyncio.Future, object]] = []  # (admission future, on_position)
+        self.user_jobs: dict[int, int] = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="urldownload")
+
+    def admission_error(self, user_id: int) -> str | None:
+        if self.user_jobs.get(user_id, 0) >= self.per_user:
+            return f"You already have {self.per_user} downloads running or queued. Please wait for them to finish."
+        reserved = (self.active + len(self.waiting) + 1) * JOB_DISK_RESERVE
+        if shutil.disk_usage(DOWNLOADS_DIR).free - reserved < MIN_FREE_DISK:
+            return "The bot is low on disk space right now. Please try again later."
+        return None
+
+    async def run(self, fn):
+        """Run blocking yt-dlp work on the pool's executor."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn)
+
+    @contextlib.asynccontextmanager
+    async def job(self, user_id: int, on_position):
+        """
+        Hold one of the pool's slots. While the job waits, ``on_position(n)``
+        is called with its place in the queue, and again whenever it moves up.
+        """
+        self.user_jobs[user_id] = self.user_jobs.get(user_id, 0) + 1
+        try:
+            if self.active < self.workers and not self.waiting:
+                self.active += 1
+            else:
+                fut = asyncio.get_running_loop().create_future()
+                waiter = (fut, on_position)
+                self.waiting.append(waiter)
+                on_position(len(self.waiting))
+                try:
+                    await fut
+                except BaseException:
+                    if waiter in self.waiting:
+                        self.waiting.remove(waiter)
+                        self._positions_changed()
+                    elif fut.done() and not fut.cancelled():
+                        self._release_slot()  # slot was already handed to us
+                    raise
             try:
-                percent_float = float(percent)
-            except:
+                yield
+            finally:
+                self._release_slot()
+        finally:
+            self.user_jobs[user_id] -= 1
+            if not self.user_jobs[user_id]:
+                del self.user_jobs[user_id]
+
+    def _release_slot(self):
+        # Hand the slot straight to the next waiter, otherwise free it.
+        while self.waiting:
+            fut, _ = self.waiting.pop(0)
+            if not fut.done():
+                fut.set_result(None)
+                self._positions_changed()
                 return
+        self.active -= 1
 
-            bar_step = math.floor(percent_float / 10)
-            bar = "🟩" * bar_step + "⬛" * (10 - bar_step)
-            speed_str = sizeof_fmt(speed) + "/s" if speed else "N/A"
-            eta_str = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta else "N/A"
-            size_str = f"{sizeof_fmt(downloaded_bytes)}/{sizeof_fmt(total_bytes)}" if total_bytes else f"{sizeof_fmt(downloaded_bytes)}"
-
-            embed = discord.Embed(title="⬇️ Downloading...", color=discord.Color.blurple())
-            embed.add_field(name="Progress", value=f"`{bar}` {percent_float:.1f}%", inline=False)
-            embed.add_field(name="Size", value=size_str, inline=True)
-            embed.add_field(name="Speed", value=speed_str, inline=True)
-            embed.add_field(name="ETA", value=eta_str, inline=True)
-
-            now = time.time()
-            if now - self.last_update > 1:
-                self.last_update = now
-                asyncio.run_coroutine_threadsafe(
-                    self.message.edit(embed=embed),
-                    self.loop
-                )
-        elif d['status'] == 'finished':
-            asyncio.run_coroutine_threadsafe(
-                self.message.edit(content="📦 Finalizing...", embed=None),
-                self.loop
-            )
+    def _positions_changed(self):
+        for position, (_, on_position) in enumerate(self.waiting, 1):
+            on_position(position)
 
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
-async def handle_download(bot, interaction_or_ctx, url: str, is_slash: bool):
+
+async def handle_download(bot, interaction_or_ctx, url: str, is_slash: bool, pool: DownloadPool, cache: DownloadCache):
     start_time = time.time()
+    user = interaction_or_ctx.user if is_slash else interaction_or_ctx.author
 
     if is_slash:
         await interaction_or_ctx.response.defer(thinking=True)
@@ -83,88 +365,175 @@ async def handle_download(bot, interaction_or_ctx, url: str, is_slash: bool):
     else:
         status_msg = await interaction_or_ctx.send(embed=discord.Embed(title="🔄 Preparing download..."))
 
+    error = pool.admission_error(user.id)
+    if error:
+        await status_msg.edit(embed=discord.Embed(title="⛔ Download Rejected", description=error, color=discord.Color.red()))
+        return
+
+    # The queue position changes as earlier jobs finish; edits go through a
+    # reporter so a long queue moving fast doesn't flood the edit route.
+    queued: ProgressReporter | None = None
+
+    def on_position(position: int):
+        nonlocal queued
+        if queued is None:
+            queued = ProgressReporter(status_msg, render=render_queued)
+        queued.update(position)
+
     try:
-        loop = asyncio.get_running_loop()
+        async with pool.job(user.id, on_position):
+            if queued:
+                await queued.close()  # before the status moves on, so a late tick can't overwrite it
+            await status_msg.edit(embed=discord.Embed(title="🔄 Preparing download..."))
+            await _download_job(interaction_or_ctx, url, is_slash, pool, cache, status_msg, start_time)
+    finally:
+        if queued:
+            await queued.close()  # cancelled while still queued
+
+
+def _result_embed(entry: dict, elapsed: float, cached: bool) -> discord.Embed:
+    embed = discord.Embed(title="✅ Download Complete", color=discord.Color.green())
+    embed.add_field(name="📹 Title", value=entry["title"], inline=False)
+    embed.add_field(name="⏱️ Length", value=entry["duration_str"], inline=True)
+    embed.add_field(name="📺 Format Used", value=entry["quality"], inline=True)
+    embed.add_field(name="🛠️ Processing", value="Cached" if cached else entry["processing"], inline=True)
+    embed.add_field(name="📦 Size", value=sizeof_fmt(entry["size"]), inline=True)
+    embed.add_field(name="⏳ Time taken", value=f"{elapsed:.2f}s", inline=True)
+    return embed
+
+
+async def _send_result(interaction_or_ctx, is_slash: bool, cache: DownloadCache, key: str, entry: dict, status_msg: discord.Message, start_time: float, cached: bool):
+    embed = _result_embed(entry, time.time() - start_time, cached)
+    if cached and attachment_url_valid(entry.get("attachment_url")):
+        # Re-link the earlier upload; Discord renders the video from the link.
+        await status_msg.edit(content=None, embed=embed)
+        if is_slash:
+            await interaction_or_ctx.followup.send(entry["attachment_url"])
+        else:
+            await interaction_or_ctx.send(entry["attachment_url"])
+        return
+
+    await status_msg.edit(content=f"{Loading} Uploading to Discord...", embed=None)
+    with cache.pin(key):
+        file = discord.File(entry["path"], filename=entry["name"])
+        if is_slash:
+            msg = await interaction_or_ctx.followup.send(embed=embed, file=file, wait=True)
+        else:
+            msg = await interaction_or_ctx.send(embed=embed, file=file)
+    if msg and msg.attachments:
+        cache.set_attachment(key, msg.attachments[0].url)
+
+
+async def _download_job(interaction_or_ctx, url: str, is_slash: bool, pool: DownloadPool, cache: DownloadCache, status_msg: discord.Message, start_time: float):
+    filename = None
+    try:
+        key = cache.key_for_url(url)
+        entry = cache.get(key)
+        if entry:
+            return await _send_result(interaction_or_ctx, is_slash, cache, key, entry, status_msg, start_time, cached=True)
+
+        # Same client/cookies as the download so the probed format ids exist there.
         probe_opts = {"format": "bestvideo+bestaudio/best",
-                      "quiet": True, "no_warnings": True, "noplaylist": True}
-        with yt_dlp.YoutubeDL(probe_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            title = info.get("title", "Unknown")
-            duration = info.get("duration", 0)
-            duration_str = time.strftime("%H:%M:%S", time.gmtime(duration))
+                      "quiet": True, "no_warnings": True, "noplaylist": True,
+                      "cookiefile": "cookies.txt", "cachedir": False,
+                      "extractor_args": {"youtube": {"player_client": ["android"]}}}
+
+        def probe():
+            with yt_dlp.YoutubeDL(probe_opts) as ydl:
+                return ydl.extract_info(url, download=False)
+
+        info = await pool.run(probe)
+        title = info.get("title", "Unknown")
+        duration = info.get("duration", 0)
+        duration_str = time.strftime("%H:%M:%S", time.gmtime(duration))
+
+        pick, _ = choose_format(info, MAX_DISCORD_FILESIZE)
+        key = DownloadCache.make_key(info, pick["format"] if pick else FALLBACK_FORMAT)
+        entry = cache.get(key)
+        if entry:
+            return await _send_result(interaction_or_ctx, is_slash, cache, key, entry, status_msg, start_time, cached=True)
 
         safe_name = clean_filename(title) + ".mp4"
-        filename = os.path.join(DOWNLOADS_DIR, safe_name)
+        # Jobs run concurrently, so keep same-titled downloads apart on disk.
+        filename = os.path.join(DOWNLOADS_DIR, f"{status_msg.id}_{safe_name}")
 
-        downloaded = False
+        # Pick the format from the probe instead of downloading a quality
+        # ladder; only re-pick if the estimate turned out too optimistic.
+        limit = MAX_DISCORD_FILESIZE
         final_size = 0
         final_quality = ""
-
-# HD -> lower quality fallback
-        quality_options = [
-            "bestvideo[height<=2160]+bestaudio/best",
-            "bestvideo[height<=1440]+bestaudio/best",
-            "bestvideo[height<=1080]+bestaudio/best",
-            "bestvideo[height<=720]+bestaudio/best",
-            "bestvideo[height<=480]+bestaudio/best",
-            "bestvideo[height<=360]+bestaudio/best",
-            "bestvideo[height<=240]+bestaudio/best",
-            "worstvideo+bestaudio/worst"
-        ]
-        for fmt in quality_options:
-            ydl_opts = {
-                "outtmpl": filename,
-                "merge_output_format": "mp4",
-                "format": "best[ext=mp4]/bestvideo[ext=mp4]+bestaudio[ext=m4a]/best",
+        downloaded = False
+        reporter = ProgressReporter(status_msg, render=render_progress)
+        try:
+            for _ in range(2):
+                pick, smallest = choose_format(info, limit)
+                if pick is None and smallest is not None:
+                    final_size = max(final_size, smallest)
+                    break
+                fmt = f"{pick['format']}/{FALLBACK_FORMAT}" if pick else FALLBACK_FORMAT
+                final_quality = pick["label"] if pick else fmt
+                # Stream-copy into mp4 when the codecs allow it; transcode only otherwise.
+                remux = bool(pick and pick["remux"])
+                processing = "Remux (stream copy)" if remux else "Transcode"
+
+                ydl_opts = {
+                    "outtmpl": filename,
+                    "merge_output_format": "mp4",
+                    "format": fmt,
                 
-                # ✅ makes sure only the single video is downloaded
-                "noplaylist": True,
+                    # ✅ makes sure only the single video is downloaded
+                    "noplaylist": True,
                 
-                "quiet": True,
-                "no_warnings": True,
-                "retries": 5,
-                "skip_unavailable_fragments": True,
-                "ignoreerrors": True,
-
-                "postprocessors": [
-                    {
-                        "key": "FFmpegVideoConvertor",
-                        "preferedformat": "mp4"
-                    }
-                ],
+                    "quiet": True,
+                    "no_warnings": True,
+                    "retries": 5,
+                    "skip_unavailable_fragments": True,
+                    "ignoreerrors": True,
+
+                    "postprocessors": [
+                        {
+                            "key": "FFmpegVideoRemuxer" if remux else "FFmpegVideoConvertor",
+                            "preferedformat": "mp4"
+                        }
+                    ],
                 
-                # ✅ make sure cookies are used
-                "cookiefile": "cookies.txt",  # ⚠️ must be Netscape TXT format, not JSON
+                    # ✅ make sure cookies are used
+                    "cookiefile": "cookies.txt",  # ⚠️ must be Netscape TXT format, not JSON
                 
-                "cachedir": False,
-                "extractor_args": {
-                    "youtube": {
-                        "player_client": ["android"],
-                    }
-                },
-                "progress_hooks": [ProgressHook(status_msg, loop).update],
-            }
+                    "cachedir": False,
+                    "extractor_args": {
+                        "youtube": {
+                            "player_client": ["android"],
+                        }
+                    },
+                    "progress_hooks": [ProgressHook(reporter).update],
+                }
 
 
-            if os.path.exists(filename):
-                os.remove(filename)
+                if os.path.exists(filename):
+                    os.remove(filename)
 
-            def download_video():
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([url])
+                def download_video():
+                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                        ydl.download([url])
 
-            await asyncio.to_thread(download_video)
+                await pool.run(download_video)
 
-            if os.path.exists(filename) and os.path.getsize(filename) > 0:
-                file_size = os.path.getsize(filename)
-                if file_size <= MAX_DISCORD_FILESIZE:
+                if not (os.path.exists(filename) and os.path.getsize(filename) > 0):
+                    break
+                final_size = os.path.getsize(filename)
+                if final_size <= MAX_DISCORD_FILESIZE:
                     downloaded = True
-                    final_size = file_size
-                    final_quality = fmt
+                    # Cache under the format actually downloaded, which the retry may have shrunk
+                    key = DownloadCache.make_key(info, pick["format"] if pick else FALLBACK_FORMAT)
                     break
-                else:
-                    final_size = file_size
-                    final_quality = fmt
+                if not pick:
+                    break
+                # Shrink the budget by how far off the estimate was and try once more.
+                limit = int(limit * pick["size"] / final_size * SIZE_HEADROOM)
+        finally:
+            # Also on cancel/raise; and before the status message is edited below
+            await reporter.close()
 
         if not downloaded:
             await status_msg.edit(embed=discord.Embed(
@@ -175,19 +544,14 @@ async def handle_download(bot, interaction_or_ctx, url: str, is_slash: bool):
             ))
             return
 
-        elapsed = time.time() - start_time
-        embed = discord.Embed(title="✅ Download Complete", color=discord.Color.green())
-        embed.add_field(name="📹 Title", value=title, inline=False)
-        embed.add_field(name="⏱️ Length", value=duration_str, inline=True)
-        embed.add_field(name="📺 Format Used", value=final_quality, inline=True)
-        embed.add_field(name="📦 Size", value=sizeof_fmt(final_size), inline=True)
-        embed.add_field(name="⏳ Time taken", value=f"{elapsed:.2f}s", inline=True)
-
-        await status_msg.edit(content=f"{Loading} Uploading to Discord...", embed=None)
-        if is_slash:
-            await interaction_or_ctx.followup.send(embed=embed, file=discord.File(filename))
-        else:
-            await interaction_or_ctx.send(embed=embed, file=discord.File(filename))
+        entry = cache.put(key, url, filename, {
+            "name": safe_name,
+            "title": title,
+            "duration_str": duration_str,
+            "quality": final_quality,
+            "processing": processing,
+        })
+        await _send_result(interaction_or_ctx, is_slash, cache, key, entry, status_msg, start_time, cached=False)
 
     except Exception as e:
         await status_msg.edit(embed=discord.Embed(
@@ -196,22 +560,27 @@ async def handle_download(bot, interaction_or_ctx, url: str, is_slash: bool):
             color=discord.Color.red()
         ))
     finally:
-        if os.path.exists(filename):
+        if filename and os.path.exists(filename):
             os.remove(filename)
 
 
 class URLDownload(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.pool = DownloadPool()
+        self.cache = DownloadCache()
+
+    def cog_unload(self):
+        self.pool.close()
 
     @app_commands.command(name="urldownload", description="Download a video from a URL (MP4 only)")
     @app_commands.describe(url="Video link")
     async def urldownload_slash(self, interaction: discord.Interaction, url: str):
-        await handle_download(self.bot, interaction, url, is_slash=True)
+        await handle_download(self.bot, interaction, url, is_slash=True, pool=self.pool, cache=self.cache)
 
     @commands.command(name="urldownload")
     async def urldownload_prefix(self, ctx: commands.Context, url: str):
-        await handle_download(self.bot, ctx, url, is_slash=False)
+        await handle_download(self.bot, ctx, url, is_slash=False, pool=self.pool, cache=self.cache)
 
 
 async def setup(bot):
@@ -1,29 +1,39 @@
 import discord
 from discord.ext import commands
 import random, json, os, asyncio
+from collections import deque
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
+import logging
 
-DATA_FILE = "/data/verifications.json"
-os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
+from utils.render import render, RenderBusy, encode_image, image_filename
+from utils.store import store
 
-# Async lock for thread-safe file writes
-save_lock = asyncio.Lock()
+logger = logging.getLogger(__name__)
 
-def load_data():
+DATA_FILE = "/data/verifications.json"
+TABLE = "verifications"  # keyed by guild id
+
+def _load_legacy():
     if os.path.exists(DATA_FILE):
         with open(DATA_FILE, "r") as f:
             return json.load(f)
     return {}
 
+def load_data():
+    return store.load(TABLE, legacy=_load_legacy)
+
 async def save_data(data):
-    async with save_lock:
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+    store.save(TABLE, data)
 
 verification_data = load_data()
 
-def generate_captcha():
+CAPTCHA_TIMEOUT = 2.5  # seconds
+CAPTCHA_POOL_SIZE = int(os.getenv("CAPTCHA_POOL_SIZE", "100"))  # pre-rendered captchas kept ready
+CAPTCHA_REFILL_RATE = float(os.getenv("CAPTCHA_REFILL_RATE", "20"))  # captchas rendered per second while refilling
+
+def draw_captcha():
+    """Draw a captcha; returns (answer, PIL image)."""
     digits = [str(random.randint(0, 9)) for _ in range(5)]
     answer = ''.join(digits)
 
@@ -76,10 +86,70 @@ def generate_captcha():
         py = random.randint(5, 20)
         img.paste(rotated, (px, py), rotated)
 
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    buffer.seek(0)
-    return answer, discord.File(buffer, filename="captcha.png")
+    return answer, img
+
+def render_captcha():
+    """Draw and encode a captcha; returns (answer, encoded image). Runs in a render worker."""
+    answer, img = draw_captcha()
+    return answer, encode_image(img, "captcha")
+
+class CaptchaPool:
+    """
+    Captchas rendered ahead of time so a verification burst costs a deque pop
+    instead of a render. Each captcha is handed out once and then dropped.
+    """
+
+    def __init__(self, size: int = CAPTCHA_POOL_SIZE, rate: float = CAPTCHA_REFILL_RATE):
+        self.size = size
+        self.rate = rate
+        self._ready: deque[tuple[str, bytes]] = deque()  # (answer, encoded image)
+        self._wanted = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refill())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _refill(self):
+        batch = max(1, render.workers)
+        while True:
+            missing = self.size - len(self._ready)
+            if missing <= 0:
+                self._wanted.clear()
+                await self._wanted.wait()
+                continue
+            n = min(missing, batch)
+            results = await asyncio.gather(*(render.run(render_captcha) for _ in range(n)), return_exceptions=True)
+            failed = [r for r in results if isinstance(r, Exception)]
+            self._ready.extend(r for r in results if not isinstance(r, Exception))
+            if failed:
+                if not isinstance(failed[0], (RenderBusy, asyncio.TimeoutError)):
+                    logger.error(f"Captcha render failed: {failed[0]}")
+                await asyncio.sleep(5)  # renderer busy or broken; back off
+            # Pace refills so a drained pool doesn't take every render worker at once
+            await asyncio.sleep(n / self.rate)
+
+    async def take(self):
+        """A fresh (answer, encoded image); rendered on demand if the pool is empty."""
+        self._wanted.set()
+        if self._ready:
+            return self._ready.popleft()
+        # Interactions must be answered within 3s, so don't wait out the default render timeout
+        return await render.run(render_captcha, timeout=CAPTCHA_TIMEOUT)
+
+
+captchas = CaptchaPool()
+
+async def generate_captcha():
+    answer, data = await captchas.take()
+    return answer, discord.File(BytesIO(data), filename=image_filename("captcha"))
+
+CAPTCHA_BUSY = "⚠️ Verification is busy right now, please try again in a moment."
 
 class CaptchaInputView(discord.ui.View):
     def __init__(self, correct_answer, role_id):
@@ -127,13 +197,19 @@ class CaptchaInputView(discord.ui.View):
         if interaction.guild.me.top_role <= role:
             return await interaction.response.edit_message(content="⚠️ I cannot assign this role due to role hierarchy.", view=None)
 
-        if self.input == self.correct_answer:
+        if self.correct_answer is not None and self.input == self.correct_answer:
+            self.correct_answer = None  # single use, even if the view is clicked again
+            self.stop()
             await interaction.user.add_roles(role)
             return await interaction.response.edit_message(content="✅ Verified!", view=None)
 
         self.attempts -= 1
         if self.attempts > 0:
-            answer, file = generate_captcha()
+            try:
+                answer, file = await generate_captcha()
+            except (RenderBusy, asyncio.TimeoutError):
+                self.stop()
+                return await interaction.response.edit_message(content=CAPTCHA_BUSY, view=None)
             self.correct_answer = answer
             self.input = ""
             return await interaction.response.edit_message(
@@ -159,9 +235,12 @@ class VerificationButton(discord.ui.View):
         if role in interaction.user.roles:
             return await interaction.response.send_message("✅ You are already verified!", ephemeral=True)
 
-        answer, file = generate_captcha()
+        try:
+            answer, file = await generate_captcha()
+        except (RenderBusy, asyncio.TimeoutError):
+            return await interaction.response.send_message(CAPTCHA_BUSY, ephemeral=True)
         embed = discord.Embed(title="Write colored the number code in the image!")
-        embed.set_image(url="attachment://captcha.png")
+        embed.set_image(url=f"attachment://{file.filename}")
         await interaction.response.send_message(
             embed=embed,
             file=file,
@@ -173,6 +252,12 @@ class Verification(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        captchas.start()
+
+    async def cog_unload(self):
+        captchas.stop()
+
     @commands.command(name="verification", aliases=["verif", "ver", "verify"])
     @commands.has_permissions(administrator=True)
     async def verification(self, ctx, channel: discord.TextChannel = None, role: discord.Role = None):
@@ -208,7 +293,7 @@ class Verification(commands.Cog):
     async def on_ready(self):
         for guild_id, data in verification_data.items():
             self.bot.add_view(VerificationButton(data["role_id"]))
-        print("[Verification] Persistent views restored.")
+        logger.info("Persistent views restored.")
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
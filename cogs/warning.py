@@ -5,22 +5,29 @@ import json, os, asyncio
 from datetime import datetime, timedelta
 from typing import Optional
 
-import os, json
+from utils.cache import get_member
+from utils.shards import owns_guild
+from utils.store import store
 
 DATA_FILE = "/data/warns.json"  # Railway persistent volume
+SECTIONS = ("warnings", "punishments", "timeouts")
 
-def load_data():
+def _load_legacy(section):
     if not os.path.exists(DATA_FILE):
-        os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-        with open(DATA_FILE, "w") as f:
-            json.dump({"warnings": {}, "punishments": {}, "timeouts": {}}, f)
+        return {}
     with open(DATA_FILE, "r") as f:
-        return json.load(f)
+        return json.load(f).get(section, {})
+
+def load_data():
+    return {
+        section: store.load(f"warns.{section}", legacy=lambda section=section: _load_legacy(section))
+        for section in SECTIONS
+    }
 
 def save_data(data):
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    # Only rows changed by this process are written, so clusters don't clobber each other
+    for section in SECTIONS:
+        store.save(f"warns.{section}", data[section])
 
 data = load_data()
 
@@ -310,6 +317,7 @@ class Warnings(commands.Cog):
     async def check_timeouts(self):
         now = datetime.utcnow()
         expired = []
+        store.pull("warns.timeouts", data["timeouts"])
 
         for user_id, info in list(data["timeouts"].items()):
             try:
@@ -319,10 +327,12 @@ class Warnings(commands.Cog):
                     # Invalid entry, remove it
                     expired.append(user_id)
                     continue
+                if not owns_guild(self.bot, int(guild_id)):
+                    continue  # another cluster runs this guild's shard
 
                 until = datetime.fromisoformat(until_str)
                 guild = self.bot.get_guild(int(guild_id))
-                member = guild.get_member(int(user_id)) if guild else None
+                member = await get_member(guild, int(user_id)) if guild else None
 
                 # Resume timeout if missing (bot restarted)
                 if member and not member.is_timed_out() and until > now:
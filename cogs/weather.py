@@ -1,9 +1,10 @@
 import discord
 from discord.ext import commands
-import aiohttp
 import os
 from datetime import datetime
 
+from utils.http import http
+
 API_KEY = os.getenv("WEATHER")
 
 WEATHER_EMOJIS = {
@@ -36,12 +37,11 @@ class Weather(commands.Cog):
     async def fetch_weather(self, city: str):
         """Fetch weather data from OpenWeatherMap."""
         url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units=metric&lang=en"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                data = await resp.json()
-                if resp.status != 200:
-                    return None, data.get("message", "Unknown error")
-                return data, None
+        async with http.session.get(url) as resp:
+            data = await resp.json()
+            if resp.status != 200:
+                return None, data.get("message", "Unknown error")
+            return data, None
 
     @commands.command(name="weather")
     async def weather(self, ctx, *, city: str):
@@ -5,13 +5,16 @@ import json
 import os
 import re
 
+from utils.store import store
+
 CONFIG_FILE = "/data/welcome_config.json"
+TABLE = "welcome_config"  # keyed by guild id
 IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
 QUESTION_COLOR = 0xFFB700
 ERROR_COLOR = 0xFF0000
 SUCCESS_COLOR = 0x00FF00
 
-def load_config():
+def _load_legacy():
     if not os.path.exists(CONFIG_FILE):
         return {}
     try:
@@ -20,9 +23,11 @@ def load_config():
     except (json.JSONDecodeError, ValueError):
         return {}
 
+def load_config():
+    return store.load(TABLE, legacy=_load_legacy)
+
 def save_config(data):
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    store.save(TABLE, data)
 
 def format_placeholders(template: str, member: discord.Member):
     if not template:
@@ -31,12 +36,13 @@ def format_placeholders(template: str, member: discord.Member):
         template.replace("{mention}", member.mention)
                 .replace("{user}", str(member))
                 .replace("{server}", member.guild.name)
-                .replace("{count}", str(len(member.guild.members)))
+                .replace("{count}", str(member.guild.member_count))
     )
 
 class WelcomeLeave(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.config = load_config()  # loaded once instead of on every join/leave
 
     # ======================
     # EVENTS
@@ -50,7 +56,7 @@ class WelcomeLeave(commands.Cog):
         await self.handle_event(member, "leave")
 
     async def handle_event(self, member: discord.Member, event_type: str):
-        cfg = load_config()
+        cfg = self.config
         gid = str(member.guild.id)
         settings = cfg.get(gid, {}).get(event_type)
         if not settings:
@@ -118,7 +124,7 @@ class WelcomeLeave(commands.Cog):
     @commands.command(name="joinremove")
     @commands.has_permissions(manage_messages=True)
     async def join_remove_prefix(self, ctx):
-        cfg = load_config()
+        cfg = self.config
         gid = str(ctx.guild.id)
         if cfg.get(gid, {}).pop("join", None) is not None:
             save_config(cfg)
@@ -129,7 +135,7 @@ class WelcomeLeave(commands.Cog):
     @commands.command(name="leaveremove")
     @commands.has_permissions(manage_messages=True)
     async def leave_remove_prefix(self, ctx):
-        cfg = load_config()
+        cfg = self.config
         gid = str(ctx.guild.id)
         if cfg.get(gid, {}).pop("leave", None) is not None:
             save_config(cfg)
@@ -155,7 +161,7 @@ class WelcomeLeave(commands.Cog):
     @app_commands.command(name="joinremove", description="Remove join message config")
     @discord.app_commands.default_permissions(manage_messages=True)
     async def join_remove_slash(self, interaction: discord.Interaction):
-        cfg = load_config()
+        cfg = self.config
         gid = str(interaction.guild.id)
         if cfg.get(gid, {}).pop("join", None) is not None:
             save_config(cfg)
@@ -166,7 +172,7 @@ class WelcomeLeave(commands.Cog):
     @app_commands.command(name="leaveremove", description="Remove leave message config")
     @discord.app_commands.default_permissions(manage_messages=True)
     async def leave_remove_slash(self, interaction: discord.Interaction):
-        cfg = load_config()
+        cfg = self.config
         gid = str(interaction.guild.id)
         if cfg.get(gid, {}).pop("leave", None) is not None:
             save_config(cfg)
@@ -296,7 +302,7 @@ class WelcomeLeave(commands.Cog):
                 index += 1
 
             # Save configuration
-            cfg = load_config()
+            cfg = self.config
             gid = str(guild.id)
             cfg.setdefault(gid, {})
             cfg[gid][event_type] = data
@@ -9,13 +9,32 @@ class Config:
     # Command prefix
     PREFIX = "$"
     
+    # Sharding: unset = single connection (commands.Bot), "auto" = AutoShardedBot
+    # with Discord's recommended count, a number = AutoShardedBot with that many shards
+    SHARD_COUNT = os.getenv("SHARD_COUNT")
+
+    # Clustering: CLUSTERS=N (or `python main.py --clusters N`) runs N bot processes,
+    # each an AutoShardedBot over a contiguous shard range, under a coordinator that
+    # sets CLUSTER_ID and SHARD_IDS for each of them.
+    CLUSTERS = int(os.getenv("CLUSTERS", "0"))
+    CLUSTER_ID = os.getenv("CLUSTER_ID")
+    SHARD_IDS = os.getenv("SHARD_IDS")
+
+    # Gateway cache: "full" (presences, every member chunked at startup), "lean" (no
+    # presences, members chunked on demand) or "minimal" (no member cache beyond voice).
+    # See utils/cache.py
+    CACHE_PROFILE = os.getenv("CACHE_PROFILE", "full")
+
     # Bot settings
     MAX_MESSAGE_DELETE = 1000  # Maximum messages to delete at once
     DEFAULT_MUTE_DURATION = 3600  # Default mute duration in seconds (1 hour)
     
-    # Logging settings
-    LOG_LEVEL = "INFO"
-    LOG_FILE = "bot.log"
+    # Logging settings (LOG_LEVELS sets per-module levels, e.g. "cogs.music=DEBUG,discord=INFO")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+    LOG_FILE = os.getenv("LOG_FILE", "bot.log")  # JSON lines, rotated by size
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+    LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "5"))
     
     # Colors for embeds
     COLORS = {
@@ -1,69 +1,138 @@
 import discord
 from discord.ext import commands
+import argparse
 import asyncio
 import logging
+import sys
+import time
 from config import Config
 from utils.logging_config import setup_logging
+from utils.http import http
+from utils.render import render
+from utils.startup import StartupProfiler, load_extensions, warm_lazy_imports
+from utils.shards import ShardStats
+from utils.cluster import ClusterClient, Coordinator, recommended_shards, shard_ranges
+from utils.store import store
+from utils.cache import cache_profile, client_options
+from utils.metrics import METRICS_PORT, metrics
+from utils.lifecycle import lifecycle
+from utils.watchdog import watchdog
 
 ASS_EMOJI = "<:Assistant:1421595232893669488>"
 
-# Setup logging
-setup_logging()
+EXTENSIONS = [
+    "cogs.weather",
+    "cogs.autorole",
+    "cogs.verification",
+    "cogs.fix",
+    "cogs.skibidibattle",
+    "cogs.warning",
+    "cogs.moderation",
+    "cogs.general",
+    "cogs.serverinfo",
+    "cogs.reactionrole",
+    "cogs.snipeeditsnipe",
+    "cogs.music",
+    "cogs.logging",
+    "cogs.url_download",
+    "cogs.deathbattle",
+    "cogs.roleall",
+    "cogs.family",
+    "cogs.remindme",
+    "cogs.welcome",
+    "cogs.report",
+    "cogs.help",
+    "cogs.calculator",
+    "cogs.cluster",
+    "cogs.diagnostics",
+    "messagelogger",
+    "invite",
+    "xoxo",
+]
+
 logger = logging.getLogger(__name__)
 
-class ModBot(commands.Bot):
+def _shard_options() -> dict:
+    if Config.SHARD_IDS:
+        # A cluster process: this range out of the coordinator's total
+        return {
+            "shard_ids": [int(i) for i in Config.SHARD_IDS.split(",")],
+            "shard_count": int(Config.SHARD_COUNT),
+        }
+    if not Config.SHARD_COUNT:
+        return {}
+    if Config.SHARD_COUNT == "auto":
+        return {"shard_count": None}
+    return {"shard_count": int(Config.SHARD_COUNT)}
+
+
+# One gateway connection by default; AutoShardedBot when SHARD_COUNT is set
+BotBase = commands.AutoShardedBot if Config.SHARD_COUNT else commands.Bot
+
+
+class ModBot(BotBase):
     def __init__(self):
         intents = discord.Intents.default()
         intents.message_content = True
         intents.guilds = True
         intents.members = True
         intents.moderation = True
-        intents.presences = True
 
         super().__init__(
             command_prefix=Config.PREFIX,
-            intents=intents,
             help_command=None,
-            case_insensitive=True
+            case_insensitive=True,
+            **client_options(cache_profile(Config.CACHE_PROFILE), intents),  # presences, member/message cache
+            http_trace=metrics.trace_config(),
+            **_shard_options()
         )
 
+        self.profiler = StartupProfiler()
+        self.shard_stats = ShardStats(self)
+        self.cluster = ClusterClient(int(Config.CLUSTER_ID)) if Config.CLUSTER_ID else None
+        self._ready_logged = False
+
     async def setup_hook(self):
         """Called when the bot is starting up"""
         logger.info("Setting up bot...")
-
-        # Load all cogs
-        await self.load_extension("cogs.weather")
-        await self.load_extension("cogs.autorole")
-        await self.load_extension("cogs.verification")
-        await self.load_extension("cogs.fix")
-        await self.load_extension("cogs.skibidibattle")
-        await self.load_extension("cogs.warning")
-        await self.load_extension("cogs.moderation")
-        await self.load_extension("cogs.general")
-        await self.load_extension("cogs.serverinfo")
-        await self.load_extension("cogs.reactionrole")
-        await self.load_extension("cogs.snipeeditsnipe")
-        await self.load_extension("cogs.music")
-        await self.load_extension("cogs.logging")
-        await self.load_extension("cogs.url_download")
-        await self.load_extension("cogs.deathbattle")
-        await self.load_extension("cogs.roleall")
-        await self.load_extension("cogs.family")
-        await self.load_extension("cogs.remindme")
-        await self.load_extension("cogs.welcome")
-        await self.load_extension("cogs.report")
-        await self.load_extension("cogs.help")
-        await self.load_extension("cogs.calculator")
-
+        self.shard_stats.install()
+        watchdog.start()
+        metrics.install(self)
+        lifecycle.install(self)  # SIGTERM: refuse new commands, drain, flush, close
+        if METRICS_PORT:
+            await metrics.serve(port=METRICS_PORT + int(Config.CLUSTER_ID or 0))
+        if self.cluster:
+            await self.cluster.connect()
+
+        # Load all cogs (concurrently; a per-cog timing table is logged)
+        await load_extensions(self, EXTENSIONS, self.profiler)
 
         logger.info("✅ Loaded cogs (slash commands will now auto-sync)")
 
 
 
+    async def close(self):
+        self.shard_stats.close()
+        metrics.close()
+        watchdog.close()
+        await super().close()
+        if self.cluster:
+            await self.cluster.close()
+        await http.close()
+        render.close()
+        store.close()
+
     async def on_ready(self):
+        if not self._ready_logged:
+            self._ready_logged = True
+            logger.info(f"⏱️ Time to ready: {time.perf_counter() - self.profiler.started:.1f}s")
+            # Deferred heavy imports (yt-dlp, googletrans, ...) load off the loop now
+            asyncio.create_task(asyncio.to_thread(warm_lazy_imports))
         logger.info(f"✅ Bot is ready! Logged in as {self.user}")
         logger.info(f"🆔 Bot ID: {self.user.id}")
         logger.info(f"📊 Serving {len(self.guilds)} guilds")
+        for line in self.shard_stats.summary().splitlines():
+            logger.info(f"🔀 {line}")
 
         await self.change_presence(
             activity=discord.CustomActivity(name=f"🤩 Use {Config.PREFIX}help | Moderation And Fun Bot :p"),
@@ -89,6 +158,12 @@ class ModBot(commands.Bot):
                     ephemeral=True
                 )
 
+    async def on_shard_ready(self, shard_id):
+        logger.info(f"🔀 Shard {shard_id} ready")
+
+    async def on_shard_resumed(self, shard_id):
+        logger.info(f"🔀 Shard {shard_id} resumed")
+
     async def on_guild_join(self, guild):
         logger.info(f"📥 Joined guild: {guild.name} ({guild.id})")
 
@@ -99,28 +174,46 @@ class ModBot(commands.Bot):
 # ----------------------------
 # Run the bot
 # ----------------------------
-bot = ModBot()
-
+# Nothing below runs on import: render workers (forkserver) re-import this
+# file as __mp_main__, and must not set up logging or build a bot.
 async def main():
     """Main function to run the bot"""
-    # Load extra cogs
-    await bot.load_extension("messagelogger")
-    await bot.load_extension("invite")
-    await bot.load_extension("xoxo")
-
     if not Config.BOT_TOKEN:
         logger.error("❌ BOT_TOKEN is not set in config!")
         return
 
+    bot = ModBot()
     try:
         await bot.start(Config.BOT_TOKEN)
     except discord.LoginFailure:
         logger.error("❌ Invalid bot token provided!")
     except Exception as e:
         logger.error(f"❌ Error starting bot: {e}")
+    # bot.start returns once the gateway closes; let a SIGTERM shutdown finish flushing
+    await lifecycle.finished()
+
+async def coordinate(clusters: int):
+    """Run ``clusters`` bot processes over the shard ranges (see utils/cluster.py)"""
+    if not Config.BOT_TOKEN:
+        logger.error("❌ BOT_TOKEN is not set in config!")
+        return
+
+    if Config.SHARD_COUNT and Config.SHARD_COUNT != "auto":
+        shard_count = int(Config.SHARD_COUNT)
+    else:
+        shard_count = await recommended_shards(Config.BOT_TOKEN)
+    await Coordinator(shard_ranges(shard_count, clusters), shard_count, [sys.argv[0]]).run()
 
 if __name__ == "__main__":
+    setup_logging(log_file=True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clusters", type=int, default=Config.CLUSTERS, help="bot processes to split the shards over")
+    args = parser.parse_args()
+
     try:
-        asyncio.run(main())
+        if args.clusters > 1 and not Config.CLUSTER_ID:
+            asyncio.run(coordinate(args.clusters))
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("🛑 Bot stopped by user")
@@ -4,51 +4,55 @@ from discord import app_commands
 from datetime import datetime
 import json
 import os
+import logging
+
+from utils.store import store
+
+logger = logging.getLogger(__name__)
 
 # Use Railway's persistent volume (make sure you mounted /data in Railway)
 CONFIG_FILE = "/data/log_channels.json"
+TABLE = "log_channels"  # keyed by guild id
 
 class MessageLogger(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.log_channels = self.load_config()
-        print("[DEBUG] Cog initialized. Loaded log_channels:", self.log_channels)
+        logger.debug("Cog initialized. Loaded log_channels: %s", self.log_channels)
 
     def load_config(self):
-        """Load log channel configuration from JSON"""
+        """Load log channel configuration, importing the old JSON file on first run"""
+        data = store.load(TABLE, legacy=self._load_legacy)
+        logger.debug("Loaded config from store: %s", data)
+        return data
+
+    def _load_legacy(self):
         if os.path.exists(CONFIG_FILE):
             try:
                 with open(CONFIG_FILE, "r") as f:
-                    data = json.load(f)
-                    print(f"[DEBUG] Loaded config from {CONFIG_FILE}: {data}")
-                    return data
+                    return json.load(f)
             except json.JSONDecodeError as e:
-                print("[ERROR] JSON decode error:", e)
-                return {}
-        else:
-            print(f"[DEBUG] No config file found at {CONFIG_FILE}. Starting fresh.")
+                logger.error(f"JSON decode error: {e}")
         return {}
 
     def save_config(self):
-        """Save log channel configuration to JSON"""
+        """Save changed log channels to the shared store"""
         try:
-            os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(self.log_channels, f, indent=4)
-            print(f"[DEBUG] Saved config to {CONFIG_FILE}: {self.log_channels}")
+            store.save(TABLE, self.log_channels)
+            logger.debug("Saving config to store: %s", self.log_channels)
         except Exception as e:
-            print("[ERROR] Failed to save config:", e)
+            logger.error(f"Failed to save config: {e}")
 
     def set_log_channel(self, guild_id: str, channel_id: int):
         """Insert or update a guild's log channel"""
-        print(f"[DEBUG] Setting log channel for guild {guild_id} -> {channel_id}")
+        logger.debug("Setting log channel for guild %s -> %s", guild_id, channel_id)
         self.log_channels[guild_id] = channel_id
         self.save_config()
 
     def get_log_channel(self, guild_id: str):
         """Fetch the log channel for a guild"""
         channel_id = self.log_channels.get(guild_id)
-        print(f"[DEBUG] Fetch log channel for guild {guild_id}: {channel_id}")
+        logger.debug("Fetch log channel for guild %s: %s", guild_id, channel_id)
         return channel_id
 
     # Admin command to set the log channel
@@ -60,7 +64,7 @@ class MessageLogger(commands.Cog):
             f"✅ Say command logs will now be sent to {channel.mention}",
             ephemeral=True
         )
-        print(f"[DEBUG] /saylogs called in guild {interaction.guild.id}, set to {channel.id}")
+        logger.debug("/saylogs called in guild %s, set to %s", interaction.guild.id, channel.id)
 
     # OPTIONAL: Check which log channel is currently set
     @app_commands.command(name="saychecklogs", description="Check which channel is set for say command logs")
@@ -75,19 +79,19 @@ class MessageLogger(commands.Cog):
             )
         else:
             await interaction.response.send_message("⚠️ No log channel set.", ephemeral=True)
-        print(f"[DEBUG] /checklogs called in guild {interaction.guild.id}, result: {log_channel_id}")
+        logger.debug("/checklogs called in guild %s, result: %s", interaction.guild.id, log_channel_id)
 
     # Internal helper
     async def log_say(self, author: discord.Member, message: str, channel: discord.TextChannel, bot_message: discord.Message = None):
         guild_id = str(channel.guild.id)
         log_channel_id = self.get_log_channel(guild_id)
         if not log_channel_id:
-            print(f"[DEBUG] No log channel set for guild {guild_id}, skipping log_say.")
+            logger.debug("No log channel set for guild %s, skipping log_say.", guild_id)
             return
 
         log_channel = channel.guild.get_channel(log_channel_id)
         if log_channel is None:
-            print(f"[DEBUG] Config has {log_channel_id} but channel not found in guild {guild_id}.")
+            logger.debug("Config has %s but channel not found in guild %s.", log_channel_id, guild_id)
             return
 
         embed = discord.Embed(
@@ -105,7 +109,7 @@ class MessageLogger(commands.Cog):
 
         embed.set_thumbnail(url=author.display_avatar.url)
         await log_channel.send(embed=embed)
-        print(f"[DEBUG] Logged say command from {author} in guild {guild_id} to channel {log_channel_id}")
+        logger.debug("Logged say command from %s in guild %s to channel %s", author, guild_id, log_channel_id)
 
     # Hook into prefix "say" command
     @commands.Cog.listener()
@@ -118,7 +122,7 @@ class MessageLogger(commands.Cog):
                         bot_message = msg
                         break
             except Exception as e:
-                print("[ERROR] Failed fetching bot message in on_command_completion:", e)
+                logger.error(f"Failed fetching bot message in on_command_completion: {e}")
 
             await self.log_say(
                 ctx.author,
@@ -139,7 +143,7 @@ class MessageLogger(commands.Cog):
                         bot_message = msg
                         break
             except Exception as e:
-                print("[ERROR] Failed fetching bot message in on_app_command_completion:", e)
+                logger.error(f"Failed fetching bot message in on_app_command_completion: {e}")
 
             await self.log_say(interaction.user, message, interaction.channel, bot_message)
 
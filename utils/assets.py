@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+from collections import OrderedDict
+from functools import lru_cache
+
+from PIL import Image, ImageFont
+
+from utils.http import http
+
+logger = logging.getLogger(__name__)
+
+ASSET_DIR = "/data/assets"  # pre-resized copies survive restarts
+MAX_ASSETS = 256  # decoded images kept in memory (LRU)
+MAX_AVATARS = 512
+
+REG_FONTS = (
+    "DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
+    "arial.ttf",
+    "NotoSans-Regular.ttf",
+)
+BOLD_FONTS = (
+    "DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
+    "arialbd.ttf",
+    "NotoSans-Bold.ttf",
+)
+
+
+@lru_cache(maxsize=64)
+def load_font(candidates: tuple, size: int):
+    """First TrueType font from ``candidates`` at ``size``, or None. Cached per (candidates, size)."""
+    for path in candidates:
+        try:
+            return ImageFont.truetype(path, size)
+        except Exception:
+            continue
+    return None
+
+
+def _resize(img: Image.Image, size, height) -> Image.Image:
+    if size:
+        return img.resize(size)
+    if height:
+        return img.resize((int(img.width * (height / img.height)), height))
+    return img
+
+
+class _ImageLRU:
+    """In-memory LRU of decoded images with one in-flight load per key."""
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._images: OrderedDict[tuple, Image.Image] = OrderedDict()
+        self._locks: dict[tuple, asyncio.Lock] = {}
+
+    async def _get_or_load(self, key: tuple, load) -> Image.Image:
+        img = self._images.get(key)
+        if img is None:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                img = self._images.get(key)
+                if img is None:
+                    img = await load()
+                    self._images[key] = img
+                    while len(self._images) > self.max_items:
+                        self._images.popitem(last=False)
+            self._locks.pop(key, None)
+        elif key in self._images:
+            self._images.move_to_end(key)
+        return img
+
+
+class AssetCache(_ImageLRU):
+    """
+    Static images (backgrounds, character art) fetched once and kept decoded
+    and pre-resized in memory, with a PNG copy on disk.
+
+    Returned images are shared: ``.copy()`` them before drawing on them.
+    """
+
+    def __init__(self, disk_dir: str | None = ASSET_DIR, max_items: int = MAX_ASSETS):
+        super().__init__(max_items)
+        self.disk_dir = disk_dir
+
+    def _disk_path(self, key: tuple) -> str | None:
+        if not self.disk_dir:
+            return None
+        return os.path.join(self.disk_dir, hashlib.sha1(repr(key).encode()).hexdigest() + ".png")
+
+    def _load_disk(self, key: tuple) -> Image.Image | None:
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as img:
+                return img.convert("RGBA")
+        except OSError:
+            return None
+
+    def _decode(self, key: tuple, data: bytes, size, height) -> Image.Image:
+        img = _resize(Image.open(io.BytesIO(data)).convert("RGBA"), size, height)
+        path = self._disk_path(key)
+        if path:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                img.save(path, format="PNG")
+            except OSError:
+                pass
+        return img
+
+    async def image(self, url: str, *, size: tuple[int, int] | None = None, height: int | None = None) -> Image.Image:
+        """Decoded RGBA image for ``url``, resized to ``size`` or scaled to ``height``."""
+        key = (url, size, height)
+
+        async def load():
+            img = await asyncio.to_thread(self._load_disk, key)
+            if img is None:
+                data = await http.get_bytes(url)
+                img = await asyncio.to_thread(self._decode, key, data, size, height)
+            return img
+
+        return await self._get_or_load(key, load)
+
+    async def preload(self, *requests: tuple):
+        """Warm the cache with ``(url, {"size": ..} | {"height": ..})`` pairs; failures are ignored."""
+        results = await asyncio.gather(
+            *(self.image(url, **opts) for url, opts in requests), return_exceptions=True
+        )
+        for (url, _), result in zip(requests, results):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Failed to preload asset {url}: {result}")
+
+
+def _cdn_size(px: int) -> int:
+    """Smallest size the Discord CDN serves (power of two, 16..4096) that covers ``px``."""
+    return min(4096, max(16, 1 << (px - 1).bit_length()))
+
+
+class AvatarCache(_ImageLRU):
+    """
+    Avatars keyed by avatar hash and pixel size. Only the CDN resolution
+    needed is downloaded; a new avatar has a new hash, so entries never go stale.
+    """
+
+    def __init__(self, max_items: int = MAX_AVATARS):
+        super().__init__(max_items)
+
+    async def get(self, user, size: int) -> Image.Image:
+        """``user``'s avatar as a ``size`` x ``size`` RGBA image (shared; don't draw on it)."""
+        avatar = user.display_avatar
+        key = (avatar.key, size)
+
+        async def load():
+            url = avatar.with_static_format("png").with_size(_cdn_size(size)).url
+            data = await http.get_bytes(url)
+            return await asyncio.to_thread(
+                lambda: Image.open(io.BytesIO(data)).convert("RGBA").resize((size, size))
+            )
+
+        return await self._get_or_load(key, load)
+
+    async def pair(self, user1, user2, size: int) -> tuple[Image.Image, Image.Image]:
+        """Both avatars, fetched concurrently."""
+        return await asyncio.gather(self.get(user1, size), self.get(user2, size))
+
+
+assets = AssetCache()
+avatars = AvatarCache()
@@ -0,0 +1,74 @@
+import asyncio
+import os
+
+import discord
+
+# What the gateway cache keeps. Pick with CACHE_PROFILE; MAX_MESSAGES overrides the
+# profile's message cache (edit/delete logs only see cached messages).
+#   presences         receive PRESENCE_UPDATE (only userinfo shows status/activity)
+#   member_cache      all = every member seen (chunked at startup); joined = members
+#                     who join while the bot runs; none = only voice-connected members
+#   chunk_at_startup  download every guild's member list on connect
+#   max_messages      messages kept for on_message_edit/on_message_delete
+CACHE_PROFILES = {
+    "full": {"presences": True, "member_cache": "all", "chunk_at_startup": True, "max_messages": 1000},
+    "lean": {"presences": False, "member_cache": "joined", "chunk_at_startup": False, "max_messages": 1000},
+    "minimal": {"presences": False, "member_cache": "none", "chunk_at_startup": False, "max_messages": 200},
+}
+
+_chunking: dict[int, asyncio.Task] = {}
+
+
+def cache_profile(name: str) -> dict:
+    """Profile ``name`` with any MAX_MESSAGES override applied."""
+    try:
+        profile = dict(CACHE_PROFILES[name])
+    except KeyError:
+        raise ValueError(f"Unknown CACHE_PROFILE {name!r} (choose from {', '.join(CACHE_PROFILES)})")
+    if os.getenv("MAX_MESSAGES"):
+        profile["max_messages"] = int(os.getenv("MAX_MESSAGES"))
+    return profile
+
+
+def client_options(profile: dict, intents: discord.Intents) -> dict:
+    """Client keyword arguments for ``profile``; sets ``intents.presences`` to match."""
+    intents.presences = profile["presences"]
+    if profile["member_cache"] == "all":
+        flags = discord.MemberCacheFlags.from_intents(intents)
+    else:
+        flags = discord.MemberCacheFlags.none()
+        flags.voice = True  # music looks up who is in the voice channel
+        flags.joined = profile["member_cache"] == "joined"
+    return {
+        "intents": intents,
+        "member_cache_flags": flags,
+        "chunk_guilds_at_startup": profile["chunk_at_startup"],
+        "max_messages": profile["max_messages"],
+    }
+
+
+async def guild_members(guild: discord.Guild) -> list[discord.Member]:
+    """
+    Every member of ``guild``. Unchunked guilds are chunked on demand; the
+    members are kept only if the profile caches joined members (after which
+    the guild counts as chunked). Concurrent callers share one request.
+    """
+    if guild.chunked:
+        return list(guild.members)
+    task = _chunking.get(guild.id)
+    if task is None:
+        task = asyncio.create_task(guild.chunk(cache=False))
+        _chunking[guild.id] = task
+        task.add_done_callback(lambda _: _chunking.pop(guild.id, None))
+    return await asyncio.shield(task)
+
+
+async def get_member(guild: discord.Guild, user_id: int) -> discord.Member | None:
+    """``guild``'s member ``user_id`` from the cache, else fetched over REST; None if gone."""
+    member = guild.get_member(user_id)
+    if member is None:
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.HTTPException:
+            return None
+    return member
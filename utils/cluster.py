@@ -0,0 +1,264 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import signal
+import sys
+import time
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_SOCKET = os.getenv("CLUSTER_SOCKET", "/tmp/modbot-cluster.sock")
+CALL_TIMEOUT = 5  # seconds to wait for each cluster's reply to a broadcast
+RESTART_BACKOFF = (1, 5, 15, 60)  # seconds before restarting a crashed cluster, by consecutive failures
+STABLE_AFTER = 300  # a cluster that ran this long resets its failure count
+
+
+def shard_ranges(shard_count: int, clusters: int) -> list[list[int]]:
+    """Split shard ids 0..shard_count-1 into ``clusters`` contiguous, near-equal ranges."""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for i in range(clusters):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+async def recommended_shards(token: str) -> int:
+    """Discord's recommended shard count for this bot (GET /gateway/bot)."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            "https://discord.com/api/v10/gateway/bot", headers={"Authorization": f"Bot {token}"}
+        ) as resp:
+            if resp.status != 200:
+                raise Exception(f"GET /gateway/bot returned {resp.status}")
+            return (await resp.json())["shards"]
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+class Coordinator:
+    """
+    Parent process of a clustered bot. Runs one ``main.py`` process per shard
+    range (CLUSTER_ID / SHARD_IDS / SHARD_COUNT in its environment), restarts
+    clusters that exit with backoff, and relays commands between them over a
+    Unix socket of JSON lines.
+
+    Cluster requests: ``broadcast`` (call a named handler on every cluster and
+    collect the results), ``status`` (process state per cluster) and
+    ``restart`` (terminate one cluster; it is started again).
+    """
+
+    def __init__(self, ranges: list[list[int]], shard_count: int, argv: list[str]):
+        self.ranges = ranges
+        self.shard_count = shard_count
+        self.argv = argv
+        self.procs: dict[int, asyncio.subprocess.Process] = {}
+        self.started: dict[int, float] = {}
+        self.restarts: dict[int, int] = {i: 0 for i in range(len(ranges))}
+        self.writers: dict[int, asyncio.StreamWriter] = {}
+        self._calls: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._stopping = False
+
+    async def run(self):
+        if os.path.exists(CLUSTER_SOCKET):
+            os.unlink(CLUSTER_SOCKET)
+        server = await asyncio.start_unix_server(self._serve, CLUSTER_SOCKET)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+        logger.info(f"🧩 Starting {len(self.ranges)} clusters for {self.shard_count} shards")
+        async with server:
+            await asyncio.gather(*(self._supervise(cid) for cid in range(len(self.ranges))))
+
+    def stop(self):
+        self._stopping = True
+        for proc in self.procs.values():
+            if proc.returncode is None:
+                proc.terminate()
+
+    async def _supervise(self, cid: int):
+        failures = 0
+        while not self._stopping:
+            env = {
+                **os.environ,
+                "CLUSTER_ID": str(cid),
+                "SHARD_IDS": ",".join(map(str, self.ranges[cid])),
+                "SHARD_COUNT": str(self.shard_count),
+            }
+            self.started[cid] = time.monotonic()
+            proc = await asyncio.create_subprocess_exec(sys.executable, *self.argv, env=env)
+            self.procs[cid] = proc
+            logger.info(f"🧩 Cluster {cid} (shards {self.ranges[cid][0]}-{self.ranges[cid][-1]}) started, pid {proc.pid}")
+            code = await proc.wait()
+            self.writers.pop(cid, None)
+            if self._stopping:
+                break
+            failures = 0 if time.monotonic() - self.started[cid] > STABLE_AFTER else failures + 1
+            delay = RESTART_BACKOFF[min(failures, len(RESTART_BACKOFF) - 1)]
+            self.restarts[cid] += 1
+            logger.warning(f"⚠️ Cluster {cid} exited with code {code}; restarting in {delay}s")
+            await asyncio.sleep(delay)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        cid = None
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                op = message.get("op")
+                if op == "hello":
+                    cid = message["cluster"]
+                    self.writers[cid] = writer
+                elif op == "reply":
+                    future = self._calls.get(message["id"])
+                    if future and not future.done():
+                        future.set_result(message.get("result"))
+                elif op == "request":
+                    asyncio.create_task(self._answer(writer, message))
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Cluster {cid} connection error: {e}")
+        finally:
+            if cid is not None and self.writers.get(cid) is writer:
+                del self.writers[cid]
+            writer.close()
+
+    async def _answer(self, writer: asyncio.StreamWriter, message: dict):
+        try:
+            result = await self._handle(message)
+            reply = {"op": "response", "id": message["id"], "result": result}
+        except Exception as e:
+            reply = {"op": "response", "id": message["id"], "error": str(e)}
+        try:
+            await _send(writer, reply)
+        except ConnectionError:
+            pass
+
+    async def _handle(self, message: dict):
+        cmd = message.get("cmd")
+        if cmd == "broadcast":
+            return await self.broadcast(message["name"], message.get("args") or {})
+        if cmd == "status":
+            return self.status()
+        if cmd == "restart":
+            cid = int(message["cluster"])
+            proc = self.procs.get(cid)
+            if proc is None:
+                raise Exception(f"No cluster {cid}")
+            if proc.returncode is None:
+                proc.terminate()
+            return True
+        raise Exception(f"Unknown cluster command {cmd!r}")
+
+    async def _call(self, cid: int, writer: asyncio.StreamWriter, name: str, args: dict):
+        call_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._calls[call_id] = future
+        try:
+            await _send(writer, {"op": "call", "id": call_id, "name": name, "args": args})
+            return await asyncio.wait_for(future, CALL_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError):
+            return {"cluster": cid, "error": "no reply"}
+        finally:
+            self._calls.pop(call_id, None)
+
+    async def broadcast(self, name: str, args: dict) -> list:
+        """Call handler ``name`` on every connected cluster; results ordered by cluster id."""
+        writers = sorted(self.writers.items())
+        return list(await asyncio.gather(*(self._call(cid, w, name, args) for cid, w in writers)))
+
+    def status(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "cluster": cid,
+                "shards": [shards[0], shards[-1]],
+                "pid": self.procs[cid].pid if cid in self.procs else None,
+                "running": cid in self.procs and self.procs[cid].returncode is None,
+                "connected": cid in self.writers,
+                "uptime": now - self.started[cid] if cid in self.started else 0,
+                "restarts": self.restarts[cid],
+            }
+            for cid, shards in enumerate(self.ranges)
+        ]
+
+
+class ClusterClient:
+    """
+    A cluster's connection to the Coordinator. Cogs register handlers that
+    other clusters can call through ``broadcast``; handlers are coroutines
+    taking keyword arguments and returning JSON-serialisable values.
+    """
+
+    def __init__(self, cluster_id: int):
+        self.cluster_id = cluster_id
+        self.handlers: dict[str, object] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+
+    def handler(self, name: str):
+        def register(fn):
+            self.handlers[name] = fn
+            return fn
+        return register
+
+    async def connect(self):
+        reader, self._writer = await asyncio.open_unix_connection(CLUSTER_SOCKET)
+        await _send(self._writer, {"op": "hello", "cluster": self.cluster_id})
+        self._task = asyncio.create_task(self._read(reader))
+
+    async def _read(self, reader: asyncio.StreamReader):
+        while line := await reader.readline():
+            message = json.loads(line)
+            if message.get("op") == "call":
+                asyncio.create_task(self._run_handler(message))
+            elif message.get("op") == "response":
+                future = self._pending.pop(message["id"], None)
+                if future and not future.done():
+                    if "error" in message:
+                        future.set_exception(Exception(message["error"]))
+                    else:
+                        future.set_result(message.get("result"))
+        logger.warning("⚠️ Lost connection to the cluster coordinator")
+
+    async def _run_handler(self, message: dict):
+        handler = self.handlers.get(message["name"])
+        try:
+            if handler is None:
+                raise Exception(f"No handler {message['name']!r}")
+            result = await handler(**message.get("args", {}))
+        except Exception as e:
+            result = {"cluster": self.cluster_id, "error": str(e)}
+        await _send(self._writer, {"op": "reply", "id": message["id"], "result": result})
+
+    async def request(self, cmd: str, timeout: float = CALL_TIMEOUT * 2, **fields):
+        if self._writer is None:
+            raise Exception("Not connected to the cluster coordinator")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await _send(self._writer, {"op": "request", "id": request_id, "cmd": cmd, **fields})
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def broadcast(self, name: str, **args) -> list:
+        """Results of handler ``name`` from every cluster, this one included."""
+        return await self.request("broadcast", name=name, args=args)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+        if self._writer:
+            self._writer.close()
@@ -0,0 +1,38 @@
+import aiohttp
+
+HTTP_POOL_LIMIT = 100  # open connections overall
+HTTP_POOL_PER_HOST = 20
+HTTP_TIMEOUT = 30  # seconds
+
+
+class HTTPClient:
+    """
+    Bot-wide aiohttp session. One pooled keep-alive connector means repeated
+    CDN/API requests reuse TCP/TLS connections instead of a session per call.
+    """
+
+    def __init__(self, limit: int = HTTP_POOL_LIMIT, limit_per_host: int = HTTP_POOL_PER_HOST):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared session; created lazily on the running loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+        return self._session
+
+    async def get_bytes(self, url: str) -> bytes:
+        async with self.session.get(url) as resp:
+            if resp.status != 200:
+                raise Exception(f"Download failed ({resp.status}): {url}")
+            return await resp.read()
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+http = HTTPClient()
@@ -0,0 +1,128 @@
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import time
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", "25"))  # seconds; container runtimes SIGKILL after ~30
+CLOSE_RESERVE = 5  # seconds of the deadline kept for flushing and closing, however long the drain takes
+RESTARTING_MESSAGE = "🔄 The bot is restarting, try again in a moment."
+
+# Tasks discord.py runs event listeners and slash commands in
+_HANDLER_TASKS = ("discord.py: ", "CommandTree-invoker")
+
+
+class Lifecycle:
+    """
+    Graceful shutdown on SIGTERM/SIGINT, in phases sharing one deadline:
+
+    1. stop accepting: new prefix and slash commands get a "restarting" reply
+    2. drain: wait for the listeners and commands already running, until
+       CLOSE_RESERVE before the deadline
+    3. flush: await every cog's ``flush_state()`` to persist write-behind state
+    4. close: ``bot.close()`` unloads the cogs, disconnects voice and closes
+       the HTTP sessions and the store
+
+    Whatever is still running at the deadline is abandoned and logged.
+    """
+
+    def __init__(self, timeout: float = SHUTDOWN_TIMEOUT):
+        self.timeout = timeout
+        self.draining = False
+        self.bot = None
+        self._shutdown: asyncio.Task | None = None
+
+    def install(self, bot):
+        """Handle SIGTERM/SIGINT and gate ``bot``'s commands (call from setup_hook)."""
+        self.bot = bot
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            with contextlib.suppress(NotImplementedError):  # Windows: Ctrl+C stays a KeyboardInterrupt
+                loop.add_signal_handler(sig, self.request_shutdown, sig.name)
+
+        invoke = bot.invoke
+
+        async def gated_invoke(ctx):
+            if self.draining and ctx.command is not None:
+                with contextlib.suppress(discord.HTTPException):
+                    await ctx.send(RESTARTING_MESSAGE)
+                return
+            await invoke(ctx)
+
+        bot.invoke = gated_invoke
+
+        call = bot.tree._call
+
+        async def gated_call(interaction):
+            if self.draining and interaction.type is discord.InteractionType.application_command:
+                with contextlib.suppress(discord.HTTPException):
+                    await interaction.response.send_message(RESTARTING_MESSAGE, ephemeral=True)
+                return
+            await call(interaction)
+
+        bot.tree._call = gated_call
+
+    def request_shutdown(self, reason: str = "shutdown"):
+        if self._shutdown is not None:
+            logger.warning(f"🛑 {reason} received, already shutting down")
+            return
+        self._shutdown = asyncio.create_task(self.shutdown(reason))
+
+    async def shutdown(self, reason: str = "shutdown"):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        self.draining = True
+        logger.info(f"🛑 {reason} received: shutting down within {self.timeout:.0f}s")
+
+        # Drain: only what was running when the signal came; events keep arriving meanwhile
+        current = asyncio.current_task()
+        running = [
+            t for t in asyncio.all_tasks()
+            if t is not current and not t.done() and t.get_name().startswith(_HANDLER_TASKS)
+        ]
+        if running:
+            logger.info(f"⏳ Waiting for {len(running)} running listeners/commands")
+            drain_by = deadline - min(CLOSE_RESERVE, self.timeout / 2)
+            _, pending = await asyncio.wait(running, timeout=max(0.0, drain_by - time.monotonic()))
+            if pending:
+                logger.warning(f"⚠️ {len(pending)} listeners/commands still running, closing without them")
+
+        # Flush: cogs persist state they write behind
+        flushes = {
+            name: cog.flush_state()
+            for name, cog in self.bot.cogs.items()
+            if hasattr(cog, "flush_state")
+        }
+        if flushes:
+            try:
+                results = await asyncio.wait_for(
+                    asyncio.gather(*flushes.values(), return_exceptions=True),
+                    max(0.0, deadline - time.monotonic())
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"❌ Flushing {', '.join(flushes)} timed out")
+            else:
+                for name, result in zip(flushes, results):
+                    if isinstance(result, BaseException):
+                        logger.error(f"❌ Flushing {name} failed: {result}")
+                logger.info(f"💾 Flushed {', '.join(flushes)}")
+
+        # Close: cog_unload hooks, voice, gateway, HTTP, store
+        try:
+            await asyncio.wait_for(self.bot.close(), max(1.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            logger.error("❌ Closing the bot timed out")
+        logger.info(f"✅ Shutdown finished in {time.monotonic() - started:.1f}s")
+
+    async def finished(self):
+        """Wait for a signal-triggered shutdown to complete (``bot.start`` returns before it does)."""
+        if self._shutdown is not None:
+            await self._shutdown
+
+
+lifecycle = Lifecycle()
@@ -1,33 +1,122 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from config import Config
 
-def setup_logging():
-    """Setup logging configuration"""
-    
+# Attributes every LogRecord has; anything else was passed via ``extra=`` and goes into the JSON
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, plus exception and ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Like QueueHandler, but keeps records structured: the message is rendered
+    here (its arguments may change once the caller moves on), while the
+    formatting into JSON or text happens on the listener thread.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.stack_info = None
+        return record
+
+
+def _module_levels() -> dict[str, str]:
+    """LOG_LEVELS="discord=WARNING,cogs.music=DEBUG" -> {"discord": "WARNING", "cogs.music": "DEBUG"}"""
+    levels = {"discord": "WARNING", "discord.http": "WARNING"}
+    for item in filter(None, (Config.LOG_LEVELS or "").split(",")):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _log_file() -> str:
+    # Each cluster process rotates its own file
+    if Config.CLUSTER_ID:
+        root, ext = os.path.splitext(Config.LOG_FILE)
+        return f"{root}.cluster{Config.CLUSTER_ID}{ext}"
+    return Config.LOG_FILE
+
+
+def setup_logging(log_file: bool = False):
+    """
+    Setup logging: loggers put records on a queue, and a listener thread
+    writes them as text to stdout and, with ``log_file``, as JSON lines to a
+    size-rotated file, so no disk I/O happens on the event loop.
+
+    Only the bot's entry point passes ``log_file``; other processes (render
+    workers, tools) log to the console and leave the file to the bot.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
     # Create formatter
     formatter = logging.Formatter(
         '%(asctime)s | %(levelname)s | %(name)s | %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
-    # Setup file handler
-    file_handler = logging.FileHandler(Config.LOG_FILE, encoding='utf-8')
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(getattr(logging, Config.LOG_LEVEL.upper()))
-    
+
     # Setup console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    console_handler.setLevel(getattr(logging, Config.LOG_LEVEL.upper()))
-    
-    # Setup root logger
+    handlers = [console_handler]
+
+    # Setup rotating JSON file handler
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            _log_file(), maxBytes=Config.LOG_MAX_BYTES, backupCount=Config.LOG_BACKUPS, encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    # Setup root logger; levels are set on loggers so a disabled debug call returns early
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, Config.LOG_LEVEL.upper()))
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-    
-    # Reduce discord.py logging level
-    logging.getLogger('discord').setLevel(logging.WARNING)
-    logging.getLogger('discord.http').setLevel(logging.WARNING)
+    root_logger.addHandler(_QueueHandler(log_queue))
+
+    for name, level in _module_levels().items():
+        logging.getLogger(name).setLevel(getattr(logging, level))
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,278 @@
+import asyncio
+import contextlib
+import contextvars
+import logging
+import os
+import time
+from collections import defaultdict
+
+import aiohttp
+
+from utils.startup import lazy_import
+from utils.watchdog import watchdog
+
+fastapi = lazy_import("fastapi")
+uvicorn = lazy_import("uvicorn")
+
+logger = logging.getLogger(__name__)
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # e.g. 9100; 0 = no endpoint; clusters use port + CLUSTER_ID
+LOOP_LAG_INTERVAL = 0.5  # seconds between event-loop lag probes
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+# The REST route being requested, for the aiohttp trace that sees each response
+_route: contextvars.ContextVar[str] = contextvars.ContextVar("route", default="other")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name, self.help, self.labelnames = name, help, labels
+        self.values: dict[tuple, float] = defaultdict(float)
+
+    def inc(self, *labels, amount: float = 1):
+        self.values[labels] += amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, *labels, value: float):
+        self.values[labels] = value
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = BUCKETS):
+        self.name, self.help, self.labelnames, self.buckets = name, help, labels, buckets
+        self.counts: dict[tuple, list[int]] = {}
+        self.sums: dict[tuple, float] = defaultdict(float)
+
+    def observe(self, *labels, value: float):
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        self.sums[labels] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        for labels, counts in sorted(self.counts.items()):
+            total = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                total += count
+                lines.append(f"{self.name}_bucket{_labels(names, labels + (bound,))} {total}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {self.sums[labels]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {total}")
+        return lines
+
+
+class Metrics:
+    """
+    Prometheus metrics for the bot: command and listener latency and
+    failures, gateway events per type and shard, REST latency and responses
+    (429s included) per route, and event-loop lag. ``install`` hooks them
+    into a bot, ``serve`` exposes them at ``/metrics``.
+    """
+
+    def __init__(self):
+        self.commands = Histogram("bot_command_seconds", "Command run time", ("command", "kind"))
+        self.command_errors = Counter("bot_command_errors_total", "Commands that raised", ("command", "kind"))
+        self.listeners = Histogram("bot_listener_seconds", "Event listener run time", ("listener", "event"))
+        self.listener_errors = Counter("bot_listener_errors_total", "Event listeners that raised", ("listener", "event"))
+        self.rest = Histogram("bot_rest_seconds", "REST request time, rate-limit waits and retries included", ("route",))
+        self.rest_responses = Counter("bot_rest_responses_total", "REST responses by status", ("route", "status"))
+        self.loop_lag = Histogram("bot_loop_lag_seconds", "Event-loop scheduling delay", buckets=LAG_BUCKETS)
+        self.loop_lag_last = Gauge("bot_loop_lag_last_seconds", "Most recent event-loop scheduling delay")
+        self.collectors = [self._stall_lines]  # callables returning extra exposition lines at scrape time
+        self._tasks: list[asyncio.Task] = []
+        self._server = None
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Pass as the client's ``http_trace``: counts REST responses per route and status."""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_end(session, ctx, params):
+            self.rest_responses.inc(_route.get(), params.response.status)
+
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    def install(self, bot):
+        """Time ``bot``'s prefix/slash commands, event listeners and REST calls."""
+        invoke = bot.invoke
+
+        async def timed_invoke(ctx):
+            started = time.perf_counter()
+            try:
+                await invoke(ctx)
+            finally:
+                if ctx.command is not None:
+                    name = ctx.command.qualified_name
+                    self.commands.observe(name, "prefix", value=time.perf_counter() - started)
+                    if ctx.command_failed:
+                        self.command_errors.inc(name, "prefix")
+
+        bot.invoke = timed_invoke
+
+        call = bot.tree._call
+
+        async def timed_call(interaction):
+            started = time.perf_counter()
+            try:
+                await call(interaction)
+            finally:
+                command = interaction.command
+                name = command.qualified_name if command else "unknown"
+                self.commands.observe(name, "slash", value=time.perf_counter() - started)
+                if interaction.command_failed:
+                    self.command_errors.inc(name, "slash")
+
+        bot.tree._call = timed_call
+
+        # Same as Client._run_event, plus timing and error counts per listener
+        async def timed_run_event(coro, event_name, *args, **kwargs):
+            listener = getattr(coro, "__qualname__", event_name)
+            started = time.perf_counter()
+            try:
+                await coro(*args, **kwargs)
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                self.listener_errors.inc(listener, event_name)
+                try:
+                    await bot.on_error(event_name, *args, **kwargs)
+                except asyncio.CancelledError:
+                    pass
+            finally:
+                self.listeners.observe(listener, event_name, value=time.perf_counter() - started)
+
+        bot._run_event = timed_run_event
+
+        request = bot.http.request
+
+        async def timed_request(route, **kwargs):
+            key = f"{route.method} {route.path}"
+            token = _route.set(key)
+            started = time.perf_counter()
+            try:
+                return await request(route, **kwargs)
+            finally:
+                self.rest.observe(key, value=time.perf_counter() - started)
+                _route.reset(token)
+
+        bot.http.request = timed_request
+
+        stats = getattr(bot, "shard_stats", None)
+        if stats:
+            self.collectors.append(lambda: self._gateway_lines(stats))
+        self._tasks.append(asyncio.create_task(self._probe_loop_lag()))
+
+    def _gateway_lines(self, stats) -> list[str]:
+        lines = [
+            "# HELP bot_gateway_events_total Gateway events received",
+            "# TYPE bot_gateway_events_total counter",
+        ]
+        for (event, shard), count in sorted(stats.by_event.items()):
+            lines.append(f"bot_gateway_events_total{_labels(('event', 'shard'), (event, shard))} {count}")
+        lines += [
+            "# HELP bot_gateway_latency_seconds Heartbeat latency per shard",
+            "# TYPE bot_gateway_latency_seconds gauge",
+        ]
+        for shard in stats.shards():
+            lines.append(f"bot_gateway_latency_seconds{_labels(('shard',), (shard['id'],))} {shard['latency'] / 1000}")
+        return lines
+
+    def _stall_lines(self) -> list[str]:
+        lines = [
+            "# HELP bot_loop_stalls_total Event-loop stalls over the watchdog threshold, by blocking location",
+            "# TYPE bot_loop_stalls_total counter",
+        ]
+        for location, stats in sorted(watchdog.snapshot().items()):
+            lines.append(f"bot_loop_stalls_total{_labels(('location',), (location,))} {stats['count']}")
+        return lines
+
+    async def _probe_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            lag = max(0.0, loop.time() - expected)
+            self.loop_lag.observe(value=lag)
+            self.loop_lag_last.set(value=lag)
+
+    def render(self) -> str:
+        lines = []
+        for metric in (
+            self.commands, self.command_errors, self.listeners, self.listener_errors,
+            self.rest, self.rest_responses, self.loop_lag, self.loop_lag_last,
+        ):
+            lines += metric.render()
+        for collect in self.collectors:
+            lines += collect()
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, host: str = METRICS_HOST, port: int = METRICS_PORT):
+        """Serve ``/metrics`` from this event loop; does nothing if ``port`` is 0."""
+        if not port:
+            return
+        app = fastapi.FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+        @app.get("/metrics")
+        async def scrape():
+            return fastapi.responses.PlainTextResponse(self.render(), media_type="text/plain; version=0.0.4")
+
+        class Server(uvicorn.Server):
+            def capture_signals(self):
+                return contextlib.nullcontext()  # the bot owns SIGINT/SIGTERM
+
+            async def startup(self, sockets=None):
+                await super().startup(sockets)  # sys.exit()s if the port can't be bound
+                logger.info(f"📈 Metrics on http://{host}:{port}/metrics")
+
+        self._server = Server(uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="off"))
+
+        async def run():
+            try:
+                await self._server.serve()
+            except SystemExit:
+                # uvicorn exits the process when it can't bind; the bot keeps running without metrics
+                logger.error(f"❌ Metrics endpoint couldn't listen on {host}:{port} (port in use?); metrics disabled")
+
+        self._tasks.append(asyncio.create_task(run()))
+
+    def close(self):
+        if self._server is not None:
+            self._server.should_exit = True
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import discord
+
+PROGRESS_INTERVAL = 2.0  # seconds between edits
+MAX_PROGRESS_INTERVAL = 15.0
+
+
+class ProgressReporter:
+    """
+    Keeps only the latest progress state of a long job and edits its status
+    message at a fixed cadence, so fast producers can't flood the edit route.
+
+    ``update`` is thread-safe (yt-dlp hooks call it from worker threads).
+    The reporter must be created on the event loop.
+    """
+
+    def __init__(self, message: discord.Message, *, render=None, interval: float = PROGRESS_INTERVAL):
+        self.message = message
+        self.render = render  # state -> Message.edit kwargs; None means state is the kwargs
+        self.interval = interval
+        self._latest = None
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run())
+
+    def update(self, state):
+        with self._lock:
+            self._latest = state
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._flush()
+
+    async def _flush(self):
+        with self._lock:
+            state, self._latest = self._latest, None
+        if state is None:
+            return
+        kwargs = self.render(state) if self.render else state
+        started = self._loop.time()
+        try:
+            await self.message.edit(**kwargs)
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self.interval = min(self.interval * 2, MAX_PROGRESS_INTERVAL)
+            return
+        # discord.py sleeps on exhausted buckets inside edit(); back off when it did.
+        took = self._loop.time() - started
+        if took > self.interval:
+            self.interval = min(took * 2, MAX_PROGRESS_INTERVAL)
+
+    async def close(self):
+        """Stop editing; pending progress is dropped."""
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,170 @@
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PIL import Image
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", min(4, os.cpu_count() or 1)))  # 0 = render in a thread
+RENDER_QUEUE = int(os.getenv("RENDER_QUEUE", "32"))  # jobs allowed to wait for a free worker
+RENDER_TIMEOUT = 20  # seconds, queueing included
+
+
+# Output encoding per generator. Override with e.g. IMAGE_BATTLE="png,compress_level=9"
+# or IMAGE_CAPTCHA="webp,quality=90,scale=0.5". Keys:
+#   format          PNG or WEBP
+#   quality         WebP quality (0-100); lossless=1 for lossless WebP
+#   method          WebP effort (0 fast .. 6 small)
+#   compress_level  PNG zlib level (0-9); optimize=1 for Pillow's extra pass
+#   colors          quantize to an adaptive palette first (PNG)
+#   scale           downscale factor applied before encoding
+IMAGE_PROFILES = {
+    "battle": {"format": "WEBP", "quality": 80, "method": 0},
+    "vs": {"format": "WEBP", "quality": 85, "method": 0},
+    "ship": {"format": "WEBP", "quality": 85, "method": 0},
+    "captcha": {"format": "PNG", "colors": 32, "compress_level": 6},
+}
+IMAGE_EXTENSIONS = {"PNG": "png", "WEBP": "webp"}
+
+
+def image_profile(name: str) -> dict:
+    """The encoding profile for generator ``name`` with any IMAGE_<NAME> override applied."""
+    profile = dict(IMAGE_PROFILES.get(name, {"format": "PNG"}))
+    override = os.getenv(f"IMAGE_{name.upper()}")
+    if override:
+        fmt, *opts = override.split(",")
+        profile = {"format": fmt.strip().upper()}
+        for opt in opts:
+            key, _, value = opt.partition("=")
+            profile[key.strip()] = float(value) if "." in value else int(value)
+    if profile["format"] not in IMAGE_EXTENSIONS:
+        raise ValueError(f"Unsupported image format for {name}: {profile['format']}")
+    return profile
+
+
+def image_filename(stem: str, name: str | None = None) -> str:
+    """Attachment filename matching generator ``name``'s format (``name`` defaults to ``stem``)."""
+    return f"{stem}.{IMAGE_EXTENSIONS[image_profile(name or stem)['format']]}"
+
+
+def encode_image(img, name: str) -> bytes:
+    """Encode a rendered PIL image with generator ``name``'s profile."""
+    profile = image_profile(name)
+    scale = profile.get("scale", 1)
+    if scale != 1:
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img = img.resize(size, Image.Resampling.BILINEAR)
+    buffer = io.BytesIO()
+    if profile["format"] == "WEBP":
+        if profile.get("lossless"):
+            img.save(buffer, format="WEBP", lossless=True, method=profile.get("method", 4))
+        else:
+            img.save(buffer, format="WEBP", quality=profile.get("quality", 80), method=profile.get("method", 4))
+    else:
+        colors = profile.get("colors")
+        if colors:
+            # Fast octree also handles RGBA, keeping alpha in the palette
+            img = img.quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+        img.save(
+            buffer,
+            format="PNG",
+            compress_level=profile.get("compress_level", 6),
+            optimize=bool(profile.get("optimize", 0)),
+        )
+    return buffer.getvalue()
+
+
+class RenderBusy(Exception):
+    """The render queue is full; the caller should ask the user to retry."""
+
+
+def _init_worker(warmups):
+    for fn, args in warmups:
+        try:
+            fn(*args)
+        except Exception:
+            pass
+
+
+class RenderPool:
+    """
+    Runs Pillow renderers off the event loop in worker processes, so image
+    work neither blocks gateway handling nor contends for the bot's GIL.
+
+    Renderers must be module-level functions taking and returning picklable
+    values (PIL images, bytes, tuples). At most ``workers`` jobs run at once
+    and ``max_queue`` more may wait; beyond that ``run`` raises RenderBusy.
+    A job that exceeds its timeout raises asyncio.TimeoutError.
+    """
+
+    def __init__(self, workers: int = RENDER_WORKERS, max_queue: int = RENDER_QUEUE, timeout: float = RENDER_TIMEOUT):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._warmups: list[tuple] = []
+        self._executor = None
+        self._slots: asyncio.Semaphore | None = None
+        self._pending = 0
+
+    def warmup(self, fn, *args):
+        """
+        Run ``fn(*args)`` once in each worker when it starts (e.g. resolve fonts).
+
+        Call at import time: the list is handed to the pool when it's created.
+        Registering the same call again (a reloaded module) is a no-op.
+        """
+        if (fn, args) not in self._warmups:
+            self._warmups.append((fn, args))
+
+    def _pool(self):
+        if self._executor is None:
+            if self.workers > 0:
+                # forkserver: workers never fork from the threaded bot process
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                    initializer=_init_worker,
+                    initargs=(self._warmups,),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+            self._slots = asyncio.Semaphore(max(1, self.workers))
+        return self._executor
+
+    async def run(self, fn, *args, timeout: float | None = None):
+        """``fn(*args)`` in a worker; raises RenderBusy or asyncio.TimeoutError."""
+        pool = self._pool()
+        if self._pending >= max(1, self.workers) + self.max_queue:
+            raise RenderBusy("Too many images are being rendered right now.")
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            async with asyncio.timeout(timeout or self.timeout):
+                await self._slots.acquire()
+                try:
+                    future = pool.submit(fn, *args)
+                except BaseException:
+                    self._slots.release()
+                    raise
+                # The slot follows the job, not the caller: a timed-out render keeps
+                # its worker busy until it actually finishes.
+                slots = self._slots
+                future.add_done_callback(
+                    lambda _: loop.is_closed() or loop.call_soon_threadsafe(slots.release)
+                )
+                return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._executor = None  # a worker died; start a fresh pool next time
+            raise
+        finally:
+            self._pending -= 1
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+render = RenderPool()
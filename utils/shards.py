@@ -0,0 +1,100 @@
+import asyncio
+import time
+from collections import Counter
+
+SHARD_RATE_WINDOW = 10  # seconds per event-rate sample
+
+
+def shard_for(guild_id: int, shard_count: int | None) -> int:
+    """The shard Discord delivers ``guild_id``'s events on."""
+    return (guild_id >> 22) % shard_count if shard_count else 0
+
+
+def _shard_ids(bot):
+    # Only AutoShardedBot has shard_ids; a plain Bot runs a single connection
+    return getattr(bot, "shard_ids", None)
+
+
+def owns_guild(bot, guild_id: int) -> bool:
+    """Whether this process runs the shard for ``guild_id`` (always true unclustered)."""
+    shard_ids = _shard_ids(bot)
+    if not shard_ids:
+        return True
+    return shard_for(guild_id, bot.shard_count) in shard_ids
+
+
+def handles_dms(bot) -> bool:
+    """Whether this process receives DMs, which Discord delivers on shard 0."""
+    shard_ids = _shard_ids(bot)
+    return not shard_ids or 0 in shard_ids
+
+
+class ShardStats:
+    """
+    Gateway events per shard, counted by wrapping the connection's event
+    parsers. Events are attributed by their guild id; events without one
+    (DMs, READY) are counted on shard 0, where Discord delivers DMs.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.events: Counter[int] = Counter()  # shard_id -> events since start
+        self.by_event: Counter[tuple[str, int]] = Counter()  # (event, shard_id) -> events since start
+        self.rates: dict[int, float] = {}  # shard_id -> events/s over the last window
+        self._task: asyncio.Task | None = None
+
+    def install(self):
+        parsers = self.bot._connection.parsers
+        for event, parser in list(parsers.items()):
+            parsers[event] = self._counted(event, parser)
+        self._task = asyncio.create_task(self._sample())
+
+    def _counted(self, event: str, parser):
+        events, by_event = self.events, self.by_event
+        bot = self.bot
+        guild_key = "id" if event.startswith("GUILD_") and "_" not in event[6:] else "guild_id"
+
+        def counted(data):
+            guild_id = data.get(guild_key) if isinstance(data, dict) else None
+            shard = shard_for(int(guild_id), bot.shard_count) if guild_id else 0
+            events[shard] += 1
+            by_event[event, shard] += 1
+            return parser(data)
+
+        return counted
+
+    async def _sample(self):
+        last, last_at = Counter(), time.monotonic()
+        while True:
+            await asyncio.sleep(SHARD_RATE_WINDOW)
+            now = time.monotonic()
+            current = Counter(self.events)
+            self.rates = {shard: (current[shard] - last[shard]) / (now - last_at) for shard in current}
+            last, last_at = current, now
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+
+    def shards(self) -> list[dict]:
+        """Per-shard latency (ms), guild count and event rate, ordered by shard id."""
+        if hasattr(self.bot, "latencies"):
+            latencies = dict(self.bot.latencies)
+        else:
+            latencies = {0: self.bot.latency}
+        guilds = Counter(g.shard_id for g in self.bot.guilds)
+        return [
+            {
+                "id": shard_id,
+                "latency": latency * 1000,  # NaN before the shard's first heartbeat
+                "guilds": guilds[shard_id],
+                "rate": self.rates.get(shard_id, 0.0),
+            }
+            for shard_id, latency in sorted(latencies.items())
+        ]
+
+    def summary(self) -> str:
+        return "\n".join(
+            f"Shard {s['id']}: {s['latency']:.0f}ms, {s['guilds']} guilds, {s['rate']:.1f} events/s"
+            for s in self.shards()
+        )
@@ -0,0 +1,179 @@
+import ast
+import asyncio
+import importlib
+import importlib.util
+import logging
+import sys
+import threading
+import time
+import types
+
+logger = logging.getLogger(__name__)
+
+_lazy_modules: list["LazyModule"] = []
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a heavy module that is imported on first attribute access,
+    so cogs that only need it for some commands don't pay for it at startup.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_module"] = module
+                    logger.info(f"Lazy import {self.__name__}: {(time.perf_counter() - started) * 1000:.0f}ms")
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """``name`` if it is already imported, otherwise a LazyModule for it."""
+    if name in sys.modules:
+        return sys.modules[name]
+    module = LazyModule(name)
+    _lazy_modules.append(module)
+    return module
+
+
+def warm_lazy_imports():
+    """Import every deferred module now (call from a thread once the bot is ready)."""
+    for module in _lazy_modules:
+        try:
+            module._load()
+        except Exception as e:
+            logger.warning(f"Lazy import {module.__name__} failed: {e}")
+
+
+def _top_level_imports(name: str) -> list[str]:
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return []
+    with open(spec.origin, "rb") as f:
+        tree = ast.parse(f.read(), spec.origin)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.append(node.module)
+    return modules
+
+
+def _import_dependencies(name: str) -> float:
+    """Import the modules extension ``name`` imports at top level; returns seconds spent."""
+    started = time.perf_counter()
+    for module in _top_level_imports(name):
+        if module in sys.modules:
+            continue
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass  # load_extension will raise the real error in context
+    return time.perf_counter() - started
+
+
+class StartupProfiler:
+    """
+    Per-extension startup timings, logged as one table: ``import`` is the
+    threaded import of its dependencies, ``setup`` the module body plus its
+    ``setup`` coroutine.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: dict[str, dict[str, float]] = {}
+
+    def record(self, name: str, phase: str, seconds: float):
+        self.timings.setdefault(name, {"import": 0.0, "setup": 0.0})[phase] = seconds
+
+    def report(self):
+        rows = sorted(self.timings.items(), key=lambda kv: -(kv[1]["import"] + kv[1]["setup"]))
+        lines = [f"{'extension':<24} {'import ms':>10} {'setup ms':>10}"]
+        for name, t in rows:
+            lines.append(f"{name:<24} {t['import'] * 1000:>10.0f} {t['setup'] * 1000:>10.0f}")
+        lines.append(f"{'total (wall)':<24} {(time.perf_counter() - self.started) * 1000:>21.0f}")
+        logger.info("Startup profile:\n" + "\n".join(lines))
+
+
+async def load_extensions(bot, names: list[str], profiler: StartupProfiler | None = None):
+    """
+    Load ``names`` concurrently. Each extension's top-level dependencies are
+    imported first, in parallel threads. The extension modules then run and
+    their ``setup`` coroutines overlap on the loop. The first failure is
+    re-raised once every extension has been attempted.
+    """
+    profiler = profiler or StartupProfiler()
+
+    import_times = await asyncio.gather(*(asyncio.to_thread(_import_dependencies, name) for name in names))
+    for name, seconds in zip(names, import_times):
+        profiler.record(name, "import", seconds)
+
+    async def load(name: str):
+        started = time.perf_counter()
+        try:
+            await bot.load_extension(name)
+        finally:
+            profiler.record(name, "setup", time.perf_counter() - started)
+
+    results = await asyncio.gather(*(load(name) for name in names), return_exceptions=True)
+    profiler.report()
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            logger.error(f"❌ Failed to load {name}: {result}")
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def reload_extension(bot, name: str) -> list[str]:
+    """
+    Reload extension ``name`` in place, handing its cogs' in-memory state to
+    the new instances. A cog opts in with ``export_state()``, called on the
+    old instance before it is unloaded, and ``import_state(state)``, called
+    on its replacement once loaded. State is passed by reference, so views
+    and tasks the old instance started keep working on the same objects;
+    ``cog_unload`` must leave exported state running.
+
+    If the new code fails to load, discord.py sets up the old module again
+    and the state goes to that instance before the error is re-raised.
+    Returns the names of the cogs whose state was handed over.
+    """
+    states = {
+        cog_name: cog.export_state()
+        for cog_name, cog in bot.cogs.items()
+        if type(cog).__module__ == name and hasattr(cog, "export_state")
+    }
+    error = None
+    started = time.perf_counter()
+    try:
+        await bot.reload_extension(name)
+    except Exception as e:
+        error = e
+
+    restored = []
+    for cog_name, state in states.items():
+        cog = bot.get_cog(cog_name)
+        if cog is None or not hasattr(cog, "import_state"):
+            logger.warning(f"⚠️ State of {cog_name} dropped: no cog to hand it to after reloading {name}")
+            continue
+        cog.import_state(state)
+        restored.append(cog_name)
+
+    if error is not None:
+        raise error
+    logger.info(f"🔄 Reloaded {name} in {(time.perf_counter() - started) * 1000:.0f}ms (state kept: {', '.join(restored) or 'none'})")
+    return restored
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+STORE_PATH = os.getenv("STORE_PATH", "/data/store.db")
+STORE_BUSY_TIMEOUT = float(os.getenv("STORE_BUSY_TIMEOUT", "5"))  # seconds a write waits for another process's lock
+
+
+class Store:
+    """
+    Key/value tables in one SQLite file (WAL), shared by every bot process.
+
+    Cogs keep working on plain dicts: ``load`` returns a table as a dict and
+    ``sync`` writes back only the keys this process changed or deleted since
+    it last loaded/synced them, so clusters owning different guilds never
+    overwrite each other's rows. ``pull`` merges rows other processes wrote.
+    Values must be JSON-serialisable; keys are strings.
+
+    Cogs write with ``save``, which queues the write on one writer thread:
+    with several clusters on the same file a write can wait for another
+    process's lock, and that wait must not stall the event loop. Reads
+    don't wait for writers in WAL mode.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None  # reads
+        self._write_conn: sqlite3.Connection | None = None  # used by the writer thread only
+        self._lock = threading.Lock()
+        self._seen: dict[str, dict[str, str]] = {}  # table -> key -> JSON as last read/written
+        self._writer: ThreadPoolExecutor | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=STORE_BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv (tbl TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (tbl, key)) WITHOUT ROWID"
+        )
+        return conn
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _rows(self, table: str) -> dict[str, str]:
+        return dict(self._db().execute("SELECT key, value FROM kv WHERE tbl = ?", (table,)))
+
+    def load(self, table: str, legacy=None) -> dict:
+        """
+        ``table`` as a dict. If the table has no rows yet and ``legacy`` is
+        given, it's called for the initial contents (e.g. an old JSON file),
+        which are written to the store first.
+
+        This is how the cogs' pre-store JSON files on /data migrate: the first
+        load imports them once, and from then on every cluster reads the
+        store, so later edits to the old files are ignored.
+        """
+        with self._lock:
+            rows = self._rows(table)
+            self._seen[table] = {}
+        if not rows and legacy is not None:
+            initial = legacy() or {}
+            if initial:
+                self.sync(table, initial)
+                return initial
+        with self._lock:
+            self._seen[table] = rows
+        return {key: json.loads(value) for key, value in rows.items()}
+
+    def sync(self, table: str, data: dict, owned=None):
+        """
+        Write the keys of ``data`` that changed here, and delete the ones removed
+        here. Blocks until this and the writes queued before it are done; on
+        the event loop use ``save``.
+
+        ``owned(key)`` limits both to the keys this process is responsible
+        for, for tables where ``data`` only holds this process's share (e.g.
+        the guilds on its shards); other rows are never touched.
+        """
+        self.save(table, data, owned).result()
+
+    def save(self, table: str, data: dict, owned=None) -> Future:
+        """
+        ``sync`` without blocking: ``data`` is encoded now (so the caller may
+        keep changing it) and written on the writer thread, in call order.
+        Failures are logged; the returned future can be awaited with
+        ``asyncio.wrap_future``.
+        """
+        encoded = self._encode(data)
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store-writer")
+        future = self._writer.submit(self._write, table, encoded, owned)
+        future.add_done_callback(
+            lambda f: f.exception() and logger.error(f"❌ Failed to save {table}: {f.exception()}")
+        )
+        return future
+
+    async def flush(self):
+        """Wait for the writes queued so far."""
+        if self._writer is not None:
+            await asyncio.wrap_future(self._writer.submit(lambda: None))
+
+    @staticmethod
+    def _encode(data: dict) -> dict[str, str]:
+        return {str(key): json.dumps(value, sort_keys=True) for key, value in data.items()}
+
+    def _write(self, table: str, encoded: dict[str, str], owned=None):
+        # Writer thread. The lock only guards _seen: waiting for another
+        # process's write lock must not hold up load/pull on the event loop.
+        with self._lock:
+            seen = dict(self._seen.setdefault(table, {}))
+        changed = [
+            (table, key, value) for key, value in encoded.items()
+            if seen.get(key) != value and (owned is None or owned(key))
+        ]
+        removed = [(table, key) for key in seen if key not in encoded and (owned is None or owned(key))]
+        if not changed and not removed:
+            return
+        if self._write_conn is None:
+            self._write_conn = self._connect()
+        db = self._write_conn
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT INTO kv (tbl, key, value) VALUES (?, ?, ?)"
+                " ON CONFLICT (tbl, key) DO UPDATE SET value = excluded.value",
+                changed,
+            )
+            db.executemany("DELETE FROM kv WHERE tbl = ? AND key = ?", removed)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        with self._lock:
+            seen = self._seen.setdefault(table, {})
+            for _, key, value in changed:
+                seen[key] = value
+            for _, key in removed:
+                seen.pop(key, None)
+
+    def pull(self, table: str, data: dict) -> tuple[set, set]:
+        """
+        Merge rows written by other processes into ``data`` in place.
+        Returns ``(changed_keys, removed_keys)``.
+        """
+        with self._lock:
+            rows = self._rows(table)
+            seen = self._seen.setdefault(table, {})
+            changed = {key for key, value in rows.items() if seen.get(key) != value}
+            removed = {key for key in seen if key not in rows}
+            self._seen[table] = rows
+        for key in changed:
+            data[key] = json.loads(rows[key])
+        for key in removed:
+            data.pop(key, None)
+        return changed, removed
+
+    def close(self):
+        """Finish the queued writes and close the connection."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._write_conn is not None:
+            self._write_conn.close()
+            self._write_conn = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+store = Store()
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+STALL_THRESHOLD = float(os.getenv("STALL_THRESHOLD", "0.25"))  # seconds the loop may go without running
+STALL_SAMPLE_RATE = float(os.getenv("STALL_SAMPLE_RATE", "1"))  # fraction of stalls whose stack is captured
+STALL_LOG_COOLDOWN = 60  # seconds between log lines for the same location
+STALL_HISTORY = 50  # recent stalls kept for $stalls
+TICK_INTERVAL = 0.05
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _in_repo(filename: str) -> bool:
+    path = os.path.abspath(filename)
+    return path.startswith(ROOT + os.sep) and "site-packages" not in path
+
+
+def _frame_label(frame: traceback.FrameSummary) -> str:
+    return f"{os.path.relpath(frame.filename, ROOT)}:{frame.lineno} ({frame.name})"
+
+
+class StallWatchdog:
+    """
+    Detects event-loop stalls from a separate thread. A loop task ticks
+    every TICK_INTERVAL; once the loop misses its tick by more than the
+    threshold, the thread grabs the loop thread's current stack, so the
+    blocking call is captured while it is still running.
+
+    Each stall is attributed to the innermost frame in this repo (where it
+    blocked) and the outermost one (the cog listener or command that called
+    it). Stacks are captured for a STALL_SAMPLE_RATE fraction of stalls;
+    logging is limited to one line per location per STALL_LOG_COOLDOWN.
+    """
+
+    def __init__(self, threshold: float = STALL_THRESHOLD, sample_rate: float = STALL_SAMPLE_RATE):
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.recent: deque[dict] = deque(maxlen=STALL_HISTORY)
+        self.locations: dict[str, dict] = {}  # location -> {"count", "total", "max", "last"}
+        self._lock = threading.Lock()  # the watchdog thread writes, the loop reads
+        self._beat = time.monotonic()
+        self._loop = None
+        self._loop_thread = None
+        self._task: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._logged: dict[str, float] = {}
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._tick())
+        threading.Thread(target=self._watch, name="stall-watchdog", daemon=True).start()
+
+    def close(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _tick(self):
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(TICK_INTERVAL)
+
+    def _watch(self):
+        stall = None
+        while not self._stop.wait(TICK_INTERVAL):
+            beat = self._beat
+            behind = time.monotonic() - beat - TICK_INTERVAL
+            if stall is None and behind > self.threshold:
+                stall = {"beat": beat, "sample": self._sample() if random.random() < self.sample_rate else None}
+            elif stall is not None and beat != stall["beat"]:
+                self._record(stall["sample"], beat - stall["beat"] - TICK_INTERVAL)
+                stall = None
+
+    def _sample(self) -> dict | None:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame)
+        ours = [f for f in stack if _in_repo(f.filename) and not f.filename.endswith("watchdog.py")]
+        task = asyncio.current_task(self._loop)
+        return {
+            "location": _frame_label(ours[-1]) if ours else _frame_label(stack[-1]),
+            "entry": _frame_label(ours[0]) if ours else None,
+            "task": task.get_name() if task else None,
+            "stack": traceback.format_list(stack[-12:]),
+        }
+
+    def _record(self, sample: dict | None, duration: float):
+        location = sample["location"] if sample else "unsampled"
+        now = time.time()
+        with self._lock:
+            self.recent.append({"when": now, "duration": duration, "location": location, **(sample or {})})
+            stats = self.locations.setdefault(location, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+            stats["count"] += 1
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+            stats["last"] = now
+
+        if sample and now - self._logged.get(location, 0) >= STALL_LOG_COOLDOWN:
+            self._logged[location] = now
+            logger.warning(
+                f"🐢 Event loop blocked {duration * 1000:.0f}ms at {location}"
+                f" (entry {sample['entry']}, task {sample['task']}):\n" + "".join(sample["stack"]).rstrip()
+            )
+
+    def snapshot(self) -> dict[str, dict]:
+        """A copy of ``locations``, safe to iterate while stalls are recorded."""
+        with self._lock:
+            return {location: dict(stats) for location, stats in self.locations.items()}
+
+    def recent_stalls(self) -> list[dict]:
+        with self._lock:
+            return list(self.recent)
+
+    def top(self, limit: int = 10) -> list[tuple[str, dict]]:
+        """Locations by total time blocked."""
+        return sorted(self.snapshot().items(), key=lambda kv: -kv[1]["total"])[:limit]
+
+    def clear(self):
+        with self._lock:
+            self.recent.clear()
+            self.locations.clear()
+
+
+watchdog = StallWatchdog()
@@ -125,6 +125,16 @@ class TicTacToeCog(commands.Cog):
         self.bot = bot
         self.active_games = {}  # channel_id -> view
 
+    # Hot reload (utils/startup.py: reload_extension): running games keep their
+    # views, which now report back to the new cog
+    def export_state(self) -> dict:
+        return {"games": self.active_games}
+
+    def import_state(self, state: dict):
+        self.active_games = state["games"]
+        for view in self.active_games.values():
+            view.cog = self
+
     @commands.command(name="tictactoe")
     async def tictactoe_command(self, ctx, opponent: discord.Member):
         """Play Tic-Tac-Toe with someone (prefix command)."""